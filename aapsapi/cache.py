@@ -0,0 +1,174 @@
+'''
+Caché de respuestas de la API con invalidación por escritura.
+
+Cada modelo tiene un contador de versión en el caché que se incrementa (al confirmarse la transacción) con cada escritura,
+ya sea por `post_save`/`post_delete` o por las rutas de escritura masiva que envían `post_bulk_write`. La llave de una
+respuesta incluye la versión de los modelos de los que depende, por lo que una escritura deja inaccesibles las respuestas
+anteriores sin necesidad de buscarlas.
+
+El caché utilizado es el del alias `RESPONSE_CACHE_ALIAS` de la configuración. Para que la invalidación alcance a todos los
+procesos del servidor el caché debe ser compartido (por ejemplo, memcached, redis o el caché de base de datos); con un caché
+local a cada proceso las respuestas no se guardan y la verificación `aapsapi.W001` lo advierte.
+'''
+import hashlib
+import threading
+import time
+from collections import Counter
+from importlib import import_module
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Warning, register
+from django.db import transaction
+from django.utils.module_loading import module_has_submodule
+
+VERSION_PREFIX = 'response:version:'
+STATS_KEYS = {'hit': 'response:stats:hit', 'miss': 'response:stats:miss'}
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+def timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 60)
+
+def is_shared():
+    '''
+    Indica si el caché de respuestas es compartido entre los procesos del servidor, es decir, si no es local a cada proceso.
+    '''
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+@register('caches')
+def check_shared_cache(app_configs, **kwargs):
+    if is_shared():
+        return []
+    return [Warning(
+        'El caché de respuestas no es compartido entre los procesos del servidor, por lo que las respuestas no se guardarán.',
+        hint=('Configure en CACHES un caché compartido (memcached, redis o el caché de base de datos, previa ejecución de '
+              '"createcachetable") y asígnelo a RESPONSE_CACHE_ALIAS.'),
+        id='aapsapi.W001',
+    )]
+
+def _version_key(model):
+    return VERSION_PREFIX + model._meta.label_lower
+
+def versions(models):
+    '''
+    Retorna la lista de versiones de los modelos dados, leídas con un solo `get_many`. Las versiones que no existan se
+    inicializan (sólo la primera vez que se pide cada modelo).
+    '''
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            value = int(time.time() * 1000)
+            found[key] = value if cache.add(key, value, None) else cache.get(key, value)
+    return [found[key] for key in keys]
+
+def cached_models():
+    '''
+    Retorna el conjunto de modelos de los que dependen las respuestas guardadas: el modelo de cada vista de las aplicaciones
+    en `RESPONSE_CACHE_APPS` que guarda sus respuestas y los modelos de su `cache_models`.
+    '''
+    from aapsapi.mixins import ResponseCacheMixin
+    for app_label in getattr(settings, 'RESPONSE_CACHE_APPS', ()):
+        app_config = apps.get_app_config(app_label)
+        if module_has_submodule(app_config.module, 'views'):
+            import_module(app_config.name + '.views')
+    models = set()
+    pending = list(ResponseCacheMixin.__subclasses__())
+    while pending:
+        view = pending.pop()
+        pending.extend(view.__subclasses__())
+        if view.cache_responses and getattr(view, 'queryset', None) is not None:
+            models.update([view.queryset.model, *view.cache_models])
+    return models
+
+def bump(model):
+    '''
+    Incrementa la versión de `model` al confirmarse la transacción en curso (o inmediatamente si no hay una). La versión
+    se guarda sin expiración (`cache.incr` de algunos cachés, como el de base de datos, le aplicaría el tiempo por defecto).
+    '''
+    def increment():
+        cache = get_cache()
+        key = _version_key(model)
+        cache.set(key, max(cache.get(key, 0) + 1, int(time.time() * 1000)), None)
+    transaction.on_commit(increment)
+
+def normalized_params(request, set_params=('fields', 'fields!')):
+    '''
+    Retorna los parámetros del pedido ordenados. Los valores de los parámetros en `set_params` (listas separadas por comas cuyo
+    orden no altera la respuesta) se ordenan también.
+    '''
+    params = []
+    for name in sorted(request.query_params):
+        values = request.query_params.getlist(name)
+        if name in set_params:
+            values = [','.join(sorted({item for value in values for item in value.split(',') if item}))]
+        params.append((name, sorted(values)))
+    return params
+
+def response_key(request, models):
+    '''
+    Retorna la llave de caché de un pedido: ruta, parámetros normalizados, tipo de contenido aceptado y versiones de `models`.
+    '''
+    params = normalized_params(request)
+    parts = [request.path, repr(params), request.accepted_media_type or '', repr(versions(models))]
+    return 'response:' + hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+class Stats:
+    '''
+    Contadores de aciertos y fallos del caché de respuestas. Se acumulan en la memoria del proceso, sin consultas en el
+    pedido, y se suman a los totales compartidos en el caché como máximo una vez cada `flush_interval` segundos. Los totales
+    son aproximados: dos procesos que los actualizan a la vez pueden perder una de las sumas.
+    '''
+    flush_interval = 60
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.flushed = time.monotonic()
+
+    def record(self, outcome):
+        with self.lock:
+            self.pending[outcome] += 1
+            if time.monotonic() - self.flushed < self.flush_interval:
+                return
+            pending, self.pending = self.pending, Counter()
+            self.flushed = time.monotonic()
+        self.flush(pending)
+
+    def flush(self, pending=None):
+        if pending is None:
+            with self.lock:
+                pending, self.pending = self.pending, Counter()
+        if not pending:
+            return
+        cache = get_cache()
+        totals = cache.get_many(STATS_KEYS.values())
+        cache.set_many({key: totals.get(key, 0) + pending[outcome] for outcome, key in STATS_KEYS.items()}, None)
+
+    def totals(self):
+        '''
+        Retorna un diccionario con la cantidad de aciertos (`hit`) y fallos (`miss`) guardados en el caché compartido.
+        '''
+        found = get_cache().get_many(STATS_KEYS.values())
+        return {outcome: found.get(key, 0) for outcome, key in STATS_KEYS.items()}
+
+    def reset(self):
+        with self.lock:
+            self.pending = Counter()
+        get_cache().delete_many(STATS_KEYS.values())
+
+response_stats = Stats()
+
+def record(outcome):
+    response_stats.record(outcome)
+
+def stats():
+    return response_stats.totals()
+
+def reset_stats():
+    response_stats.reset()
@@ -0,0 +1,90 @@
+'''
+Serialización rápida de listas a partir de tuplas de `values_list()`, sin construir instancias del modelo.
+
+Para cada serializador y conjunto de campos se compila una sola vez una función fila -> diccionario que produce la misma
+salida que `to_representation` del serializador, incluyendo la omisión de campos vacíos de `CustomModelSerializer`.
+'''
+from collections import OrderedDict
+from functools import lru_cache
+from rest_framework import fields as drf_fields
+from rest_framework.relations import PrimaryKeyRelatedField
+
+# Campos cuyo `to_representation` retorna el mismo valor que entrega la base de datos.
+IDENTITY_FIELDS = (
+    drf_fields.CharField,
+    drf_fields.IntegerField,
+    drf_fields.FloatField,
+    drf_fields.BooleanField,
+    drf_fields.NullBooleanField,
+    drf_fields.ChoiceField,
+    drf_fields.ReadOnlyField,
+)
+EMPTY_VALUES = (None, '')
+# Cantidad máxima de funciones compiladas que se conservan (combinaciones de serializador, campos y columnas).
+COMPILED_CACHE_SIZE = 256
+
+def readable_columns(serializer):
+    '''
+    Retorna una lista de tuplas (nombre del campo, columna del modelo, campo) de los campos legibles del serializador,
+    o `None` si alguno no corresponde a una columna del modelo (por ejemplo, serializadores anidados o campos calculados).
+    '''
+    model = serializer.Meta.model
+    columns = {}
+    for field in model._meta.concrete_fields:
+        columns[field.name] = field.attname
+        columns[field.attname] = field.attname
+    ret = []
+    for field in serializer._readable_fields:
+        if isinstance(field, drf_fields.ModelField) or field.source not in columns:
+            return None
+        ret.append((field.field_name, columns[field.source], field))
+    return ret
+
+def _converter(field):
+    '''
+    Retorna la función que convierte el valor de la columna en el valor serializado, o `None` si es el mismo valor.
+    Las llaves foráneas se leen de su columna, por lo que `PrimaryKeyRelatedField` recibe directamente la llave.
+    '''
+    if type(field) in IDENTITY_FIELDS:
+        return None
+    if isinstance(field, PrimaryKeyRelatedField):
+        return field.pk_field.to_representation if field.pk_field is not None else None
+    return field.to_representation
+
+def compile_row_serializer(serializer, columns):
+    '''
+    Retorna una función que convierte una tupla con los valores de `columns` en el diccionario que retornaría el serializador.
+    Las funciones se guardan por clase de serializador, campos y columnas (hasta `COMPILED_CACHE_SIZE` combinaciones, ya que
+    la proyección de campos `fields=` permite muchas), por lo que cada una se compila una sola vez.
+    '''
+    names = tuple(name for name, column, field in readable_columns(serializer))
+    return _compile(type(serializer), names, tuple(columns))
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(serializer_class, names, columns):
+    serializer = serializer_class()
+    fields = {name: (column, field) for name, column, field in readable_columns(serializer)}
+    skip_empty = getattr(serializer, 'skip_empty_fields', False)
+    plan = tuple(
+        (name, columns.index(fields[name][0]), _converter(fields[name][1]))
+        for name in names
+    )
+
+    if skip_empty:
+        def row_to_dict(row):
+            ret = OrderedDict()
+            for name, index, convert in plan:
+                value = row[index]
+                if value is None or value == '':
+                    continue
+                ret[name] = value if convert is None else convert(value)
+            return ret
+    else:
+        def row_to_dict(row):
+            ret = OrderedDict()
+            for name, index, convert in plan:
+                value = row[index]
+                ret[name] = value if convert is None or value is None else convert(value)
+            return ret
+
+    return row_to_dict
@@ -0,0 +1,19 @@
+'''
+Backend de filtros de `django-filter` usado por todas las vistas (`filterset_fields`).
+'''
+from django_filters import CharFilter
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet
+from performance.models import EPSAForeignKey
+
+
+class CustomFilterSet(FilterSet):
+    '''
+    Filtra las llaves foráneas a `EPSA` por la sigla dada, como un filtro de texto sobre la columna indexada,
+    sin consultar `EPSA` ni rechazar siglas de EPSAs no registradas.
+    '''
+    FILTER_DEFAULTS = dict(FilterSet.FILTER_DEFAULTS)
+    FILTER_DEFAULTS[EPSAForeignKey] = {'filter_class': CharFilter}
+
+
+class CustomFilterBackend(DjangoFilterBackend):
+    filterset_base = CustomFilterSet
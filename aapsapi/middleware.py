@@ -0,0 +1,54 @@
+'''
+Instrumentación de las consultas SQL por pedido.
+'''
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+
+class QueryCounter:
+    '''
+    Envoltorio de ejecución (`connection.execute_wrapper`) que cuenta las consultas SQL ejecutadas y acumula su duración.
+    '''
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._stack.__exit__(*exc_info)
+
+
+class QueryCountMiddleware:
+    '''
+    Si la configuración `DB_QUERY_HEADERS` es verdadera, agrega a cada respuesta los encabezados `X-DB-Queries` (cantidad de
+    consultas SQL del pedido) y `X-DB-Time` (duración total de las consultas, en milisegundos).
+
+    En las respuestas enviadas por partes (`stream=true`, exportaciones) sólo se cuentan las consultas ejecutadas antes de
+    enviar los encabezados.
+    '''
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'DB_QUERY_HEADERS', False):
+            return self.get_response(request)
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+        response['X-DB-Queries'] = str(counter.count)
+        response['X-DB-Time'] = f'{counter.duration * 1000:.1f}'
+        return response
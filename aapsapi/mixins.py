@@ -0,0 +1,367 @@
+import datetime
+import hashlib
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max, prefetch_related_objects
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotAcceptable, ValidationError
+from rest_framework.response import Response
+from aapsapi import cache as response_cache
+from aapsapi.fastpath import readable_columns, compile_row_serializer
+from aapsapi.renderers import dumps
+
+
+def sync_cutoff():
+    '''
+    Retorna la fecha más antigua desde la que se conservan los registros de eliminaciones y de cambios (`SYNC_LOG_RETENTION_DAYS`).
+    '''
+    return timezone.now() - datetime.timedelta(days=getattr(settings, 'SYNC_LOG_RETENTION_DAYS', 90))
+
+def get_cursor_ordering(view):
+    '''
+    Retorna el orden de la lista de `view`: el de `view.get_cursor_ordering()` si existe, o el atributo `cursor_ordering`.
+    '''
+    method = getattr(view, 'get_cursor_ordering', None)
+    if method is not None:
+        return method()
+    return getattr(view, 'cursor_ordering', None)
+
+class FieldsProjectionMixin:
+    '''
+    Traslada el filtro de campos `fields`/`fields!` de `drf_queryfields` a la consulta, usando `.only()`,
+    para que la base de datos retorne sólo las columnas pedidas en lugar de la fila completa.
+    '''
+    project_fields = True
+    include_arg_name = 'fields'
+    exclude_arg_name = 'fields!'
+    delimiter = ','
+
+    def _requested_names(self, arg_name):
+        return {name for names in self.request.query_params.getlist(arg_name) for name in names.split(self.delimiter) if name}
+
+    def get_projection(self, model):
+        '''
+        Retorna los nombres de los campos de `model` a cargar, o `None` si no se pidió ningún filtro de campos.
+        '''
+        includes = self._requested_names(self.include_arg_name)
+        excludes = self._requested_names(self.exclude_arg_name)
+        if not includes and not excludes:
+            return None
+        names = {}
+        for field in model._meta.concrete_fields:
+            names[field.name] = names[field.attname] = field.name
+        concrete = set(names.values())
+        selected = (concrete & includes if includes else concrete) - excludes
+        required = {model._meta.pk.name} | {names[name] for name in get_cursor_ordering(self) or () if name in names}
+        return selected | required
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.project_fields or self.request is None or self.request.method != 'GET' or self.action not in ('list', 'retrieve'):
+            return queryset
+        projection = self.get_projection(queryset.model)
+        if projection is None:
+            return queryset
+        return queryset.only(*projection)
+
+
+class FastListMixin:
+    '''
+    Sirve la acción `list` leyendo tuplas de `values_list()` y convirtiéndolas con una función compilada por serializador,
+    en lugar de construir una instancia del modelo y recorrer los campos del serializador por cada fila.
+    Si algún campo pedido no corresponde a una columna del modelo, se usa la serialización normal.
+    '''
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        fields = readable_columns(serializer) if self.fast_list else None
+        if fields is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = []
+        required = list(get_cursor_ordering(self) or ()) + [queryset.model._meta.pk.attname]
+        for column in [column for name, column, field in fields] + required:
+            if column not in columns:
+                columns.append(column)
+        row_to_dict = compile_row_serializer(serializer, columns)
+        queryset = queryset.values_list(*columns, named=True)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response([row_to_dict(row) for row in page])
+        return Response([row_to_dict(row) for row in queryset])
+
+
+def is_not_modified(request, etag, last_modified):
+    '''
+    Indica si los encabezados `If-None-Match` o `If-Modified-Since` del pedido corresponden al `etag` y a la fecha de
+    modificación `last_modified` (timestamp en segundos) dados.
+    '''
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return bool(last_modified and if_modified_since and last_modified <= if_modified_since)
+
+
+class ConditionalGetMixin:
+    '''
+    Agrega los validadores `ETag` y `Last-Modified` a las respuestas de `list` y `retrieve`, calculados con una sola consulta agregada
+    (fecha de modificación máxima y cantidad de instancias) sobre el conjunto filtrado, y responde `304 Not Modified` si los
+    encabezados `If-None-Match` o `If-Modified-Since` del pedido corresponden a la versión vigente.
+
+    En `list`, si la vista registra eliminaciones (`tombstone_model`), la fecha de modificación incluye la de la última
+    eliminación del modelo. `Last-Modified` tiene resolución de segundos, por lo que no se envía ni se compara con
+    `If-Modified-Since` mientras no termine el segundo de la última modificación: otra escritura en ese mismo segundo no
+    cambiaría la fecha. En ese caso sólo se valida con `ETag`.
+    '''
+    modified_field = 'modified'
+
+    def get_validators(self):
+        '''
+        Retorna la tupla (etag, last_modified) del conjunto pedido, o `None` si el modelo no tiene campo de modificación.
+        '''
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            queryset.model._meta.get_field(self.modified_field)
+        except FieldDoesNotExist:
+            return None
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        state = queryset.order_by().aggregate(last_modified=Max(self.modified_field), count=Count('pk'))
+        last_modified = state['last_modified']
+        tombstone_model = getattr(self, 'tombstone_model', None)
+        if self.action == 'list' and tombstone_model:
+            deleted = apps.get_model(tombstone_model).objects.filter(
+                model=queryset.model._meta.label_lower,
+            ).aggregate(deleted=Max('deleted'))['deleted']
+            if deleted and (last_modified is None or deleted > last_modified):
+                last_modified = deleted
+        key = '|'.join([
+            last_modified.isoformat() if last_modified else '',
+            str(state['count']),
+            self.request.get_full_path(),
+            self.request.accepted_media_type or '',
+        ])
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        return etag, last_modified
+
+    def conditional(self, handler, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        etag, last_modified = validators
+        last_modified = last_modified and int(last_modified.timestamp())
+        if last_modified and last_modified >= int(timezone.now().timestamp()):
+            last_modified = None
+        if is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+
+class FullResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'La fecha es anterior al periodo de retención de las eliminaciones: se requiere una sincronización completa.'
+    default_code = 'full_resync_required'
+
+
+class DeltaSyncMixin:
+    '''
+    Permite sincronizar por diferencias: el parámetro `modified_since` limita la lista a las instancias modificadas desde
+    la fecha dada, y la acción `deleted` retorna las instancias eliminadas desde esa fecha.
+
+    Las eliminaciones se conservan `SYNC_LOG_RETENTION_DAYS` días, por lo que una fecha anterior responde `410 Gone`
+    (`full_resync_required`): el cliente debe descargar la lista completa y usar como siguiente fecha la de esa descarga.
+
+    Con `modified_since` la lista se ordena por fecha de modificación y llave primaria, para que la consulta recorra sólo
+    el rango del índice de `modified` en lugar de la tabla completa en el orden natural del modelo.
+    '''
+    since_param = 'modified_since'
+    tombstone_model = 'performance.Tombstone'
+
+    def get_since(self, required=False):
+        '''
+        Retorna la fecha del parámetro `modified_since` (ISO 8601, fecha o fecha y hora), o `None` si no fue dado.
+        '''
+        value = self.request.query_params.get(self.since_param)
+        if not value:
+            if required:
+                raise ValidationError({self.since_param: 'Este parámetro es obligatorio.'})
+            return None
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            since = date and datetime.datetime.combine(date, datetime.time.min)
+        if since is None:
+            raise ValidationError({self.since_param: f'"{value}" no es una fecha válida (ISO 8601).'})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        if since < sync_cutoff():
+            raise FullResyncRequired()
+        return since
+
+    def get_cursor_ordering(self):
+        if self.action == 'list' and self.request.query_params.get(self.since_param):
+            return ('modified', self.queryset.model._meta.pk.name)
+        return getattr(self, 'cursor_ordering', None)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list':
+            since = self.get_since()
+            if since is not None:
+                queryset = queryset.filter(modified__gte=since).order_by(*self.get_cursor_ordering())
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def deleted(self, request):
+        '''
+        Retorna las llaves primarias de las instancias eliminadas desde la fecha del parámetro obligatorio `modified_since`, por ejemplo,
+
+            GET /api/reports/deleted/?modified_since=2019-03-01T00:00:00Z
+
+        Cada elemento contiene el `id` de la instancia y la fecha `deleted` de su eliminación.
+        '''
+        since = self.get_since(required=True)
+        tombstones = apps.get_model(self.tombstone_model).objects.filter(model=self.get_queryset().model._meta.label_lower, deleted__gte=since)
+        return Response([{'id': object_id, 'deleted': deleted} for object_id, deleted in tombstones.values_list('object_id', 'deleted')])
+
+
+class ResponseCacheMixin:
+    '''
+    Guarda en el caché las respuestas de `list` y `retrieve`, con una llave que incluye la ruta, los parámetros del pedido y
+    la versión del modelo de la vista y de los modelos en `cache_models` (por ejemplo, los modelos anidados en la respuesta).
+    Cada respuesta lleva el encabezado `X-Cache` con el valor `HIT` o `MISS`.
+
+    Sólo se guardan las respuestas de los formatos en `cached_formats`, que no dependen del usuario: la página HTML de la
+    API navegable incluye el nombre del usuario y el token CSRF. Tampoco se guardan las respuestas que asignan cookies, ni
+    ninguna respuesta si el caché no es compartido entre los procesos del servidor.
+    '''
+    cache_responses = True
+    cache_models = ()
+    cached_headers = ('Content-Type', 'ETag', 'Last-Modified', 'Vary')
+    cached_formats = ('json', 'msgpack')
+
+    def is_cacheable(self, request):
+        renderer = getattr(request, 'accepted_renderer', None)
+        return (
+            self.cache_responses
+            and renderer is not None and renderer.format in self.cached_formats
+            and response_cache.is_shared()
+        )
+
+    def cached(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+        key = response_cache.response_key(request, [self.get_queryset().model, *self.cache_models])
+        entry = response_cache.get_cache().get(key)
+        if entry is not None:
+            response_cache.record('hit')
+            content, headers = entry
+            last_modified = parse_http_date_safe(headers.get('Last-Modified', ''))
+            if is_not_modified(request, headers.get('ETag'), last_modified):
+                response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = HttpResponse(content)
+            for name, value in headers.items():
+                response[name] = value
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response_cache.record('miss')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not response.streaming:
+            response = self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            if not response.cookies and 'cookie' not in response.get('Vary', '').lower():
+                headers = {name: response[name] for name in self.cached_headers if response.has_header(name)}
+                response_cache.get_cache().set(key, (response.content, headers), response_cache.timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+
+class StreamingListMixin:
+    '''
+    Con el parámetro `stream=true`, la acción `list` lee el conjunto filtrado por partes con `.iterator()` y escribe el
+    arreglo JSON de forma incremental, fila por fila, en una `StreamingHttpResponse`, sin paginar. La memoria usada no
+    depende de la cantidad de instancias retornadas.
+
+    La respuesta por partes es siempre JSON: los pedidos de otro formato (`format=msgpack`, la API navegable) responden
+    `406 Not Acceptable` en lugar de recibir JSON.
+    '''
+    stream_param = 'stream'
+    stream_chunk_size = 2000
+    stream_formats = ('json',)
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.stream_param, '').lower() not in ('true', '1'):
+            return super().list(request, *args, **kwargs)
+        if request.accepted_renderer.format not in self.stream_formats:
+            raise NotAcceptable(f'El parámetro {self.stream_param}=true sólo está disponible en formato JSON.')
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = get_cursor_ordering(self)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return StreamingHttpResponse(self.stream_json(self.stream_rows(queryset)), content_type='application/json')
+
+    def stream_rows(self, queryset):
+        '''
+        Genera los diccionarios serializados de las instancias de `queryset`, usando la función compilada de `FastListMixin`
+        si los campos pedidos lo permiten, o el serializador con las relaciones precargadas por partes en caso contrario.
+        '''
+        serializer = self.get_serializer()
+        fields = readable_columns(serializer) if getattr(self, 'fast_list', False) else None
+        if fields is not None:
+            columns = [column for name, column, field in fields]
+            row_to_dict = compile_row_serializer(serializer, columns)
+            for row in queryset.values_list(*columns).iterator(chunk_size=self.stream_chunk_size):
+                yield row_to_dict(row)
+            return
+        prefetch = queryset._prefetch_related_lookups
+        chunk = []
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            chunk.append(instance)
+            if len(chunk) == self.stream_chunk_size:
+                yield from self.serialize_chunk(chunk, prefetch)
+                chunk = []
+        yield from self.serialize_chunk(chunk, prefetch)
+
+    def serialize_chunk(self, chunk, prefetch):
+        if prefetch:
+            prefetch_related_objects(chunk, *prefetch)
+        yield from self.get_serializer(chunk, many=True).data
+
+    def stream_json(self, rows):
+        yield b'['
+        for index, row in enumerate(rows):
+            yield (b',' if index else b'') + dumps(row)
+        yield b']'
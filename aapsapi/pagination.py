@@ -0,0 +1,140 @@
+import base64
+import datetime
+import json
+from collections import OrderedDict
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from aapsapi.mixins import get_cursor_ordering
+
+
+class KeysetPagination(BasePagination):
+    '''
+    Paginación por llave (keyset) según el orden natural de cada modelo, definido en el atributo `cursor_ordering` de la vista
+    (o por su método `get_cursor_ordering`).
+
+    Cada página se obtiene filtrando las filas posteriores a la última fila de la página anterior, sin `OFFSET` ni `COUNT(*)`,
+    por lo que el costo de una página no depende de su profundidad. La paginación es opcional y se activa con los parámetros
+    `page_size` o `cursor`; sin ellos la lista completa es retornada como antes.
+    '''
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    default_page_size = 100
+    max_page_size = 1000
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def get_ordering(self, view, queryset):
+        pk_name = queryset.model._meta.pk.name
+        ordering = list(get_cursor_ordering(view) or [pk_name])
+        if pk_name not in ordering and 'pk' not in ordering:
+            ordering.append(pk_name)
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.default_page_size))
+        except ValueError:
+            page_size = self.default_page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def encode_value(self, value):
+        # Las fechas se codifican en ISO 8601 con microsegundos, para que el filtro de la página siguiente sea exacto.
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        raise TypeError(f'{type(value).__name__} no es serializable en un cursor.')
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position, default=self.encode_value).encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def _greater(self, field, value):
+        if value is None:
+            return Q(pk__in=[]) if self.nulls_largest else Q(**{f'{field}__isnull': False})
+        condition = Q(**{f'{field}__gt': value})
+        if self.nulls_largest:
+            condition |= Q(**{f'{field}__isnull': True})
+        return condition
+
+    def _equal(self, field, value):
+        if value is None:
+            return Q(**{f'{field}__isnull': True})
+        return Q(**{field: value})
+
+    def after(self, position):
+        '''
+        Construye la condición "fila posterior a `position`" según el orden de `self.ordering`,
+        respetando la posición de los nulos en el orden de la base de datos.
+        '''
+        condition = Q(pk__in=[])
+        for i, field in enumerate(self.ordering):
+            branch = self._greater(field, position[i])
+            for previous, value in zip(self.ordering[:i], position[:i]):
+                branch &= self._equal(previous, value)
+            condition |= branch
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.page_size_query_param not in request.query_params and self.cursor_query_param not in request.query_params:
+            return None
+        self.request = request
+        self.ordering = self.get_ordering(view, queryset)
+        self.nulls_largest = connections[queryset.db].features.nulls_order_largest
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.after(position))
+            except (TypeError, ValueError, ValidationError):
+                # Valores del cursor que no corresponden al tipo de su campo.
+                raise NotFound(self.invalid_cursor_message)
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_position = [getattr(rows[-1], field) for field in self.ordering] if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_schema_fields(self, view):
+        import coreapi
+        import coreschema
+        return [
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(title='Cursor', description='Cursor de la página, tomado del enlace `next` de la página anterior.')
+            ),
+            coreapi.Field(
+                name=self.page_size_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.Integer(title='Tamaño de página', description=f'Cantidad de resultados por página (máximo {self.max_page_size}).')
+            ),
+        ]
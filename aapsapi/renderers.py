@@ -0,0 +1,83 @@
+'''
+Renderizador JSON basado en `orjson`, con la misma salida que el de DRF (fechas, decimales y textos traducibles son
+convertidos por el `JSONEncoder` de DRF). Si `orjson` no está instalado se comporta como el de DRF.
+
+Renderizador MessagePack para clientes que descargan grandes volúmenes de datos, con las mismas conversiones de tipos.
+'''
+import json
+import math
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+import msgpack
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = encoders.JSONEncoder()
+
+if orjson is not None:
+    # Las fechas se delegan al codificador de DRF para conservar su formato (por ejemplo, "Z" en lugar de "+00:00").
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+def has_non_finite(data):
+    '''
+    Indica si `data` contiene algún número de punto flotante infinito o `NaN`, recorriendo listas y diccionarios.
+    '''
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        values = value.values() if isinstance(value, dict) else value
+        for item in values:
+            if isinstance(item, float):
+                if not math.isfinite(item):
+                    return True
+            elif isinstance(item, (dict, list, tuple)):
+                pending.append(item)
+    return False
+
+def dumps(data):
+    '''
+    Codifica `data` como JSON compacto en UTF-8, igual que `JSONRenderer` de DRF con la configuración por defecto.
+    Como el de DRF (`allow_nan=False`), los números infinitos o `NaN` producen `ValueError`: `orjson` los escribiría como
+    `null`, por lo que se buscan en los datos cuando la salida contiene `null`.
+    '''
+    if orjson is None:
+        ret = json.dumps(data, cls=encoders.JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+        return ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode('utf-8')
+    ret = orjson.dumps(data, default=_encoder.default, option=OPTIONS)
+    if b'null' in ret and has_non_finite([data]):
+        raise ValueError('Out of range float values are not JSON compliant')
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+    '''
+    `JSONRenderer` que codifica con `orjson`. Las respuestas con sangría (por ejemplo, las de la API navegable) usan el de DRF.
+    '''
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return bytes()
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    '''
+    Codifica la respuesta en MessagePack. Se selecciona con el encabezado `Accept: application/msgpack` o con `?format=msgpack`.
+    '''
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return bytes()
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True)
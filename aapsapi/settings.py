@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'aapsapi.middleware.QueryCountMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -92,10 +93,44 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.TokenAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.rest_framework.DjangoFilterBackend',
-    ]
+        'aapsapi.filters.CustomFilterBackend',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'aapsapi.pagination.KeysetPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'aapsapi.renderers.FastJSONRenderer',
+        'aapsapi.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'aapsapi.parsers.FastJSONParser',
+        'aapsapi.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Caché de las respuestas de la API (ver aapsapi/cache.py). Debe ser compartido entre los procesos del servidor: con el
+# caché local por defecto de Django las respuestas no se guardan (verificación aapsapi.W001). Por ejemplo, con memcached:
+#
+#     CACHES = {
+#         'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+#         'responses': {'BACKEND': 'django.core.cache.backends.memcached.PyLibMCCache', 'LOCATION': '127.0.0.1:11211'},
+#     }
+#     RESPONSE_CACHE_ALIAS = 'responses'
+#
+# El caché de base de datos (`django.core.cache.backends.db.DatabaseCache`) también es compartido, pero requiere crear su
+# tabla con `python manage.py createcachetable` antes de atender pedidos.
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+RESPONSE_CACHE_APPS = ('performance', 'planning', 'ambiental', 'supply_areas')
+
+# Días que se conservan los registros de eliminaciones (`Tombstone`) y de cambios de reportes de variables (ver
+# `python manage.py purge_sync_log`). La sincronización por diferencias desde una fecha anterior requiere una sincronización completa.
+SYNC_LOG_RETENTION_DAYS = 90
+
+# Agrega los encabezados X-DB-Queries y X-DB-Time a las respuestas (ver aapsapi/middleware.py).
+DB_QUERY_HEADERS = DEBUG
+
 SERIALIZATION_MODULES = {'geojson': 'djgeojson.serializers'}
 
 JET_INDEX_DASHBOARD = 'dashboard.CustomIndexDashboard'
\ No newline at end of file
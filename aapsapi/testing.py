@@ -0,0 +1,180 @@
+'''
+Utilidades compartidas por las pruebas de las aplicaciones.
+'''
+import os
+import re
+import tempfile
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APIClient
+from aapsapi.mixins import ResponseCacheMixin
+from performance.models import EPSA
+
+# Patrones que identifican, en la salida de EXPLAIN, el recorrido completo de una tabla.
+SEQUENTIAL_SCAN = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)'),
+}
+
+# Caché compartido entre procesos para las pruebas del caché de respuestas (el caché local por defecto no guarda respuestas).
+shared_cache = override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.path.join(tempfile.gettempdir(), 'aapsapi-test-cache'),
+}})
+
+
+class QueryPlanMixin:
+    '''
+    Mixin de `TestCase` con aserciones sobre el plan de ejecución (`EXPLAIN`) de las consultas.
+    '''
+    @classmethod
+    def analyze(cls):
+        '''
+        Actualiza las estadísticas del planificador después de cargar los datos de prueba.
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    # Tuplas (vista, parámetros) de las listas filtradas que deben usar un índice (`test_view_filters`).
+    view_filters = ()
+
+    def test_view_filters(self):
+        for viewset, params in self.view_filters:
+            with self.subTest(view=viewset.__name__, **params):
+                self.assertUsesIndex(self.view_queryset(viewset, **params))
+
+    def view_queryset(self, viewset, action='list', **params):
+        '''
+        Retorna el conjunto que consulta la acción `action` de `viewset` para un pedido `GET` con los parámetros `params`,
+        con los filtros y el orden que aplica la vista.
+        '''
+        view = viewset(action_map={'get': action}, args=(), kwargs={}, format_kwarg=None)
+        view.request = view.initialize_request(RequestFactory().get('/', params))
+        return view.filter_queryset(view.get_queryset())
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Con pocos datos el planificador prefiere el recorrido secuencial aunque exista un índice utilizable.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset):
+        '''
+        Falla si la consulta recorre completa la tabla principal de `queryset` en lugar de buscar en un índice.
+        '''
+        pattern = SEQUENTIAL_SCAN.get(connection.vendor)
+        if pattern is None:
+            self.skipTest(f'No se reconocen los planes de ejecución de {connection.vendor}.')
+        table = queryset.model._meta.db_table
+        plan = self.explain(queryset)
+        self.assertNotIn(table, pattern.findall(plan), f'La consulta recorre completa la tabla {table}:\n{queryset.query}\n{plan}')
+
+
+class QueryBudgetMixin:
+    '''
+    Mixin de `TestCase` que verifica que la cantidad de consultas SQL de los puntos de acceso se mantiene dentro de un
+    presupuesto y no crece con la cantidad de instancias (consultas N+1). Requiere `self.client` (`APIClient`) autenticado.
+    '''
+    api_prefix = '/api/'
+
+    def router_urls(self, router):
+        '''
+        Genera tuplas (nombre, url) con los puntos de acceso de lista y de detalle de cada vista registrada en `router`.
+        El detalle usa la primera instancia del modelo de la vista.
+        '''
+        for prefix, viewset, basename in router.registry:
+            yield f'{prefix}-list', f'{self.api_prefix}{prefix}/'
+            instance = viewset.queryset.model.objects.order_by('pk').first()
+            if instance is not None:
+                yield f'{prefix}-detail', f'{self.api_prefix}{prefix}/{instance.pk}/'
+
+    def count_queries(self, url, **params):
+        '''
+        Retorna la cantidad de consultas del pedido `GET url`, según el encabezado `X-DB-Queries`, sin el caché de respuestas.
+        '''
+        with override_settings(DB_QUERY_HEADERS=True), mock.patch.object(ResponseCacheMixin, 'cache_responses', False):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, f'{url}: {response.status_code}')
+        return int(response['X-DB-Queries'])
+
+    def assertQueryBudget(self, router, budgets, seed, sizes=(2, 20)):
+        '''
+        Llama a `seed(n)` con cada valor de `sizes` y, después de cada carga, cuenta las consultas de cada punto de acceso
+        de `router`. Falla si algún punto de acceso no tiene presupuesto en `budgets` ({nombre: consultas}), si lo excede,
+        o si la cantidad de consultas cambia con la cantidad de instancias.
+        '''
+        counts = {}
+        for size in sizes:
+            seed(size)
+            for name, url in self.router_urls(router):
+                self.assertIn(name, budgets, f'El punto de acceso {name} no tiene un presupuesto de consultas.')
+                count = self.count_queries(url)
+                self.assertLessEqual(count, budgets[name], f'{url} ejecutó {count} consultas con {size} instancias (presupuesto: {budgets[name]}).')
+                counts.setdefault(name, {})[size] = count
+        for name, by_size in counts.items():
+            self.assertEqual(len(set(by_size.values())), 1, f'Las consultas de {name} crecen con la cantidad de instancias: {by_size}.')
+
+    def assertUrlQueryBudget(self, url, budget, seed, sizes=(2, 20)):
+        '''
+        Como `assertQueryBudget`, para un solo punto de acceso `url` (por ejemplo, una página del admin).
+        '''
+        counts = {}
+        for size in sizes:
+            seed(size)
+            counts[size] = self.count_queries(url)
+            self.assertLessEqual(counts[size], budget, f'{url} ejecutó {counts[size]} consultas con {size} instancias (presupuesto: {budget}).')
+        self.assertEqual(len(set(counts.values())), 1, f'Las consultas de {url} crecen con la cantidad de instancias: {counts}.')
+
+
+class UnknownEPSAMixin:
+    '''
+    Mixin de `TestCase` que verifica el tratamiento de las siglas de EPSAs no registradas (`unknown_epsa`) en la carga
+    masiva de `url`. Las clases definen `model` y `data`, una lista con un objeto de la EPSA registrada `AAPOS` seguido de
+    uno de la EPSA no registrada `NUEVA`.
+    '''
+    url = None
+    model = None
+    data = ()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        EPSA.objects.create(code='AAPOS', state='PO', category='A')
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, mode, data=None):
+        return self.client.post(f'{self.url}?unknown_epsa={mode}', list(data or self.data), format='json')
+
+    def test_flag(self):
+        response = self.post('flag')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([next(iter(item)) for item in response.data], ['creado', 'creado'])
+        self.assertNotIn('advertencias', response.data[0])
+        self.assertIn('epsa_desconocida', response.data[1]['advertencias'])
+        self.assertEqual(self.model.objects.count(), 2)
+        self.assertFalse(EPSA.objects.filter(code='NUEVA').exists())
+
+    def test_reject(self):
+        response = self.post('reject')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('creado', response.data[0])
+        self.assertIn('epsa_desconocida', response.data[1]['ignorado'])
+        self.assertEqual(list(self.model.objects.values_list('epsa', flat=True)), ['AAPOS'])
+
+    def test_create(self):
+        response = self.post('create')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data[1]['advertencias'], {'epsa_creada': 'La EPSA NUEVA no estaba registrada y fue creada.'})
+        self.assertTrue(EPSA.objects.filter(code='NUEVA').exists())
+        self.assertEqual(self.model.objects.count(), 2)
+
+    def test_invalid_mode(self):
+        self.assertEqual(self.post('ignore').status_code, 400)
@@ -0,0 +1,476 @@
+import base64
+import json
+import re
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import count
+from unittest import mock
+import msgpack
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.deletion import Collector
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from aapsapi import cache as response_cache, fastpath
+from aapsapi.cache import check_shared_cache
+from aapsapi.fastpath import readable_columns, compile_row_serializer
+from aapsapi.mixins import FastListMixin, FieldsProjectionMixin, ResponseCacheMixin
+from aapsapi.renderers import FastJSONRenderer
+from aapsapi.testing import QueryBudgetMixin, shared_cache
+from aapsapi.urls import router
+from ambiental.models import SARH, TecnicalDataSub, TecnicalDataSup
+from performance.dimensions import epsa_dimension
+from performance.models import EPSA, Variable, Indicator, VariableReport, IndicatorMeasurement, Tombstone
+from performance.serializers import VariableReportSerializer
+from planning.models import POA, CoopExpense, MuniExpense, Plan, PlanGoal
+from supply_areas.models import SupplyArea
+
+# Presupuesto de consultas por punto de acceso, con el caché de respuestas desactivado. Las listas con validadores leen
+# además la fecha de la última eliminación del modelo.
+QUERY_BUDGETS = {
+    'supply_areas-list': 1,
+    'supply_areas-detail': 1,
+    'sarhs-list': 3,
+    'sarhs-detail': 3,
+    'epsas-list': 3,
+    'epsas-detail': 2,
+    'variables-list': 3,
+    'variables-detail': 2,
+    'indicators-list': 3,
+    'indicators-detail': 2,
+    'reports-list': 3,
+    'reports-detail': 2,
+    'measurements-list': 3,
+    'measurements-detail': 2,
+    'poas-list': 3,
+    'poas-detail': 2,
+    'plans-list': 4,
+    'plans-detail': 3,
+}
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    '''
+    Verifica que cada punto de acceso del router ejecuta una cantidad de consultas acotada, que no depende de la cantidad
+    de instancias ni de sus objetos anidados.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+
+    def setUp(self):
+        epsa_dimension.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.sequence = count(1)
+
+    def seed(self, size):
+        for i in [next(self.sequence) for _ in range(size)]:
+            epsa = EPSA.objects.create(code=f'EPSA{i}', state='LP', category='A')
+            Variable.objects.create(code=f'V{i}', var_id=i)
+            Indicator.objects.create(code=f'I{i}', ind_id=i)
+            VariableReport.objects.create(epsa=epsa, year=2017, month=i % 12 + 1)
+            IndicatorMeasurement.objects.create(epsa=epsa, year=2017, month=i % 12 + 1)
+            poa = POA.objects.create(epsa=epsa, year=2017, order=1)
+            CoopExpense.objects.create(poa=poa)
+            MuniExpense.objects.create(poa=poa)
+            plan = Plan.objects.create(epsa=epsa, year=2017)
+            PlanGoal.objects.bulk_create([PlanGoal(plan=plan, year=2018 + j, value=j, description='meta', unit='conexiones') for j in range(3)])
+            sarh = SARH.objects.create(sarh_id=f'SARH{i}', epsa=epsa)
+            TecnicalDataSub.objects.bulk_create([TecnicalDataSub(sarh=sarh) for j in range(2)])
+            TecnicalDataSup.objects.bulk_create([TecnicalDataSup(sarh=sarh) for j in range(2)])
+            SupplyArea.objects.create(epsa=epsa)
+
+    def test_router_query_budgets(self):
+        self.assertQueryBudget(router, QUERY_BUDGETS, self.seed)
+
+
+@shared_cache
+class ResponseCacheTests(TestCase):
+    '''
+    Verifica qué respuestas guarda el caché de respuestas.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_superuser('alice_admin', 'alice@example.com', 'alice')
+        cls.bob = User.objects.create_superuser('bob_viewer', 'bob@example.com', 'bob')
+        EPSA.objects.create(code='AAPOS', state='PO', category='A')
+
+    def setUp(self):
+        cache.clear()
+        response_cache.reset_stats()
+
+    def get(self, user, **extra):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get('/api/epsas/', **extra)
+
+    def test_json_is_cached(self):
+        self.assertEqual(self.get(self.alice)['X-Cache'], 'MISS')
+        response = self.get(self.bob)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()[0]['code'], 'AAPOS')
+
+    def test_hit_makes_no_queries(self):
+        self.get(self.alice)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(self.bob)['X-Cache'], 'HIT')
+
+    def test_stats_are_flushed_periodically(self):
+        self.get(self.alice)
+        self.get(self.bob)
+        self.assertEqual(response_cache.stats(), {'hit': 0, 'miss': 0})
+        response_cache.response_stats.flush()
+        self.assertEqual(response_cache.stats(), {'hit': 1, 'miss': 1})
+
+    def test_html_is_not_cached(self):
+        self.get(self.alice, HTTP_ACCEPT='text/html')
+        response = self.get(self.bob, HTTP_ACCEPT='text/html')
+        self.assertNotIn('X-Cache', response)
+        self.assertNotIn(b'alice_admin', response.content)
+        self.assertIn(b'bob_viewer', response.content)
+
+    def test_unrelated_models_keep_fast_delete(self):
+        self.assertIn(SARH, response_cache.cached_models())
+        for model in (Session, Tombstone, SupplyArea):
+            self.assertNotIn(model, response_cache.cached_models())
+            self.assertTrue(Collector(using='default').can_fast_delete(model.objects.all()))
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_local_cache_is_not_used(self):
+        self.get(self.alice)
+        self.assertNotIn('X-Cache', self.get(self.bob))
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ['aapsapi.W001'])
+
+
+class DeltaSyncTests(TestCase):
+    '''
+    Verifica la lista por diferencias (`modified_since`) paginada por llave.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        EPSA.objects.create(code='AAPOS', state='PO', category='A')
+        for year in range(2010, 2015):
+            VariableReport.objects.create(epsa_id='AAPOS', year=year)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_follow_modification_order(self):
+        VariableReport.objects.filter(year=2011).update(v1=1, modified=timezone.now())
+        years = []
+        url = '/api/reports/?page_size=2&modified_since=' + (timezone.now() - timedelta(days=1)).date().isoformat()
+        with mock.patch.object(ResponseCacheMixin, 'cache_responses', False):
+            while url:
+                page = self.client.get(url).json()
+                years += [report['year'] for report in page['results']]
+                url = page['next']
+        self.assertEqual(years, [2010, 2012, 2013, 2014, 2011])
+
+    @override_settings(SYNC_LOG_RETENTION_DAYS=30)
+    def test_dates_before_retention_require_full_resync(self):
+        since = (timezone.now() - timedelta(days=31)).date().isoformat()
+        for url in ['/api/reports/', '/api/reports/deleted/']:
+            response = self.client.get(url, {'modified_since': since})
+            self.assertEqual(response.status_code, 410)
+            self.assertEqual(response.data['detail'].code, 'full_resync_required')
+
+
+@mock.patch.object(ResponseCacheMixin, 'cache_responses', False)
+class StreamingListTests(TestCase):
+    '''
+    Verifica que la lista por partes (`stream=true`) retorna lo mismo que la lista normal.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        for i, code in enumerate(['AAPOS', 'EPSAS', 'SAGUAPAC']):
+            EPSA.objects.create(code=code, state='LP', category='A')
+            VariableReport.objects.create(epsa_id=code, year=2017, month=None, v1=i, v2_type='NC')
+            VariableReport.objects.create(epsa_id=code, year=2017, month=6, v1=i + 0.5)
+            sarh = SARH.objects.create(sarh_id=f'SARH{i}', epsa_id=code)
+            TecnicalDataSub.objects.bulk_create([TecnicalDataSub(sarh=sarh, year=2017 + j) for j in range(2)])
+            TecnicalDataSup.objects.create(sarh=sarh, year=2017)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertStreamEqualsList(self, url, **params):
+        expected = self.client.get(url, params).json()
+        response = self.client.get(url, dict(params, stream='true'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+        return expected
+
+    def test_reports(self):
+        self.assertStreamEqualsList('/api/reports/')
+        self.assertStreamEqualsList('/api/reports/', fields='epsa,year,month,v1', year='2017')
+
+    def test_sarhs_with_nested_data(self):
+        sarhs = self.assertStreamEqualsList('/api/sarhs/')
+        self.assertEqual([(len(sarh['tecnical_sub']), len(sarh['tecnical_sup'])) for sarh in sarhs], [(2, 1)] * 3)
+
+    def test_other_formats_are_rejected(self):
+        response = self.client.get('/api/reports/', {'stream': 'true', 'format': 'msgpack'})
+        self.assertEqual(response.status_code, 406)
+
+
+class ReportRowSerializer(VariableReportSerializer):
+    v1_decimal = serializers.DecimalField(source='v1', max_digits=12, decimal_places=3, allow_null=True)
+
+
+class SARHRowSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SARH
+        fields = ('sarh_id', 'epsa', 'rar_date', 'notification_date', 'auth_year')
+
+
+class FastPathTests(TestCase):
+    '''
+    Verifica que las funciones compiladas de `aapsapi.fastpath` producen la misma salida que el serializador.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=None, v1=1.25, v2_type='NC')
+        VariableReport.objects.create(epsa_id='NUEVA', year=2017, month=6, v1=None, v3=0)
+        SARH.objects.create(sarh_id='SARH1', epsa_id='AAPOS', rar_date=date(2017, 3, 1))
+        SARH.objects.create(sarh_id='SARH2', epsa_id='NUEVA')
+
+    def assertSameAsSerializer(self, serializer_class, queryset):
+        serializer = serializer_class()
+        columns = [column for name, column, field in readable_columns(serializer)]
+        row_to_dict = compile_row_serializer(serializer, columns)
+        rows = [list(row_to_dict(row).items()) for row in queryset.values_list(*columns)]
+        self.assertEqual(rows, [list(data.items()) for data in serializer_class(queryset, many=True).data])
+        return rows
+
+    def test_reports(self):
+        [first, second] = self.assertSameAsSerializer(ReportRowSerializer, VariableReport.objects.order_by('month'))
+        self.assertIn(('v1_decimal', '1.250'), first)
+        self.assertIn(('v1_decimal', None), second)
+
+    def test_dates(self):
+        [first, second] = self.assertSameAsSerializer(SARHRowSerializer, SARH.objects.order_by('sarh_id'))
+        self.assertIn(('rar_date', '2017-03-01'), first)
+        self.assertIn(('rar_date', None), second)
+
+    def test_compiled_functions_are_bounded(self):
+        serializer = VariableReportSerializer()
+        columns = [column for name, column, field in readable_columns(serializer)]
+        for i in range(fastpath.COMPILED_CACHE_SIZE + 10):
+            compile_row_serializer(serializer, columns + [f'extra{i}'])
+        self.assertEqual(fastpath._compile.cache_info().currsize, fastpath.COMPILED_CACHE_SIZE)
+
+
+class RendererTests(TestCase):
+    '''
+    Verifica que `FastJSONRenderer` produce la misma salida que `JSONRenderer` de DRF.
+    '''
+    def render(self, data):
+        return FastJSONRenderer().render(data), JSONRenderer().render(data)
+
+    def test_same_output_as_drf(self):
+        data = {
+            'decimal': Decimal('1.50'),
+            'date': date(2017, 3, 1),
+            'datetime': datetime(2017, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+            'naive': datetime(2017, 3, 1, 12, 30),
+            'time': time(8, 15),
+            'lazy': gettext_lazy('Este campo es requerido.'),
+            'floats': [0.1, 2.5, -0.0, 1 / 3, 123456789.123],
+            'text': 'ñandú ',
+            'none': None,
+        }
+        fast, drf = self.render(data)
+        self.assertEqual(fast, drf)
+
+    def test_exponents_have_the_same_value(self):
+        # orjson escribe `1e20` donde DRF escribe `1e+20`: el texto difiere pero el valor es el mismo.
+        fast, drf = self.render([1e-7, 1e16, 1e20, 1.5e300])
+        self.assertEqual(json.loads(fast), json.loads(drf))
+
+    def test_non_finite_floats_are_rejected(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            for data in ({'v1': value}, [{'v1': 1.0, 'v2': [None, value]}], value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(data)
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render(data)
+        self.assertEqual(FastJSONRenderer().render({'v1': None}), b'{"v1":null}')
+
+
+@mock.patch.object(ResponseCacheMixin, 'cache_responses', False)
+class MessagePackTests(TestCase):
+    '''
+    Verifica las lecturas y cargas masivas en MessagePack (`application/msgpack`).
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        EPSA.objects.create(code='AAPOS', state='PO', category='A')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, url, data):
+        response = self.client.post(url, msgpack.packb(data), content_type='application/msgpack', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        return response, msgpack.unpackb(response.content, raw=False)
+
+    def test_get(self):
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=None, v1=1.5, v2_type='NC')
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=6, v1=None)
+        response = self.client.get('/api/reports/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content, raw=False), self.client.get('/api/reports/').json())
+
+    def test_bulk_reports(self):
+        data = [{'epsa': 'AAPOS', 'year': 2017, 'month': month, 'v1': month * 1.5} for month in (1, 2)]
+        response, items = self.post('/api/reports/', data)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([next(iter(item)) for item in items], ['creado', 'creado'])
+        data[0]['v1'] = 10.0
+        response, items = self.post('/api/reports/', data)
+        self.assertEqual([next(iter(item)) for item in items], ['actualizado', 'actualizado'])
+        self.assertEqual(list(VariableReport.objects.order_by('month').values_list('month', 'v1')), [(1, 10.0), (2, 3.0)])
+
+    def test_bulk_poas(self):
+        data = [{'epsa': 'AAPOS', 'year': 2017, 'order': 1, 'coop_expense': {'costos_operacion': 10}}]
+        response, items = self.post('/api/poas/', data)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(CoopExpense.objects.get().poa.epsa_id, 'AAPOS')
+        response = self.client.get('/api/poas/', HTTP_ACCEPT='application/msgpack')
+        [poa] = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(poa['coop_expense']['costos_operacion'], 10)
+
+    def test_invalid_body(self):
+        response = self.client.post('/api/reports/', b'\xc1', content_type='application/msgpack')
+        self.assertEqual(response.status_code, 400)
+
+
+@mock.patch.object(ResponseCacheMixin, 'cache_responses', False)
+class KeysetPaginationTests(TestCase):
+    '''
+    Verifica la paginación por llave de la lista de reportes, ordenada por EPSA, año, mes (anual primero) e id.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        for code in ('EPSAS', 'AAPOS'):
+            for year in (2018, 2017):
+                for month in (None, 12, 1):
+                    VariableReport.objects.create(epsa_id=code, year=year, month=month, v1=year + (month or 0))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json()['results'])
+            url = response.json()['next']
+        return pages
+
+    def key(self, report):
+        return report['epsa'], report['year'], report['month']
+
+    def test_pages_match_the_list(self):
+        expected = self.client.get('/api/reports/').json()
+        for page_size in (1, 4, 5, 12, 100):
+            pages = self.walk(f'/api/reports/?page_size={page_size}')
+            self.assertEqual([report for page in pages for report in page], expected)
+            self.assertTrue(all(len(page) == page_size for page in pages[:-1]))
+
+    def test_boundary_between_equal_values(self):
+        # Con 4 filas por página, el corte cae entre reportes de la misma EPSA y el mismo año.
+        first, second, *rest = self.walk('/api/reports/?page_size=4&fields=epsa,year,month')
+        self.assertEqual(first[-1]['epsa'], second[0]['epsa'])
+        self.assertEqual(first[-1]['year'], second[0]['year'])
+        keys = [self.key(report) for page in (first, second, *rest) for report in page]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertEqual(len(keys), 12)
+
+    def test_tampered_cursor(self):
+        next_link = self.client.get('/api/reports/?page_size=2').json()['next']
+        self.assertEqual(self.client.get(next_link).status_code, 200)
+        cursors = [
+            next_link.split('cursor=')[1][:-2],
+            'no-es-un-cursor',
+            base64.urlsafe_b64encode(b'["AAPOS", 2017]').decode(),
+            base64.urlsafe_b64encode(b'{"epsa": "AAPOS"}').decode(),
+            base64.urlsafe_b64encode(b'["AAPOS", "un", "cursor", 1]').decode(),
+        ]
+        for cursor in cursors:
+            response = self.client.get('/api/reports/', {'page_size': 2, 'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        cursor = base64.urlsafe_b64encode(b'["ayer", 1]').decode()
+        response = self.client.get('/api/reports/', {'page_size': 2, 'cursor': cursor, 'modified_since': since})
+        self.assertEqual(response.status_code, 404)
+
+
+@mock.patch.object(ResponseCacheMixin, 'cache_responses', False)
+class FieldsProjectionTests(TestCase):
+    '''
+    Verifica que el filtro de campos `fields`/`fields!` limita las columnas leídas sin cambiar la respuesta.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        cls.report = VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=None, v1=1.5, v2=2, v3_type='NC')
+        VariableReport.objects.create(epsa_id='EPSAS', year=2017, month=6, v1=None, v2=3)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def selected_columns(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        table = VariableReport._meta.db_table
+        [select] = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql'] and 'MAX(' not in query['sql']
+        ]
+        columns = re.findall(rf'"{table}"\."(\w+)"', select.split(' FROM ')[0])
+        return set(columns), response.json()
+
+    def assertProjected(self, url, params, expected):
+        columns, data = self.selected_columns(url, params)
+        self.assertEqual(columns, expected)
+        # Referencia: serialización normal de las instancias completas.
+        with mock.patch.object(FieldsProjectionMixin, 'project_fields', False), mock.patch.object(FastListMixin, 'fast_list', False):
+            full_columns, full_data = self.selected_columns(url, params)
+        self.assertGreater(len(full_columns), 100)
+        self.assertEqual(data, full_data)
+        return data
+
+    def test_list(self):
+        required = {'id', 'epsa', 'year', 'month'}
+        data = self.assertProjected('/api/reports/', {'fields': 'epsa,v1'}, required | {'v1'})
+        self.assertEqual(data, [{'epsa': 'AAPOS', 'v1': 1.5}, {'epsa': 'EPSAS', 'v1': None}])
+        with mock.patch.object(FastListMixin, 'fast_list', False):
+            self.assertProjected('/api/reports/', {'fields': 'epsa,v1,v3_type'}, required | {'v1', 'v3_type'})
+
+    def test_excluded_fields(self):
+        excluded = ','.join(f'v{i}' for i in range(2, 52)) + ',' + ','.join(f'v{i}_type' for i in range(1, 52))
+        data = self.assertProjected('/api/reports/', {'fields!': excluded}, {'id', 'epsa', 'year', 'month', 'v1', 'modified'})
+        self.assertEqual(data[0]['v1'], 1.5)
+
+    def test_retrieve(self):
+        self.assertProjected(f'/api/reports/{self.report.pk}/', {'fields': 'year,v2'}, {'id', 'epsa', 'year', 'month', 'v2'})
@@ -54,6 +54,33 @@ Los pedidos al sistema deben contar con credenciales de autenticación básica o
 
 Los Tokens de autenticación son proevidos por el sistema a través del punto de acceso `/api-token-auth/` descrito en esta documentación.
 
+Los puntos de acceso de tipo lista retornan todas las instancias en una sola respuesta. Para recibirlas por páginas se debe añadir el parámetro `page_size`, por ejemplo,
+
+    /api/reports/?year=2017&page_size=500
+
+La respuesta contiene los resultados bajo la llave "results" y el enlace a la página siguiente bajo la llave "next" (nulo en la última página).
+
+Además de JSON, todos los puntos de acceso aceptan y retornan MessagePack, un formato binario más compacto y rápido de procesar para cargas y descargas masivas. Se selecciona con los encabezados `Content-Type: application/msgpack` (cuerpo del pedido) y `Accept: application/msgpack` (respuesta), o con el parámetro `format=msgpack`.
+
+Para descargar tablas completas sin paginar se puede añadir el parámetro `stream=true`; la respuesta se envía por partes a medida que se leen las instancias, por ejemplo,
+
+    /api/reports/?stream=true&fields=epsa,year,month,v1
+
+La respuesta por partes es siempre JSON; con otro formato (por ejemplo `format=msgpack`) la respuesta es `406 Not Acceptable`.
+
+Las respuestas de lista y de detalle de los modelos con fecha de modificación incluyen los encabezados `ETag` y `Last-Modified`. Si el pedido repite alguno de ellos en los encabezados `If-None-Match` o `If-Modified-Since` y los datos no cambiaron, la respuesta es `304 Not Modified` sin contenido. Las respuestas de lista y de detalle se guardan en un caché del servidor que se invalida con cada escritura del modelo; el encabezado `X-Cache` indica si la respuesta provino del caché (`HIT`) o no (`MISS`).
+
+Para sincronizar por diferencias, los puntos de acceso de lista aceptan el parámetro `modified_since` (fecha ISO 8601) y retornan sólo las instancias creadas o modificadas desde esa fecha. Las instancias eliminadas desde esa fecha se obtienen en el punto de acceso `deleted` del mismo modelo, por ejemplo,
+
+    /api/reports/?modified_since=2019-03-01T00:00:00Z
+    /api/reports/deleted/?modified_since=2019-03-01T00:00:00Z
+
+Si la configuración `DB_QUERY_HEADERS` del servidor está activada, cada respuesta incluye los encabezados `X-DB-Queries` y `X-DB-Time` con la cantidad de consultas a la base de datos del pedido y su duración total en milisegundos.
+
+Las fechas de modificación se asignan al escribir, por lo que se recomienda usar como siguiente `modified_since` la fecha del servidor al inicio de la sincronización anterior menos un margen de algunos minutos.
+
+Las eliminaciones se conservan durante un periodo limitado (`SYNC_LOG_RETENTION_DAYS` días en la configuración del servidor). Si `modified_since` es anterior a ese periodo, la respuesta es `410 Gone` con el código `full_resync_required`, y el cliente debe descargar la lista completa.
+
 La especificación del tipo "Swagger":
 
 [https://aaps-data.appspot.com/swagger](https://aaps-data.appspot.com/swagger/) 
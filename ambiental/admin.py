@@ -1,6 +1,7 @@
 from django.contrib import admin
 from leaflet.admin import LeafletGeoAdmin
 from ambiental.models import SARH, TecnicalDataSub, TecnicalDataSup
+from performance.admin import EPSACodeAdminMixin
 
 class TecnicalDataSubInline(admin.StackedInline):
     model = TecnicalDataSub
@@ -11,11 +12,11 @@ class TecnicalDataSupInline(admin.StackedInline):
     extra = 1
 
 @admin.register(SARH)
-class SARHModelAdmin(LeafletGeoAdmin):
+class SARHModelAdmin(EPSACodeAdminMixin, LeafletGeoAdmin):
     view_on_site = False
     list_filter= ('epsa', 'state', 'epsa','municipality','sub_subt')
-    search_fields= ['epsa','user']
-    list_display = ('sarh_id','epsa','user','get_state','municipality','get_sub_subt')
+    search_fields= ['epsa__code','user']
+    list_display = ('sarh_id','get_epsa','user','get_state','municipality','get_sub_subt')
 
     inlines = [TecnicalDataSubInline,TecnicalDataSupInline]
 
@@ -0,0 +1,106 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import djgeojson.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SARH',
+            fields=[
+                ('sarh_id', models.CharField(help_text='Llave primaria (ID) del SARH. Creado en base al número de fuente. No debe contenter más de 32 caracteres. De preferencia en formato "XXXXX-XXXXX-X". Campo obligatorio.', max_length=32, primary_key=True, serialize=False, verbose_name='id del SARH')),
+                ('folder_code', models.CharField(blank=True, help_text='Código de la carpeta del SARH. No debe contener más de 16 caracteres. De preferencia en mayúsculas.', max_length=16, null=True, verbose_name='código de carpeta')),
+                ('epsa', models.CharField(blank=True, help_text='EPSA que provee el servicio SARH.', max_length=64, null=True)),
+                ('user', models.CharField(blank=True, help_text='Usuario del servicio SARH. No debe contener más de 254 caracteres. De preferencia en mayúsculas.', max_length=254, null=True, verbose_name='usuario del sarh')),
+                ('sub_subt', models.CharField(blank=True, choices=[('SUBTERRANEO', 'SUBTERRANEO'), ('SUPERFICIAL', 'SUPERFICIAL')], help_text='Tipo de SARH (Subterráneo/Superficial).', max_length=16, null=True, verbose_name='subterraneo/superficial')),
+                ('reg_renov', models.CharField(blank=True, choices=[('REG', 'REG'), ('RENOV', 'RENOV')], help_text='Regularización o Renovación', max_length=8, null=True, verbose_name='reg./renov.')),
+                ('rar_aaps_nr', models.CharField(blank=True, help_text='Número de registro RAR/AAPS.', max_length=16, null=True, verbose_name='número RAR/AAPS')),
+                ('rar_date', models.DateField(blank=True, help_text='Fecha de la RAR. Debe estar en formato "aaaa-mm-dd".', null=True, verbose_name='fecha de la RAR')),
+                ('notification_date', models.DateField(blank=True, help_text='Fecha de Emisión de la Notificación a la EPSA. Debe estar en formato "aaaa-mm-dd".', null=True, verbose_name='fecha de emisión de notificación a la EPSA.')),
+                ('user_notification_date', models.DateField(blank=True, help_text='Fecha de notificación de la EPSA al usuario. Debe estar en formato "aaaa-mm-dd".', null=True, verbose_name='fecha de notificación de la EPSA al usuario')),
+                ('auth_year', models.IntegerField(blank=True, default=2026, help_text='Año de Autorización. Debe ser un número entero mayor o igual a 1800.', null=True, validators=[django.core.validators.MinValueValidator(1800)], verbose_name='año de autorización')),
+                ('renovation_alert', models.IntegerField(blank=True, default=2026, help_text='Alerta de Renovación.', null=True, verbose_name='alerta de renovación')),
+                ('auth_certificate_state', models.CharField(blank=True, choices=[('VIGENTE', 'VIGENTE'), ('VENCIDO', 'VENCIDO'), ('SELLADO', 'SELLADO')], help_text='Estado del certificado de autorización (VIGENTE,VENCIDO o SELLADO).', max_length=32, null=True, verbose_name='estado del certificado de autorización')),
+                ('state', models.CharField(blank=True, choices=[('LA PAZ', 'LA PAZ'), ('COCHABAMBA', 'COCHABAMBA'), ('POTOSI', 'POTOSI'), ('SANTA CRUZ', 'SANTA CRUZ'), ('CHUQUISACA', 'CHUQUISACA'), ('ORURO', 'ORURO'), ('TARIJA', 'TARIJA'), ('BENI', 'BENI'), ('PANDO', 'PANDO')], help_text='Departamento del SARH.', max_length=32, null=True, verbose_name='departamento')),
+                ('municipality', models.CharField(blank=True, help_text='Municipio del SARH. No debe contener más de 128 caracteres.', max_length=128, null=True, verbose_name='miunicipio')),
+                ('industry_type', models.CharField(blank=True, help_text='Rubro de uso del SARH. No debe contener más de 256 caracteres.', max_length=256, null=True, verbose_name='rubro')),
+                ('use_description', models.CharField(blank=True, help_text='Descripción de uso del SARH. No debe contener más de 512 caracteres.', max_length=512, null=True, verbose_name='descripción de uso')),
+                ('form_extraction_volume', models.FloatField(blank=True, help_text='Volumen de Extracción del Formulario Único (m3/mes).', null=True, verbose_name='Volumen de extracción del formulario único')),
+                ('authorized_streamflow', models.FloatField(blank=True, help_text='Caudal de Extracción Autorizado en RAR. (l/s).', null=True, verbose_name='caudal de extracción autorizado en RAR')),
+                ('anual_volume', models.FloatField(blank=True, help_text='Volumen Explotado Reportado Anualmente. (m3/mes).', null=True, verbose_name='volumen explotado reportado anualmente')),
+                ('sarh_denom', models.CharField(blank=True, help_text='denominación del SARH. (m3/mes). No debe contener más de 512 caracteres.', max_length=512, null=True, verbose_name='denominación del SARH')),
+                ('active_inactive_sealed', models.CharField(blank=True, choices=[('ACTIVO', 'ACTIVO'), ('INACTIVO', 'INACTIVO'), ('SELLADO', 'SELLADO')], help_text='Condición Actual del SARH (ACTIVO, INACTIVO o SELLADO).', max_length=16, null=True, verbose_name='activo/inactivo/sellado')),
+                ('x', models.FloatField(blank=True, help_text='Coordenada x en sistema UTM.', null=True, verbose_name='coordenada x (utm)')),
+                ('y', models.FloatField(blank=True, help_text='Coordenada x en sistema UTM.', null=True, verbose_name='coordenada y (utm)')),
+                ('z', models.FloatField(blank=True, help_text='Coordenada x en sistema UTM.', null=True, verbose_name='coordenada z (utm)')),
+                ('zone', models.CharField(blank=True, help_text='Zona de coordenadas UTM.', max_length=8, null=True, verbose_name='zona de coordenadas (utm)')),
+                ('source_nr', models.CharField(blank=True, help_text='Número de Fuente. No debe contener más de 32 caracteres.', max_length=32, null=True, verbose_name='número de fuente')),
+                ('discharge_place', models.CharField(blank=True, choices=[('S.A.S.', 'S.A.S.'), ('RED DE ALCANTARILLADO', 'RED DE ALCANTARILLADO'), ('CUERPO RECEPTOR', 'CUERPO RECEPTOR'), ('NO DESCARGA', 'NO DESCARGA')], help_text='Lugar de descarga de Aguas Residuales.', max_length=56, null=True, verbose_name='lugar de descarga')),
+                ('ph', models.FloatField(blank=True, help_text='PH.', null=True, verbose_name='ph')),
+                ('conductivity', models.FloatField(blank=True, help_text='Conductividad (µS/cm).', null=True, verbose_name='conductividad')),
+                ('turbidity', models.FloatField(blank=True, help_text='Turbiedad (MTU).', null=True, verbose_name='turbidad')),
+                ('iron', models.FloatField(blank=True, help_text='Hierro', null=True, verbose_name='hierro')),
+                ('manganese', models.FloatField(blank=True, help_text='Manganeso', null=True, verbose_name='manganeso')),
+                ('od', models.FloatField(blank=True, help_text='O.D. (%)', null=True, verbose_name='o.d.')),
+                ('langelie', models.FloatField(blank=True, help_text='Indice de Langelie (ISL).', null=True, verbose_name='indice de Langelie')),
+                ('observations', models.CharField(blank=True, help_text='Observaciones. No debe contener más de 512 caracteres.', max_length=512, null=True, verbose_name='observaciones')),
+                ('lat', models.FloatField(blank=True, help_text='Latitud del SARH.', null=True, verbose_name='latitud')),
+                ('lon', models.FloatField(blank=True, help_text='Longitud del SARH.', null=True, verbose_name='longitud')),
+                ('geom', djgeojson.fields.PointField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Sistema de Autoabastecimiento de Recursos Hídricos (SARH)',
+                'verbose_name_plural': 'Sistemas de Autoabastecimiento de Recursos Hídricos (SARH)',
+                'ordering': ['epsa', 'user'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TecnicalDataSup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detalle', models.CharField(blank=True, help_text='Detalle del medidor. No puede contener más de 256 caracteres.', max_length=256, null=True, verbose_name='detalle')),
+                ('year', models.IntegerField(default=2026, help_text='Gestión de los datos técnicos. Debe ser un número entero mayor o igual a 1800. Campo obligatorio.', validators=[django.core.validators.MinValueValidator(1800)], verbose_name='gestión')),
+                ('tiene_medidor', models.CharField(blank=True, choices=[('SI', 'SI'), ('NO', 'NO')], help_text='El pozo tiene medidor (SI o NO).', max_length=2, null=True, verbose_name='tiene medidor')),
+                ('vol_extraido_promedio', models.FloatField(blank=True, help_text='Volúmen Extraido Promedio (m3/mes)', null=True, verbose_name='volumen extraido promedio')),
+                ('caudal_lluvia', models.FloatField(blank=True, help_text='Caudal época de lluvial Qll (m3/s)', null=True, verbose_name='caudal época de lluvial')),
+                ('caudal_estiaje', models.FloatField(blank=True, help_text='Caudal época de estiaje Qe (m3/s)', null=True, verbose_name='caudal época de estiaje')),
+                ('caudal_medio_anual', models.FloatField(blank=True, help_text='Caudal medio anual Qma (m3/s)', null=True, verbose_name='caudal medio anual')),
+                ('caudal_eco', models.FloatField(blank=True, help_text='Caudal ecológico (m3/s)', null=True, verbose_name='caudal ecológico')),
+                ('sarh', models.ForeignKey(help_text='Datos técnicos superficial.', on_delete=django.db.models.deletion.CASCADE, related_name='tecnical_sup', to='ambiental.SARH', verbose_name='datos técnicos superficial')),
+            ],
+            options={
+                'verbose_name': 'Datos Técnicos Superficiales',
+                'verbose_name_plural': 'Datos Técnicos Superficiales',
+                'ordering': ['sarh', 'year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TecnicalDataSub',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detalle', models.CharField(blank=True, help_text='Detalle del medidor. No puede contener más de 256 caracteres.', max_length=256, null=True, verbose_name='detalle')),
+                ('year', models.IntegerField(default=2026, help_text='Gestión de los datos técnicos. Debe ser un número entero mayor o igual a 1800. Campo obligatorio.', validators=[django.core.validators.MinValueValidator(1800)], verbose_name='gestión')),
+                ('tiene_medidor', models.CharField(blank=True, choices=[('SI', 'SI'), ('NO', 'NO')], help_text='El pozo tiene medidor (SI o NO).', max_length=2, null=True, verbose_name='tiene medidor')),
+                ('vol_extraido_promedio', models.FloatField(blank=True, help_text='Volúmen Extraido Promedio (m3/mes)', null=True, verbose_name='volumen extraido promedio')),
+                ('aforo', models.FloatField(blank=True, help_text='Caudal del SARH (aforo)(l/s)', null=True, verbose_name='caudal del SARH')),
+                ('nivel_estatico', models.FloatField(blank=True, help_text='Nivel estático (m)', null=True, verbose_name='nivel estático')),
+                ('nivel_dinamico', models.FloatField(blank=True, help_text='Nivel dinámico(m)', null=True, verbose_name='nivel dinámico')),
+                ('caudal_optimo', models.FloatField(blank=True, help_text='Caudal óptimo(l/s)', null=True, verbose_name='caudal óptimo')),
+                ('sarh', models.ForeignKey(help_text='Datos técnicos subterráneo.', on_delete=django.db.models.deletion.CASCADE, related_name='tecnical_sub', to='ambiental.SARH', verbose_name='Datos Técnicos Subterráneo')),
+            ],
+            options={
+                'verbose_name': 'Datos Técnicos Superficiales',
+                'verbose_name_plural': 'Datos Técnicos Superficiales',
+                'ordering': ['sarh', 'year'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:13
+
+from django.db import migrations
+import django.db.models.deletion
+import performance.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+        ('ambiental', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='sarh',
+            options={'ordering': ['epsa_id', 'user'], 'verbose_name': 'Sistema de Autoabastecimiento de Recursos Hídricos (SARH)', 'verbose_name_plural': 'Sistemas de Autoabastecimiento de Recursos Hídricos (SARH)'},
+        ),
+        migrations.AlterField(
+            model_name='sarh',
+            name='epsa',
+            field=performance.models.EPSAForeignKey(blank=True, db_column='epsa', db_constraint=False, help_text='EPSA que provee el servicio SARH.', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='sarhs', to='performance.EPSA'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ambiental', '0002_epsa_foreign_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sarh',
+            index=models.Index(fields=['epsa', 'user'], name='ambiental_s_epsa_8dd0d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sarh',
+            index=models.Index(fields=['state'], name='ambiental_s_state_5ab919_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sarh',
+            index=models.Index(fields=['municipality'], name='ambiental_s_municip_893a94_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tecnicaldatasub',
+            index=models.Index(fields=['sarh', 'year'], name='ambiental_t_sarh_id_cd2c3d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tecnicaldatasup',
+            index=models.Index(fields=['sarh', 'year'], name='ambiental_t_sarh_id_c50298_idx'),
+        ),
+    ]
@@ -2,7 +2,8 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from datetime import datetime
 from djgeojson.fields import PointField
-from performance.models import EPSA
+from performance.dimensions import epsa_dimension
+from performance.models import EPSAForeignKey
 
 state_code_to_name = dict(
     LP='La Paz',
@@ -69,8 +70,8 @@ class SARH(models.Model):
         help_text='Código de la carpeta del SARH. No debe contener más de 16 caracteres. De preferencia en mayúsculas.',
         blank=True,null=True,
     )
-    epsa = models.CharField(
-        max_length=64,
+    epsa = EPSAForeignKey(
+        related_name='sarhs',
         help_text='EPSA que provee el servicio SARH.',
         blank=True, null=True,
     )
@@ -278,16 +279,19 @@ class SARH(models.Model):
     class Meta:
         verbose_name = 'Sistema de Autoabastecimiento de Recursos Hídricos (SARH)'
         verbose_name_plural = 'Sistemas de Autoabastecimiento de Recursos Hídricos (SARH)'
-        ordering = ['epsa','user',]
+        ordering = ['epsa_id','user',]
+        indexes = [
+            models.Index(fields=['epsa', 'user']),
+            models.Index(fields=['state']),
+            models.Index(fields=['municipality']),
+        ]
 
     def __str__(self):
-        return f'{self.epsa} - {self.user}'
+        return f'{self.epsa_id} - {self.user}'
     def get_state(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            state_code = str(rel_epsa[0].state)
-            if state_code in state_code_to_name.keys():
-                return state_code_to_name[state_code]
+        info = epsa_dimension.get(self.epsa_id)
+        if info and str(info.state) in state_code_to_name.keys():
+            return state_code_to_name[str(info.state)]
         return ''
     get_state.short_description = 'Departamento'
     def get_sub_subt(self):
@@ -357,6 +361,7 @@ class TecnicalDataSub(models.Model):
         verbose_name = 'Datos Técnicos Superficiales'
         verbose_name_plural = 'Datos Técnicos Superficiales'
         ordering = ['sarh','year',]
+        indexes = [models.Index(fields=['sarh', 'year'])]
     def __str__(self):
         return f'{self.sarh} - {self.year}'
 
@@ -421,5 +426,6 @@ class TecnicalDataSup(models.Model):
         verbose_name = 'Datos Técnicos Superficiales'
         verbose_name_plural = 'Datos Técnicos Superficiales'
         ordering = ['sarh','year',]
+        indexes = [models.Index(fields=['sarh', 'year'])]
     def __str__(self):
         return f'{self.sarh} - {self.year}'
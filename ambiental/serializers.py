@@ -1,8 +1,12 @@
 from rest_framework import serializers
 from ambiental import models
 from performance.models import EPSA
+from performance.serializers import EPSACodeField, instance_kwargs, unknown_epsa_mode, check_epsa_codes, create_epsas
+from performance.signals import post_bulk_write
 from drf_queryfields import QueryFieldsMixin
 from collections import OrderedDict
+from django.db import transaction
+from rest_framework.fields import SkipField
 from rest_framework.relations import PKOnlyObject
 
 class TecnicalDataSubSerializer(QueryFieldsMixin, serializers.ModelSerializer):
@@ -22,9 +26,18 @@ class SARHListSerializer(serializers.ListSerializer):
             self._errors = {}
         return True
 
+    @transaction.atomic
     def create(self, validated_data):
         ret = []
-        for data_dict in validated_data:
+        updated = []
+        mode = unknown_epsa_mode(self.context.get('request'))
+        unknown, flagged = check_epsa_codes(validated_data, mode)
+        if mode == 'create':
+            create_epsas(unknown)
+        for index, data_dict in enumerate(validated_data):
+            if mode == 'reject' and index in flagged:
+                ret.append({'ignorado': flagged[index]})
+                continue
             sarh_id = data_dict.get('sarh_id')
             sub_list = data_dict.pop('tecnical_sub', None)
             sup_list = data_dict.pop('tecnical_sup', None)
@@ -37,8 +50,9 @@ class SARHListSerializer(serializers.ListSerializer):
                 sarh = qs[0]
                 qs.update(**data_dict)
                 ret_key = 'actualizado'
+                updated.append(data_dict)
             else:
-                sarh = models.SARH.objects.create(**data_dict)
+                sarh = models.SARH.objects.create(**instance_kwargs(models.SARH, data_dict))
                 ret_key = 'creado'
             if sub_list:
                 models.TecnicalDataSub.objects.filter(sarh=sarh).delete()
@@ -53,11 +67,15 @@ class SARHListSerializer(serializers.ListSerializer):
                         del sup_data['sarh']
                     models.TecnicalDataSup.objects.create(sarh=sarh,**sup_data)
             ret.append({ret_key: data_dict})
+            if index in flagged:
+                ret[-1]['advertencias'] = flagged[index]
+        post_bulk_write.send(sender=models.SARH, created=[], updated=updated)
         return ret
 
 
 class SARHSerializer(QueryFieldsMixin, serializers.ModelSerializer):
-    epsa = serializers.CharField(allow_blank=True,required=False)
+    skip_empty_fields = True
+    epsa = EPSACodeField(allow_blank=True,required=False)
     tecnical_sub = TecnicalDataSubSerializer(required=False,many=True)
     tecnical_sup = TecnicalDataSupSerializer(required=False,many=True)
 
@@ -67,12 +85,12 @@ class SARHSerializer(QueryFieldsMixin, serializers.ModelSerializer):
         list_serializer_class = SARHListSerializer
 
     def create(self, validated_data):
-        epsa_code = validated_data.pop('epsa',None)
+        epsa = validated_data.pop('epsa',None)
         sub_list = validated_data.pop('tecnical_sub', None)
         sup_list = validated_data.pop('tecnical_sup', None)
 
-        if epsa_code:
-            epsa_tuple = EPSA.objects.get_or_create(code=epsa_code)
+        if epsa and epsa.code:
+            epsa_tuple = EPSA.objects.get_or_create(code=epsa.code)
             sarh = models.SARH.objects.create(epsa=epsa_tuple[0], **validated_data)
         else:
             sarh = models.SARH.objects.create(**validated_data)
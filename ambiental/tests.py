@@ -1,3 +1,47 @@
 from django.test import TestCase
+from aapsapi.testing import QueryPlanMixin, UnknownEPSAMixin
+from ambiental import views
+from ambiental.models import SARH, TecnicalDataSub, TecnicalDataSup
 
-# Create your tests here.
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    '''
+    Verifica que las consultas del punto de acceso de SARH, de sus filtros en el admin y de las cargas masivas usan índices.
+    '''
+    view_filters = [(views.SARHViewSet, {'epsa': 'EPSA1'})]
+
+    @classmethod
+    def setUpTestData(cls):
+        states = [code for code, name in SARH.STATE_CHOICES]
+        SARH.objects.bulk_create([
+            SARH(sarh_id=f'SARH{i}', epsa_id=f'EPSA{i % 40}', user=f'Usuario {i}', state=states[i % len(states)], municipality=f'Municipio {i % 60}')
+            for i in range(600)
+        ])
+        TecnicalDataSub.objects.bulk_create([TecnicalDataSub(sarh_id=f'SARH{i}') for i in range(600)])
+        TecnicalDataSup.objects.bulk_create([TecnicalDataSup(sarh_id=f'SARH{i}') for i in range(600)])
+        cls.analyze()
+
+    def test_sarh_filters(self):
+        self.assertUsesIndex(SARH.objects.filter(sarh_id='SARH1'))
+        self.assertUsesIndex(SARH.objects.filter(state='ORURO'))
+        self.assertUsesIndex(SARH.objects.filter(municipality='Municipio 1'))
+
+    def test_tecnical_data(self):
+        for model in [TecnicalDataSub, TecnicalDataSup]:
+            self.assertUsesIndex(model.objects.filter(sarh__in=['SARH1', 'SARH2']))
+
+
+class UnknownEPSATests(UnknownEPSAMixin, TestCase):
+    '''
+    Verifica el tratamiento de las siglas de EPSAs no registradas (`unknown_epsa`) en la carga masiva de SARH.
+    '''
+    url = '/api/sarhs/'
+    model = SARH
+    data = (
+        {'sarh_id': 'SARH1', 'epsa': 'AAPOS', 'tecnical_sub': [{'year': 2017}]},
+        {'sarh_id': 'SARH2', 'epsa': 'NUEVA'},
+    )
+
+    def test_reject(self):
+        super().test_reject()
+        self.assertEqual(TecnicalDataSub.objects.get().sarh_id, 'SARH1')
@@ -1,9 +1,10 @@
 from rest_framework import viewsets
+from aapsapi.mixins import FastListMixin, FieldsProjectionMixin, ResponseCacheMixin, StreamingListMixin
 from ambiental import models, serializers
 from rest_framework.response import Response
 from rest_framework import status
 
-class CustomViewSet(viewsets.ModelViewSet):
+class CustomViewSet(ResponseCacheMixin, StreamingListMixin, FastListMixin, FieldsProjectionMixin, viewsets.ModelViewSet):
     def get_serializer(self, *args, **kwargs):
         if isinstance(kwargs.get('data', {}), list):
             kwargs['many'] = True
@@ -18,8 +19,10 @@ class CustomViewSet(viewsets.ModelViewSet):
 
 class SARHViewSet(CustomViewSet):
     serializer_class = serializers.SARHSerializer
-    queryset = models.SARH.objects.all()
+    queryset = models.SARH.objects.prefetch_related('tecnical_sub', 'tecnical_sup')
     filterset_fields = ('epsa',)
+    cursor_ordering = ('sarh_id',)
+    cache_models = (models.TecnicalDataSub, models.TecnicalDataSup,)
 
 # import json
 # from django.core import serializers
@@ -1,6 +1,70 @@
 from django.contrib import admin
+from django.db.models import OuterRef, Subquery
 from performance import models
 
+
+class EPSACategoryFilter(admin.SimpleListFilter):
+    title = 'categoría'
+    parameter_name = 'epsa_category'
+
+    def lookups(self, request, model_admin):
+        return models.EPSA.CATEGORY_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(epsa_category=self.value())
+        return queryset
+
+class EPSAStateFilter(admin.SimpleListFilter):
+    title = 'departamento'
+    parameter_name = 'epsa_state'
+
+    def lookups(self, request, model_admin):
+        return models.EPSA.STATE_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(epsa_state=self.value())
+        return queryset
+
+class EPSACodeAdminMixin:
+    '''
+    Columna `get_epsa` con la sigla de la EPSA, leída de la columna `epsa` sin consultar `EPSA` por cada fila. En el
+    formulario la EPSA se escribe como sigla (`EPSACodeFormField`), sin listar todas las EPSAs ni exigir que esté registrada.
+    '''
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        if isinstance(db_field, models.EPSAForeignKey):
+            return db_field.formfield(**kwargs)
+        return super().formfield_for_dbfield(db_field, request=request, **kwargs)
+
+    def get_epsa(self, obj):
+        return obj.epsa_id
+    get_epsa.short_description = 'EPSA'
+    get_epsa.admin_order_field = 'epsa_id'
+
+class EPSAAnnotatedAdminMixin(EPSACodeAdminMixin):
+    '''
+    Anota en la consulta del admin la categoría y el departamento de la EPSA de cada instancia (subconsultas sobre `EPSA`),
+    para mostrarlos, ordenarlos y filtrarlos sin consultas adicionales por fila.
+    '''
+    def get_queryset(self, request):
+        epsa = models.EPSA.objects.filter(code=OuterRef('epsa'))
+        return super().get_queryset(request).annotate(
+            epsa_category=Subquery(epsa.values('category')[:1]),
+            epsa_state=Subquery(epsa.values('state')[:1]),
+        )
+
+    def get_category(self, obj):
+        return obj.epsa_category if obj.epsa_category in ['A','B','C','D'] else ''
+    get_category.short_description = 'categoría'
+    get_category.admin_order_field = 'epsa_category'
+
+    def get_state(self, obj):
+        return models.state_code_to_name.get(obj.epsa_state, '')
+    get_state.short_description = 'departamento'
+    get_state.admin_order_field = 'epsa_state'
+
+
 @admin.register(models.EPSA)
 class EPSAModelAdmin(admin.ModelAdmin):
     view_on_site = False
@@ -39,11 +103,11 @@ class IndicatorModelAdmin(admin.ModelAdmin):
         return super(IndicatorModelAdmin, self).changelist_view(request, extra_context=extra_context)
 
 @admin.register(models.VariableReport)
-class VariableReportModelAdmin(admin.ModelAdmin):
+class VariableReportModelAdmin(EPSAAnnotatedAdminMixin, admin.ModelAdmin):
     view_on_site = False
-    list_filter = ('year', 'epsa')
-    search_fields = ['epsa', 'year', 'month']
-    list_display = ('epsa', 'year', 'month', 'get_category', 'get_state',)
+    list_filter = ('year', EPSACategoryFilter, EPSAStateFilter, 'epsa')
+    search_fields = ['epsa__code', 'year', 'month']
+    list_display = ('get_epsa', 'year', 'month', 'get_category', 'get_state',)
     fields_list = [('epsa', 'year'), ]
     for i in range(51):
         fields_list.append((f'v{i+1}', f'v{i+1}_type'))
@@ -53,11 +117,11 @@ class VariableReportModelAdmin(admin.ModelAdmin):
         return super(VariableReportModelAdmin, self).changelist_view(request, extra_context=extra_context)
 
 @admin.register(models.IndicatorMeasurement)
-class IndicatorMeasurementModelAdmin(admin.ModelAdmin):
+class IndicatorMeasurementModelAdmin(EPSAAnnotatedAdminMixin, admin.ModelAdmin):
     view_on_site = False
-    list_filter = ('year', 'month', 'epsa')
-    search_fields = ['epsa', 'year',]
-    list_display = ('epsa', 'year', 'month', 'get_category', 'get_state',)
+    list_filter = ('year', 'month', EPSACategoryFilter, EPSAStateFilter, 'epsa')
+    search_fields = ['epsa__code', 'year',]
+    list_display = ('get_epsa', 'year', 'month', 'get_category', 'get_state',)
     def changelist_view(self, request, extra_context=None):
         extra_context = {'title': 'AAPS - Seguimiento Regulatorio: Medidas de Indicadores'}
         return super(IndicatorMeasurementModelAdmin, self).changelist_view(request, extra_context=extra_context)
@@ -1,6 +1,23 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_save, post_delete
 
 
 class PerformanceConfig(AppConfig):
     name = 'performance'
     verbose_name = 'Seguimiento Regulatorio'
+
+    def ready(self):
+        from aapsapi import cache as response_cache
+        from performance import compliance, signals
+        from performance.models import BaseModel
+        for model in apps.get_models():
+            if not issubclass(model, BaseModel):
+                continue
+            if model.sync_parent:
+                post_save.connect(signals.touch_sync_parent, sender=model)
+                post_delete.connect(signals.touch_sync_parent, sender=model)
+            else:
+                post_delete.connect(signals.record_tombstone, sender=model)
+        for model in response_cache.cached_models() | set(compliance.DEPENDENCIES):
+            for signal in (post_save, post_delete, signals.post_bulk_write):
+                signal.connect(signals.bump_response_cache, sender=model)
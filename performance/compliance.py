@@ -0,0 +1,74 @@
+'''
+Matriz de cumplimiento regulatorio: compara cada medida de indicadores con los parámetros `par_min_{A..D}`/`par_max_{A..D}`
+del indicador correspondientes a la categoría de la EPSA.
+
+El resultado se guarda por año en el caché de respuestas (`aapsapi.cache`), con una llave que incluye las versiones de
+`IndicatorMeasurement`, `Indicator` y `EPSA`: cualquier escritura en esos modelos, confirmada en cualquier proceso, deja
+inaccesibles las matrices calculadas antes. Si el caché no es compartido entre procesos, la matriz se calcula en cada pedido.
+'''
+import numpy as np
+from aapsapi import cache as response_cache
+from performance.models import EPSA, Indicator, IndicatorMeasurement
+
+INDICATOR_COUNT = 32
+CATEGORIES = ['A', 'B', 'C', 'D']
+DEPENDENCIES = (IndicatorMeasurement, Indicator, EPSA)
+
+def _cache_key(year):
+    versions = ':'.join(str(version) for version in response_cache.versions(DEPENDENCIES))
+    return f'compliance:{versions}:{year}'
+
+def load_thresholds():
+    '''
+    Retorna dos matrices de tamaño (4 categorías x 32 indicadores) con los parámetros mínimos y máximos (`nan` si no están definidos).
+    '''
+    mins = np.full((len(CATEGORIES), INDICATOR_COUNT), np.nan)
+    maxs = np.full((len(CATEGORIES), INDICATOR_COUNT), np.nan)
+    fields = [f'par_min_{cat}' for cat in CATEGORIES] + [f'par_max_{cat}' for cat in CATEGORIES]
+    for ind_id, *params in Indicator.objects.filter(ind_id__gte=1, ind_id__lte=INDICATOR_COUNT).values_list('ind_id', *fields):
+        params = np.array(params, dtype=float)
+        mins[:, ind_id - 1] = params[:len(CATEGORIES)]
+        maxs[:, ind_id - 1] = params[len(CATEGORIES):]
+    return mins, maxs
+
+def compute_compliance(year):
+    '''
+    Calcula la matriz de cumplimiento (EPSA x indicador x periodo) de las medidas de indicadores del año dado.
+    Cada indicador es `true` si cumple con los parámetros de la categoría de la EPSA, `false` si no cumple y nulo si no hay medida, categoría o parámetros.
+    '''
+    ind_fields = [f'ind{i+1}' for i in range(INDICATOR_COUNT)]
+    rows = list(IndicatorMeasurement.objects.filter(year=year).values_list('epsa', 'month', *ind_fields))
+    categories = dict(EPSA.objects.values_list('code', 'category'))
+
+    values = np.array([row[2:] for row in rows], dtype=float).reshape(len(rows), INDICATOR_COUNT)
+    row_categories = [categories.get(row[0]) for row in rows]
+    cat_index = np.array([CATEGORIES.index(cat) if cat in CATEGORIES else -1 for cat in row_categories], dtype=int)
+
+    mins, maxs = load_thresholds()
+    lo = mins[cat_index]
+    hi = maxs[cat_index]
+    with np.errstate(invalid='ignore'):
+        compliant = (np.isnan(lo) | (values >= lo)) & (np.isnan(hi) | (values <= hi))
+    unknown = np.isnan(values) | (np.isnan(lo) & np.isnan(hi)) | (cat_index == -1)[:, None]
+
+    matrix = []
+    for i, row in enumerate(rows):
+        item = {'epsa': row[0], 'category': row_categories[i], 'year': year, 'month': row[1]}
+        for j, field in enumerate(ind_fields):
+            item[field] = None if unknown[i, j] else bool(compliant[i, j])
+        matrix.append(item)
+    return matrix
+
+def compliance_matrix(year):
+    '''
+    Retorna la matriz de cumplimiento del año dado desde el caché, calculándola si es necesario.
+    '''
+    if not response_cache.is_shared():
+        return compute_compliance(year)
+    cache = response_cache.get_cache()
+    key = _cache_key(year)
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = compute_compliance(year)
+        cache.set(key, matrix, response_cache.timeout())
+    return matrix
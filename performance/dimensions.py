@@ -0,0 +1,60 @@
+'''
+Dimensión EPSA: código -> (departamento, categoría, nombre), cargada en memoria con una sola consulta y compartida por los
+modelos que muestran el departamento o la categoría de su EPSA.
+
+Como máximo una vez cada `check_interval` segundos se consulta la marca de la tabla `EPSA` (fecha de modificación máxima y
+cantidad de filas, leídas del índice de `modified`), y la dimensión se recarga si cambió. La marca se lee de la base de datos,
+por lo que cada proceso del servidor ve las escrituras de los demás. Las escrituras en el mismo proceso la invalidan inmediatamente.
+'''
+import threading
+import time
+from collections import namedtuple
+from django.db.models import Count, Max
+
+EPSAInfo = namedtuple('EPSAInfo', ['state', 'category', 'name'])
+
+
+class EPSADimension:
+    check_interval = 5
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = None
+        self.watermark = None
+        self.checked = 0
+
+    def invalidate(self):
+        self.rows = None
+
+    def load(self):
+        from performance.models import EPSA
+        with self.lock:
+            watermark = EPSA.objects.order_by().aggregate(modified=Max('modified'), count=Count('pk'))
+            if self.rows is None or watermark != self.watermark:
+                self.rows = {
+                    code: EPSAInfo(state, category, name)
+                    for code, state, category, name in EPSA.objects.values_list('code', 'state', 'category', 'name')
+                }
+                self.watermark = watermark
+            self.checked = time.monotonic()
+            return self.rows
+
+    def get(self, code):
+        '''
+        Retorna el `EPSAInfo` de la EPSA con el código dado, o `None` si no existe.
+        '''
+        rows = self.rows
+        if rows is None or time.monotonic() - self.checked > self.check_interval:
+            rows = self.load()
+        return rows.get(code)
+
+    def codes(self, state):
+        '''
+        Retorna la lista ordenada de códigos de las EPSAs del departamento dado.
+        '''
+        rows = self.rows
+        if rows is None or time.monotonic() - self.checked > self.check_interval:
+            rows = self.load()
+        return sorted(code for code, info in rows.items() if info.state == state)
+
+epsa_dimension = EPSADimension()
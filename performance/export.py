@@ -0,0 +1,129 @@
+'''
+Exportación de reportes de variables y medidas de indicadores como archivos planos (CSV y Parquet).
+
+Las filas se leen de la base de datos con `values_list().iterator()` y se escriben por lotes, por lo que la memoria
+usada depende del tamaño del lote y no de la cantidad de filas exportadas.
+'''
+import csv
+import io
+from itertools import islice
+from rest_framework.renderers import BaseRenderer
+
+BATCH_SIZE = 5000
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def export_columns(model, names=None, exclude=()):
+    '''
+    Retorna los campos concretos de `model` a exportar, en el orden del modelo: los de `names` si se dan, o todos,
+    sin los de `exclude`.
+    '''
+    fields = [field for field in model._meta.concrete_fields if field.name not in exclude]
+    if names:
+        fields = [field for field in fields if field.name in names or field.attname in names]
+    return fields
+
+def iter_csv(queryset, fields, batch_size=BATCH_SIZE):
+    '''
+    Genera el contenido CSV (con encabezado) de las columnas `fields` de `queryset`, un lote de filas a la vez.
+    Los valores nulos se escriben como celdas vacías.
+    '''
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([field.name for field in fields])
+    rows = queryset.values_list(*[field.attname for field in fields]).iterator(chunk_size=batch_size)
+    for batch in _batches(rows, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _StreamSink(io.RawIOBase):
+    '''
+    Archivo de sólo escritura que acumula lo escrito hasta que es retirado con `drain()`, manteniendo la posición total
+    (Parquet registra en el pie del archivo la posición de cada grupo de filas).
+    '''
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def _arrow_type(field):
+    import pyarrow as pa
+    return {
+        'FloatField': pa.float64(),
+        'IntegerField': pa.int64(),
+        'AutoField': pa.int64(),
+        'BooleanField': pa.bool_(),
+        'DateField': pa.date32(),
+        'DateTimeField': pa.timestamp('us', tz='UTC'),
+    }.get(field.get_internal_type(), pa.string())
+
+def iter_parquet(queryset, fields, batch_size=BATCH_SIZE):
+    '''
+    Genera el contenido Parquet de las columnas `fields` de `queryset`, escribiendo un grupo de filas por lote.
+    Requiere la librería `pyarrow`.
+    '''
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.schema([pa.field(field.name, _arrow_type(field)) for field in fields])
+    sink = _StreamSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    rows = queryset.values_list(*[field.attname for field in fields]).iterator(chunk_size=batch_size)
+    for batch in _batches(rows, batch_size):
+        columns = [pa.array(column, type=schema.field(i).type) for i, column in enumerate(zip(*batch))]
+        writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+class CSVRenderer(BaseRenderer):
+    '''
+    Permite seleccionar la exportación en CSV con el sufijo `.csv` o `?format=csv`. El contenido es generado por la vista.
+    '''
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+class ParquetRenderer(BaseRenderer):
+    '''
+    Permite seleccionar la exportación en Parquet con el sufijo `.parquet` o `?format=parquet`. El contenido es generado por la vista.
+    '''
+    media_type = 'application/vnd.apache.parquet'
+    format = 'parquet'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+EXPORTERS = {'csv': iter_csv, 'parquet': iter_parquet}
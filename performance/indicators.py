@@ -0,0 +1,177 @@
+'''
+Cálculo vectorizado de los 32 indicadores de `IndicatorMeasurement` en base a los reportes de variables (`VariableReport`).
+
+Cada fórmula declara las variables que utiliza y se evalúa sobre columnas de NumPy, de manera que todos los reportes
+seleccionados se calculan con operaciones de arreglos en lugar de fila por fila.
+Los valores reportados como NC (No Corresponde) o NR (No Reportó) se consideran faltantes y los indicadores que dependen de ellos quedan en blanco.
+'''
+from collections import namedtuple, defaultdict
+import numpy as np
+from django.utils import timezone
+from performance.models import VariableReport, IndicatorMeasurement, VariableReportChange
+from performance.serializers import bulk_create_or_update, _chunks, _existing_pks
+from performance.snapshot import snapshot
+
+INDICATOR_COUNT = 32
+KEY_FIELDS = ['epsa', 'year', 'month']
+
+Formula = namedtuple('Formula', ['variables', 'compute'])
+
+def _add(*arrays):
+    '''
+    Suma que ignora los valores faltantes, excepto cuando todos los sumandos faltan.
+    '''
+    stacked = np.vstack(arrays)
+    return np.where(np.isnan(stacked).all(axis=0), np.nan, np.nansum(stacked, axis=0))
+
+FORMULAS = {
+    1: Formula((1, 2, 7, 26), lambda v1, v2, v7, v26: _add(v1, v2) / (v7 * v26) * 100),
+    2: Formula((1, 2, 3), lambda v1, v2, v3: v3 / _add(v1, v2) * 100),
+    3: Formula((11, 12), lambda v11, v12: v11 / v12 * 100),
+    4: Formula((13, 14), lambda v13, v14: v13 / v14 * 100),
+    5: Formula((5, 23, 26), lambda v5, v23, v26: v5 * 1000 / (v23 * v26 / 24)),
+    6: Formula((17, 25, 26, 27), lambda v17, v25, v26, v27: (v25 - v27 / v17) * 24 / v26),
+    7: Formula((17, 26, 28), lambda v17, v26, v28: (1 - v28 / (v17 * v26)) * 100),
+    8: Formula((22, 23), lambda v22, v23: v23 / v22 * 100),
+    9: Formula((22, 24), lambda v22, v24: v24 / v22 * 100),
+    10: Formula((17, 19), lambda v17, v19: v19 / v17 * 100),
+    11: Formula((2, 8, 26), lambda v2, v8, v26: v2 / (v8 * v26) * 100),
+    12: Formula((5, 6), lambda v5, v6: v6 / v5 * 100),
+    13: Formula((15, 16), lambda v15, v16: v15 / v16 * 100),
+    14: Formula((4, 9, 26), lambda v4, v9, v26: v4 / (v9 * v26) * 100),
+    15: Formula((6, 10, 26), lambda v6, v10, v26: v6 / (v10 * v26) * 100),
+    16: Formula((44, 45), lambda v44, v45: v44 / v45 * 100),
+    17: Formula((1, 2, 3), lambda v1, v2, v3: (_add(v1, v2) - v3) / _add(v1, v2) * 100),
+    18: Formula((3, 5), lambda v3, v5: (v3 - v5) / v3 * 100),
+    19: Formula((46, 48), lambda v46, v48: v46 / v48 * 100),
+    20: Formula((17, 47), lambda v17, v47: v47 / v17 * 1000),
+    21: Formula((49, 51), lambda v49, v51: v49 / v51 * 100),
+    22: Formula((18, 50), lambda v18, v50: v50 / v18 * 1000),
+    23: Formula((34, 37), lambda v34, v37: v37 / v34 * 100),
+    24: Formula((29, 32), lambda v29, v32: v29 / v32),
+    25: Formula((30, 35), lambda v30, v35: (v35 - v30) / v35 * 100),
+    26: Formula((31, 32, 33), lambda v31, v32, v33: _add(v32, v33) / v31 * 100),
+    27: Formula((35, 36), lambda v35, v36: v35 / v36 * 100),
+    28: Formula((35, 36), lambda v35, v36: v36 / v35 * 100),
+    29: Formula((38, 39), lambda v38, v39: v38 / v39 * 100),
+    30: Formula((40, 41), lambda v40, v41: v40 / v41 * 100),
+    31: Formula((17, 41), lambda v17, v41: v41 / v17 * 1000),
+    32: Formula((42, 43), lambda v42, v43: v42 / v43 * 100),
+}
+
+INDICATORS_BY_VARIABLE = defaultdict(set)
+for ind_id, formula in FORMULAS.items():
+    for v in formula.variables:
+        INDICATORS_BY_VARIABLE[v].add(ind_id)
+
+def load_reports(epsas=None, years=None):
+    '''
+    Retorna las llaves (epsa, año, mes) de los reportes de variables seleccionados y una matriz de valores de tamaño (reportes x 51)
+    donde los valores NC/NR son `nan`. Los datos se leen de la copia columnar en memoria, actualizada antes de la lectura.
+    '''
+    snapshot.refresh()
+    return snapshot.select(epsas, years)
+
+def compute_matrix(values, indicators=None):
+    '''
+    Calcula los indicadores pedidos (todos por defecto) sobre la matriz de valores. Retorna un diccionario {número de indicador: arreglo}.
+    '''
+    ret = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for ind_id in indicators or FORMULAS:
+            formula = FORMULAS[ind_id]
+            result = np.asarray(formula.compute(*[values[:, v - 1] for v in formula.variables]), dtype=float)
+            result[~np.isfinite(result)] = np.nan
+            ret[ind_id] = result
+    return ret
+
+def measurements_from_matrix(keys, results, indicators_per_row=None):
+    '''
+    Convierte los indicadores calculados en objetos listos para `bulk_create_or_update` (los valores `nan` se guardan como nulos).
+    Si se da `indicators_per_row`, cada objeto incluye sólo los indicadores indicados para su fila.
+    '''
+    columns = {ind_id: result.tolist() for ind_id, result in results.items()}
+    data = []
+    for i, key in enumerate(keys):
+        props = dict(zip(KEY_FIELDS, key))
+        row_indicators = columns if indicators_per_row is None else indicators_per_row[i]
+        for ind_id in row_indicators:
+            value = columns[ind_id][i]
+            props[f'ind{ind_id}'] = None if value != value else value
+        data.append(props)
+    return data
+
+def _save(data):
+    counts = {'creado': 0, 'actualizado': 0, 'ignorado': 0}
+    for item in bulk_create_or_update(IndicatorMeasurement, data, KEY_FIELDS):
+        counts[next(iter(item))] += 1
+    return counts
+
+def compute_indicators(epsas=None, years=None):
+    '''
+    Calcula y guarda las medidas de indicadores de los reportes de variables de las EPSA y años dados (todos por defecto).
+    Retorna la cantidad de medidas creadas, actualizadas e ignoradas.
+    '''
+    start = timezone.now()
+    keys, values = load_reports(epsas, years)
+    counts = _save(measurements_from_matrix(keys, compute_matrix(values)))
+    changes = VariableReportChange.objects.filter(created__lte=start)
+    if epsas is not None:
+        changes = changes.filter(epsa__in=epsas)
+    if years is not None:
+        changes = changes.filter(year__in=years)
+    changes.delete()
+    return counts
+
+def pending_changes(epsas=None, years=None):
+    '''
+    Lee los cambios pendientes de `VariableReportChange` de las EPSA y años dados (todos por defecto). Retorna un diccionario
+    {llave: números de variables modificadas} y la lista de identificadores de los cambios leídos.
+
+    Los cambios registrados después de la lectura (por ejemplo, reportes editados mientras se calculan los indicadores)
+    quedan en el registro para el siguiente cálculo, ya que sólo se eliminan los cambios leídos.
+    '''
+    changed = defaultdict(set)
+    processed = []
+    changes = VariableReportChange.objects.order_by('id')
+    if epsas is not None:
+        changes = changes.filter(epsa__in=epsas)
+    if years is not None:
+        changes = changes.filter(year__in=years)
+    for change_id, epsa, year, month, variables in changes.values_list('id', *KEY_FIELDS, 'variables'):
+        changed[(epsa, year, month)].update(variables.split(','))
+        processed.append(change_id)
+    return changed, processed
+
+def compute_indicators_incremental(epsas=None, years=None):
+    '''
+    Recalcula sólo las medidas de indicadores de los reportes de variables con cambios pendientes en `VariableReportChange`
+    de las EPSA y años dados (todos por defecto), de manera que el costo depende de la cantidad de cambios y no del tamaño
+    de las tablas. Los cambios de otras EPSA y años quedan pendientes.
+    De cada medida se recalculan únicamente los indicadores que dependen de las variables modificadas;
+    si las variables modificadas no se conocen, o la medida aún no existe, se calculan todos los indicadores.
+    Retorna la cantidad de medidas creadas, actualizadas e ignoradas.
+    '''
+    changed, processed = pending_changes(epsas, years)
+    if not changed:
+        return {'creado': 0, 'actualizado': 0, 'ignorado': 0}
+    measured = _existing_pks(IndicatorMeasurement, KEY_FIELDS, changed.keys(), 500)
+    epsas = {key[0] for key in changed}
+    years = {key[1] for key in changed}
+
+    keys, values = load_reports(epsas, years)
+    rows = [i for i, key in enumerate(keys) if key in changed]
+    keys = [keys[i] for i in rows]
+    indicators_per_row = []
+    for key in keys:
+        variables = changed[key]
+        if key not in measured or '*' in variables:
+            indicators_per_row.append(set(FORMULAS))
+        else:
+            indicators_per_row.append(set().union(*[INDICATORS_BY_VARIABLE[int(v)] for v in variables if v]))
+    needed = set().union(*indicators_per_row)
+    results = compute_matrix(values[rows], sorted(needed))
+    counts = _save(measurements_from_matrix(keys, results, indicators_per_row))
+    for chunk in _chunks(processed, 500):
+        VariableReportChange.objects.filter(id__in=chunk).delete()
+    return counts
@@ -0,0 +1,110 @@
+import csv
+import json
+from itertools import islice
+from django.core.exceptions import ValidationError
+from performance.serializers import bulk_create_or_update
+
+
+def iter_lines(stream, encoding='utf-8-sig'):
+    '''
+    Lee el flujo del pedido línea por línea, sin cargar el cuerpo completo en memoria. Con la codificación por defecto se
+    descarta la marca de orden de bytes (BOM) que Excel agrega al inicio de los archivos CSV en UTF-8.
+    '''
+    if stream is None:
+        return
+    for line in stream:
+        yield line.decode(encoding)
+
+def iter_ndjson(lines):
+    '''
+    Interpreta líneas NDJSON (un objeto JSON por línea). Retorna tuplas (línea, objeto, error).
+    '''
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            props = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'JSON inválido: {e}'
+            continue
+        if not isinstance(props, dict):
+            yield number, None, 'Cada línea debe contener un objeto JSON.'
+            continue
+        yield number, props, None
+
+def iter_csv(lines):
+    '''
+    Interpreta líneas CSV con encabezado. Las celdas vacías son tomadas como valores nulos. Retorna tuplas (línea, objeto, error).
+    '''
+    reader = csv.DictReader(lines)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, None, 'La fila tiene más columnas que el encabezado.'
+            continue
+        yield reader.line_num, {k: (v if v != '' else None) for k, v in row.items()}, None
+
+def clean_record(model, props):
+    '''
+    Convierte y valida los valores de `props` con los campos de `model` (tipo, valores nulos, opciones y validadores).
+    Los campos que no existen en el modelo se mantienen para que `bulk_create_or_update` los reporte. La llave primaria
+    (`id` o `pk`, por ejemplo de un archivo exportado) se descarta: los objetos se identifican por sus campos únicos.
+    Retorna una tupla (objeto, error), donde el error describe los valores inválidos.
+    '''
+    pk = model._meta.pk
+    fields = {}
+    for field in model._meta.concrete_fields:
+        fields[field.name] = fields[field.attname] = field
+    cleaned = {}
+    invalid = []
+    for name, value in props.items():
+        if name in ('pk', pk.name, pk.attname):
+            continue
+        field = fields.get(name)
+        if field is None:
+            cleaned[name] = value
+            continue
+        try:
+            cleaned[name] = field.clean(value, None)
+        except ValidationError as e:
+            invalid.append(f'{name}: {" ".join(e.messages)}')
+    if invalid:
+        return None, {'valor_invalido': ' '.join(invalid)}
+    return cleaned, None
+
+def ingest(model, records, unique_together, chunk_size=1000, unknown_epsa=None):
+    '''
+    Valida cada objeto de `records` con `clean_record` y los guarda en bloques de `chunk_size` objetos, confirmando cada bloque por separado.
+    Retorna un resumen por bloque con las cantidades de objetos creados, actualizados e ignorados, los errores encontrados
+    y las advertencias de los objetos guardados (por ejemplo, siglas de EPSA no registradas, según `unknown_epsa`).
+    '''
+    records = iter(records)
+    summary = []
+    for number, chunk in enumerate(iter(lambda: list(islice(records, chunk_size)), []), 1):
+        errors = []
+        valid = []
+        for line, props, error in chunk:
+            if not error:
+                props, error = clean_record(model, props)
+            if error:
+                errors.append({'linea': line, 'error': error})
+            else:
+                valid.append((line, props))
+        result = bulk_create_or_update(model, [props for line, props in valid], unique_together, unknown_epsa=unknown_epsa)
+        counts = {'creado': 0, 'actualizado': 0, 'ignorado': len(errors)}
+        warnings = []
+        for (line, props), item in zip(valid, result):
+            ret_key = next(iter(item))
+            counts[ret_key] += 1
+            if ret_key == 'ignorado':
+                errors.append({'linea': line, 'error': item['ignorado']})
+            elif 'advertencias' in item:
+                warnings.append({'linea': line, 'advertencia': item['advertencias']})
+        summary.append(dict(
+            bloque=number,
+            lineas=[chunk[0][0], chunk[-1][0]],
+            errores=sorted(errors, key=lambda e: e['linea']),
+            advertencias=warnings,
+            **counts
+        ))
+    return summary
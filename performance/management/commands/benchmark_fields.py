@@ -0,0 +1,53 @@
+import time
+import tracemalloc
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from performance.management.commands.benchmark_upsert import fake_reports
+from performance.models import VariableReport
+from performance.serializers import bulk_create_or_update
+from performance.views import VariableReportViewSet
+
+
+class Command(BaseCommand):
+    help = 'Compara la latencia y memoria de /api/reports/?fields=... cargando la fila completa contra cargar sólo las columnas pedidas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Cantidad de reportes de prueba.')
+        parser.add_argument('--fields', default='epsa,year,v1', help='Valor del parámetro fields.')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por medición.')
+
+    def measure(self, view, request, repeat):
+        best = None
+        for _ in range(repeat):
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = view(request)
+            response.render()
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            best = min(best or (seconds, peak), (seconds, peak))
+        return best
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        view = VariableReportViewSet.as_view({'get': 'list'})
+        with transaction.atomic():
+            bulk_create_or_update(VariableReport, fake_reports(options['rows']), ['epsa','year','month'])
+            user = User(username='benchmark', is_superuser=True, is_active=True)
+            user.save()
+            request = factory.get('/api/reports/', {'fields': options['fields']})
+            force_authenticate(request, user=user)
+            self.stdout.write(f'{"columnas":>10} {"segundos":>10} {"memoria (MB)":>14}')
+            VariableReportViewSet.fast_list = False
+            VariableReportViewSet.cache_responses = False
+            for label, project in [('todas', False), ('pedidas', True)]:
+                VariableReportViewSet.project_fields = project
+                seconds, peak = self.measure(view, request, options['repeat'])
+                self.stdout.write(f'{label:>10} {seconds:>10.3f} {peak / 2**20:>14.1f}')
+            VariableReportViewSet.project_fields = True
+            VariableReportViewSet.fast_list = True
+            VariableReportViewSet.cache_responses = True
+            transaction.set_rollback(True)
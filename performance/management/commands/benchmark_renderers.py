@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from aapsapi.fastpath import readable_columns, compile_row_serializer
+from aapsapi.renderers import FastJSONRenderer
+from performance.management.commands.benchmark_upsert import fake_reports
+from performance.models import VariableReport
+from performance.serializers import bulk_create_or_update, VariableReportSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compara el tiempo de codificación de una lista de reportes de variables entre el JSONRenderer de DRF y FastJSONRenderer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Cantidad de reportes de prueba.')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por medición.')
+
+    def measure(self, renderer, data, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            content = renderer.render(data, 'application/json')
+            seconds = time.perf_counter() - start
+            best = min(best or seconds, seconds)
+        return best, content
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            bulk_create_or_update(VariableReport, fake_reports(options['rows']), ['epsa','year','month'])
+            serializer = VariableReportSerializer()
+            columns = [column for name, column, field in readable_columns(serializer)]
+            row_to_dict = compile_row_serializer(serializer, columns)
+            data = [row_to_dict(row) for row in VariableReport.objects.order_by('pk').values_list(*columns)]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'{"renderizador":>18} {"segundos":>10} {"MB":>8}')
+        results = {}
+        for renderer in [JSONRenderer(), FastJSONRenderer()]:
+            seconds, content = self.measure(renderer, data, options['repeat'])
+            results[type(renderer).__name__] = content
+            self.stdout.write(f'{type(renderer).__name__:>18} {seconds:>10.3f} {len(content) / 2**20:>8.1f}')
+        self.stdout.write(f'Salida idéntica: {len(set(results.values())) == 1}')
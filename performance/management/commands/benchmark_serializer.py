@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from aapsapi.fastpath import readable_columns, compile_row_serializer
+from performance.management.commands.benchmark_upsert import fake_reports
+from performance.models import VariableReport
+from performance.serializers import bulk_create_or_update, CustomModelSerializer, VariableReportSerializer
+
+
+class SkippingReportSerializer(CustomModelSerializer):
+    class Meta:
+        model = VariableReport
+        fields = '__all__'
+
+
+class Command(BaseCommand):
+    help = 'Compara el tiempo de serialización de reportes de variables entre el serializador de DRF y la función compilada sobre values_list().'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Cantidad de reportes de prueba.')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por medición.')
+
+    def measure(self, function, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = function()
+            seconds = time.perf_counter() - start
+            best = min(best or seconds, seconds)
+        return best, data
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            bulk_create_or_update(VariableReport, fake_reports(options['rows']), ['epsa','year','month'])
+            queryset = VariableReport.objects.order_by('pk')
+            self.stdout.write(f'{"serializador":>24} {"drf (s)":>10} {"compilado (s)":>14} {"iguales":>8}')
+            for serializer_class in [VariableReportSerializer, SkippingReportSerializer]:
+                serializer = serializer_class()
+                columns = [column for name, column, field in readable_columns(serializer)]
+                row_to_dict = compile_row_serializer(serializer, columns)
+                slow, expected = self.measure(lambda: serializer_class(queryset.all(), many=True).data, options['repeat'])
+                fast, data = self.measure(lambda: [row_to_dict(row) for row in queryset.values_list(*columns)], options['repeat'])
+                self.stdout.write(f'{serializer_class.__name__:>24} {slow:>10.3f} {fast:>14.3f} {str(data == expected):>8}')
+            transaction.set_rollback(True)
@@ -0,0 +1,80 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from performance.models import VariableReport
+from performance.serializers import bulk_create_or_update, instance_kwargs
+
+
+def legacy_bulk_create_or_update(model,data,unique_together=[]):
+    '''
+    Implementación anterior (fila por fila) de `bulk_create_or_update`, conservada como referencia para la comparación.
+    '''
+    ret = []
+    for props in data:
+        if not set(unique_together) <= set(props.keys()):
+            ret.append({'ignorado':{'no_identificable':'No se proporcionaron todos los campos necesarios para identificar la instancia de manera única.'}})
+            continue
+        key_vals = [props.get(key_prop) for key_prop in unique_together]
+        if not any(key_vals):
+            ret.append({'ignorado':{'objeto_en_blanco':'Todas las propiedades clave de este objeto estan en blanco.'}})
+            continue
+        qs = model.objects.filter(**{k:v for k,v in zip(unique_together,key_vals)})
+        if qs.count() > 0:
+            qs.update(**props)
+            ret_key = 'actualizado'
+        else:
+            e,created = model.objects.get_or_create(**instance_kwargs(model, props))
+            ret_key = 'creado' if created else 'ignorado'
+        ret.append({ret_key: props})
+    return ret
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def fake_reports(n):
+    rnd = random.Random(n)
+    data = []
+    for i in range(n):
+        props = {'epsa': f'BENCH-{i // 600}', 'year': 1950 + (i // 12) % 50, 'month': i % 12 + 1}
+        for v in range(51):
+            props[f'v{v+1}'] = round(rnd.uniform(0, 1e6), 2)
+        data.append(props)
+    return data
+
+
+class Command(BaseCommand):
+    help = 'Compara el ingreso masivo de reportes de variables fila por fila contra el ingreso por lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000', help='Cantidades de filas a ingresar, separadas por comas.')
+        parser.add_argument('--legacy-limit', type=int, default=100000, help='No ejecutar la ruta fila por fila para cantidades mayores a este límite.')
+
+    def run(self, func, data):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            func(VariableReport, data, ['epsa','year','month'])
+        return time.perf_counter() - start, counter.count
+
+    def handle(self, *args, **options):
+        unique_together = ['epsa','year','month']
+        implementations = [('fila por fila', legacy_bulk_create_or_update), ('por lotes', bulk_create_or_update)]
+        self.stdout.write(f'{"filas":>8} {"ruta":>14} {"paso":>12} {"segundos":>10} {"consultas":>10}')
+        for size in [int(s) for s in options['sizes'].split(',')]:
+            data = fake_reports(size)
+            for name, func in implementations:
+                if func is legacy_bulk_create_or_update and size > options['legacy_limit']:
+                    continue
+                with transaction.atomic():
+                    for step in ['creación', 'actualización']:
+                        seconds, queries = self.run(func, [dict(props) for props in data])
+                        self.stdout.write(f'{size:>8} {name:>14} {step:>12} {seconds:>10.3f} {queries:>10}')
+                    transaction.set_rollback(True)
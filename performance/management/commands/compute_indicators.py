@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from performance.indicators import compute_indicators, compute_indicators_incremental
+
+
+class Command(BaseCommand):
+    help = 'Calcula las medidas de indicadores (ind1...ind32) en base a los reportes de variables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--epsa', action='append', help='Sigla de la EPSA a calcular. Puede repetirse. Todas por defecto.')
+        parser.add_argument('--year', action='append', type=int, help='Año a calcular. Puede repetirse. Todos por defecto.')
+        parser.add_argument('--incremental', action='store_true', help='Recalcular sólo los indicadores afectados por reportes modificados desde el último cálculo (de las EPSA y años dados, si los hay).')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['incremental']:
+            counts = compute_indicators_incremental(epsas=options['epsa'], years=options['year'])
+        else:
+            counts = compute_indicators(epsas=options['epsa'], years=options['year'])
+        self.stdout.write(
+            f'{counts["creado"]} medidas creadas, {counts["actualizado"]} actualizadas y {counts["ignorado"]} ignoradas en {time.perf_counter() - start:.2f} segundos.'
+        )
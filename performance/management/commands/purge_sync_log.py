@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from performance import synclog
+
+
+class Command(BaseCommand):
+    help = 'Elimina los registros de eliminaciones y compacta los cambios de reportes anteriores al periodo de retención (SYNC_LOG_RETENTION_DAYS).'
+
+    def handle(self, *args, **options):
+        tombstones, changes = synclog.purge()
+        self.stdout.write(f'Eliminaciones borradas: {tombstones}  cambios compactados: {changes}')
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from performance.models import VariableReport, IndicatorMeasurement
+from performance.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recalcula todos los agregados mensuales, semestrales y anuales de reportes de variables y medidas de indicadores.'
+
+    def handle(self, *args, **options):
+        for model in [VariableReport, IndicatorMeasurement]:
+            rebuild_rollups(model)
+            self.stdout.write(f'Agregados de {model._meta.verbose_name_plural} recalculados.')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from aapsapi import cache as response_cache
+
+
+class Command(BaseCommand):
+    help = ('Muestra la cantidad aproximada de aciertos y fallos del caché de respuestas de la API. Cada proceso del servidor '
+            'suma sus contadores al caché como máximo una vez por minuto.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reinicia los contadores después de mostrarlos.')
+
+    def handle(self, *args, **options):
+        stats = response_cache.stats()
+        total = stats['hit'] + stats['miss']
+        ratio = stats['hit'] / total if total else 0
+        self.stdout.write(f'aciertos: {stats["hit"]}  fallos: {stats["miss"]}  tasa de aciertos: {ratio:.1%}')
+        if options['reset']:
+            response_cache.reset_stats()
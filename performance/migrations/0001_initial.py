@@ -0,0 +1,236 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EPSA',
+            fields=[
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('code', models.CharField(help_text='Sigla de la EPSA. Debe ser único y contener no más de 16 caracteres. De preferencia en mayúsculas. Campo obligatorio.', max_length=64, primary_key=True, serialize=False, verbose_name='sigla')),
+                ('name', models.CharField(blank=True, help_text='Nombre de la EPSA.', max_length=255, null=True, verbose_name='nombre')),
+                ('state', models.CharField(blank=True, choices=[('LP', 'La Paz'), ('CO', 'Cochabamba'), ('PO', 'Potosí'), ('SC', 'Santa Cruz'), ('CH', 'Chuquisaca'), ('OR', 'Oruro'), ('TA', 'Tarija'), ('BE', 'Beni'), ('PA', 'Pando')], help_text='Departamento de la EPSA.', max_length=2, null=True, verbose_name='departamento')),
+                ('category', models.CharField(blank=True, choices=[('A', 'A'), ('B', 'B'), ('C', 'C'), ('D', 'D')], help_text='Categoría de la EPSA.', max_length=1, null=True, verbose_name='categoría')),
+            ],
+            options={
+                'verbose_name': 'EPSA',
+                'verbose_name_plural': 'EPSAs',
+                'ordering': ['category', 'code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Indicator',
+            fields=[
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('code', models.CharField(help_text='Código del indicador. Debe ser único y contener no más de 16 caracteres.', max_length=32, primary_key=True, serialize=False, verbose_name='código')),
+                ('ind_id', models.PositiveSmallIntegerField(help_text='Número identificatorio de la variable. Único.', unique=True, verbose_name='Número de Variable')),
+                ('name', models.CharField(blank=True, help_text='Nombre del indicador.', max_length=255, null=True, verbose_name='nombre')),
+                ('unit', models.CharField(blank=True, help_text='Unidad de medida del indicador.', max_length=32, null=True, verbose_name='unidad')),
+                ('criteria', models.CharField(blank=True, choices=[('Confiabilidad del recurso hídrico', (('disponibilidad_recurso', 'Disponibiidad del recurso'), ('calidad_recurso', 'Calidad del recurso'))), ('Estabilidad de abstecimiento', (('abastecimiento', 'Abastecimiento Continuo'), ('alcanse', 'Alcanse de los servicios'))), ('Protección al medio ambiente', (('sostenibilidad_sub', 'Explotación sostenible acuíferos subterráneos'), ('contaminacion', 'Contaminación por aguas residuales'))), ('Manejo apropiado del sistema de agua potable y alcantarillado sanitario', (('manejo_apropiado_mejora', 'Mejora continua del servicio en base a las necesidades de los usuarios'), ('mantenimiento', 'Mantenimiento Apropiado'))), ('Sostenibilidad económica y administrativa del servicio', (('razonabilidad_economica', 'Razonabilidad económica para la prestación del servicio'), ('sostenibilidad_mejora', 'Mejora continua del servicio en base a las necesidades de los usuarios')))], help_text='Objetivo/Critério del indicador.', max_length=32, null=True, verbose_name='objetivo-critério')),
+                ('par_min_A', models.FloatField(blank=True, help_text='Parámetro min. para la categoría A.', null=True, verbose_name='parametro mínimo A')),
+                ('par_min_B', models.FloatField(blank=True, help_text='Parámetro min. para la categoría B.', null=True, verbose_name='parametro mínimo B')),
+                ('par_min_C', models.FloatField(blank=True, help_text='Parámetro min. para la categoría C.', null=True, verbose_name='parametro mínimo C')),
+                ('par_min_D', models.FloatField(blank=True, help_text='Parámetro min. para la categoría D.', null=True, verbose_name='parametro mínimo D')),
+                ('par_max_A', models.FloatField(blank=True, help_text='Parámetro max. para la categoría A.', null=True, verbose_name='parametro máximo A')),
+                ('par_max_B', models.FloatField(blank=True, help_text='Parámetro max. para la categoría B.', null=True, verbose_name='parametro máximo B')),
+                ('par_max_C', models.FloatField(blank=True, help_text='Parámetro max. para la categoría C.', null=True, verbose_name='parametro máximo C')),
+                ('par_max_D', models.FloatField(blank=True, help_text='Parámetro max. para la categoría D.', null=True, verbose_name='parametro máximo D')),
+            ],
+            options={
+                'verbose_name': 'Indicador',
+                'verbose_name_plural': 'Indicadores',
+                'ordering': ['ind_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Variable',
+            fields=[
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('code', models.CharField(help_text='Código de variable. Debe ser único y contener no más de 16 caracteres.', max_length=32, primary_key=True, serialize=False, verbose_name='código')),
+                ('var_id', models.PositiveSmallIntegerField(help_text='Número identificatorio de la variable. Único.', unique=True, verbose_name='Número de Variable')),
+                ('name', models.CharField(blank=True, help_text='Nombre completo de la variable.', max_length=255, null=True, verbose_name='nombre')),
+                ('unit', models.CharField(blank=True, help_text='Unidad de medida de la variable.', max_length=16, null=True, verbose_name='unidad')),
+                ('var_type', models.CharField(blank=True, choices=[('volumen', 'Volumen'), ('capacidad', 'Capacidad'), ('muestras_calidad', 'Muestras para Calidad'), ('conexiones', 'Conexiones'), ('poblacion', 'Población'), ('abastecimiento', 'Abastecimiento'), ('balance_general', 'Balance General'), ('estado_resultados', 'Estado de Resultados'), ('inversiones', 'Inversiones'), ('personal', 'Personal'), ('reclamos', 'Reclamos'), ('muestras_presion', 'Muestras de Presión'), ('fallas', 'Fallas')], help_text='El tipo de la variable.', max_length=32, null=True, verbose_name='Tipo de Variable')),
+            ],
+            options={
+                'verbose_name': 'Variable',
+                'verbose_name_plural': 'Variables',
+                'ordering': ['var_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='VariableReport',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('epsa', models.CharField(blank=True, help_text='EPSA que reporta las variables', max_length=64, null=True, verbose_name='EPSA')),
+                ('year', models.IntegerField(default=2026, help_text='Año de reporte', validators=[django.core.validators.MinValueValidator(1900)], verbose_name='Año')),
+                ('month', models.IntegerField(blank=True, default=1, help_text='Mes del reporte o blanco si el reporte es anual.', null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)], verbose_name='mes')),
+                ('v1', models.FloatField(blank=True, help_text='Volumen de agua cruda extraído de la(s) fuente(s) superficial(es)(unidad: m3/periodo)', null=True, verbose_name='1.-Volumen de agua cruda extraído de la(s) fuente(s) superficial(es)')),
+                ('v1_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 0 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v2', models.FloatField(blank=True, help_text='Volumen de agua cruda extraído de la(s) fuente(s) subterránea(s) (unidad: m3/periodo)', null=True, verbose_name='2.-Volumen de agua cruda extraído de la(s) fuente(s) subterránea(s) ')),
+                ('v2_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 1 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v3', models.FloatField(blank=True, help_text='Volumen de agua potable producido (Planta de tratamiento y/o tanque de desinfección)(unidad: m3/periodo)', null=True, verbose_name='3.-Volumen de agua potable producido (Planta de tratamiento y/o tanque de desinfección)')),
+                ('v3_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 2 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v4', models.FloatField(blank=True, help_text='Volumen de agua potable tratada en planta de tratamiento(unidad: m3/periodo)', null=True, verbose_name='4.-Volumen de agua potable tratada en planta de tratamiento')),
+                ('v4_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 3 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v5', models.FloatField(blank=True, help_text='Volumen de agua potable facturado(unidad: m3/periodo)', null=True, verbose_name='5.-Volumen de agua potable facturado')),
+                ('v5_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 4 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v6', models.FloatField(blank=True, help_text='Volumen tratado de agua residual(unidad: m3/periodo)', null=True, verbose_name='6.-Volumen tratado de agua residual')),
+                ('v6_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 5 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v7', models.FloatField(blank=True, help_text='Capacidad autorizada de captación de la(s) fuente(s) de agua cruda(unidad: m3/hrs)', null=True, verbose_name='7.-Capacidad autorizada de captación de la(s) fuente(s) de agua cruda')),
+                ('v7_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 6 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v8', models.FloatField(blank=True, help_text='Capacidad máxima de agua actual de la fuente subterránea(unidad: m3/hrs)', null=True, verbose_name='8.-Capacidad máxima de agua actual de la fuente subterránea')),
+                ('v8_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 7 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v9', models.FloatField(blank=True, help_text='Capacidad instalada de la planta de tratamiento de agua potable(unidad: m3/hrs)', null=True, verbose_name='9.-Capacidad instalada de la planta de tratamiento de agua potable')),
+                ('v9_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 8 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v10', models.FloatField(blank=True, help_text='Capacidad instalada de la planta de tratamiento de agua residual(unidad: m3/hrs)', null=True, verbose_name='10.-Capacidad instalada de la planta de tratamiento de agua residual')),
+                ('v10_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 9 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v11', models.FloatField(blank=True, help_text='Número de muestras ejecutadas de agua potable(unidad: muestras)', null=True, verbose_name='11.-Número de muestras ejecutadas de agua potable')),
+                ('v11_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 10 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v12', models.FloatField(blank=True, help_text='Número de muestras recomendadas de agua potable(unidad: muestras)', null=True, verbose_name='12.-Número de muestras recomendadas de agua potable')),
+                ('v12_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 11 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v13', models.FloatField(blank=True, help_text='Número de análisis satisfactorios de agua potable(unidad: análisis)', null=True, verbose_name='13.-Número de análisis satisfactorios de agua potable')),
+                ('v13_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 12 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v14', models.FloatField(blank=True, help_text='Número de análisis ejecutados de agua potable(unidad: análisis)', null=True, verbose_name='14.-Número de análisis ejecutados de agua potable')),
+                ('v14_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 13 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v15', models.FloatField(blank=True, help_text='Número de análisis satisfactorios de agua residual tratada(unidad: análisis)', null=True, verbose_name='15.-Número de análisis satisfactorios de agua residual tratada')),
+                ('v15_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 14 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v16', models.FloatField(blank=True, help_text='Número de análisis ejecutados de agua residual tratada(unidad: análisis)', null=True, verbose_name='16.-Número de análisis ejecutados de agua residual tratada')),
+                ('v16_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 15 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v17', models.FloatField(blank=True, help_text='Número total de conexiones de agua potable activas medidas y no medidas(unidad: conex.)', null=True, verbose_name='17.-Número total de conexiones de agua potable activas medidas y no medidas')),
+                ('v17_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 16 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v18', models.FloatField(blank=True, help_text='Número total de conexiones de alcantarillado sanitario activas (unidad: conex.)', null=True, verbose_name='18.-Número total de conexiones de alcantarillado sanitario activas ')),
+                ('v18_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 17 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v19', models.FloatField(blank=True, help_text='Número total de medidores de agua potable instalados (unidad: medidores)', null=True, verbose_name='19.-Número total de medidores de agua potable instalados ')),
+                ('v19_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 18 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v20', models.FloatField(blank=True, help_text='Habitantes por conexión de agua potable (Población abastecida)(unidad: hab /conex.)', null=True, verbose_name='20.-Habitantes por conexión de agua potable (Población abastecida)')),
+                ('v20_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 19 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v21', models.FloatField(blank=True, help_text='Habitantes por conexión de alcantarillado sanitario (Población servida)(unidad: hab /conex.)', null=True, verbose_name='21.-Habitantes por conexión de alcantarillado sanitario (Población servida)')),
+                ('v21_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 20 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v22', models.FloatField(blank=True, help_text='Población total (Del área de servicio autorizado)(unidad: hab.)', null=True, verbose_name='22.-Población total (Del área de servicio autorizado)')),
+                ('v22_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 21 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v23', models.FloatField(blank=True, help_text='Población abastecida(unidad: hab.)', null=True, verbose_name='23.-Población abastecida')),
+                ('v23_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 22 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v24', models.FloatField(blank=True, help_text='Población servida(unidad: hab.)', null=True, verbose_name='24.-Población servida')),
+                ('v24_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 23 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v25', models.FloatField(blank=True, help_text='Horas periodo analizado(unidad: hrs/día)', null=True, verbose_name='25.-Horas periodo analizado')),
+                ('v25_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 24 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v26', models.FloatField(blank=True, help_text='Horas periodo analizado(unidad: hrs/periodo)', null=True, verbose_name='26.-Horas periodo analizado')),
+                ('v26_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 25 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v27', models.FloatField(blank=True, help_text='Sumatoria ponderada de horas por usuario afectados por racionamiento(unidad: hrs x conex.)', null=True, verbose_name='27.-Sumatoria ponderada de horas por usuario afectados por racionamiento')),
+                ('v27_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 26 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v28', models.FloatField(blank=True, help_text='Sumatoria ponderada de horas por usuario afectados por corte(unidad: hrs x conex.)', null=True, verbose_name='28.-Sumatoria ponderada de horas por usuario afectados por corte')),
+                ('v28_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 27 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v29', models.FloatField(blank=True, help_text='Activo disponible(unidad: Bs.)', null=True, verbose_name='29.-Activo disponible')),
+                ('v29_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 28 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v30', models.FloatField(blank=True, help_text='Cuentas por cobrar de facturación gestión actual(unidad: Bs.)', null=True, verbose_name='30.-Cuentas por cobrar de facturación gestión actual')),
+                ('v30_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 29 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v31', models.FloatField(blank=True, help_text='Activo total(unidad: Bs.)', null=True, verbose_name='31.-Activo total')),
+                ('v31_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 30 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v32', models.FloatField(blank=True, help_text='Pasivo corriente(unidad: Bs.)', null=True, verbose_name='32.-Pasivo corriente')),
+                ('v32_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 31 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v33', models.FloatField(blank=True, help_text='Pasivo no corriente(unidad: Bs.)', null=True, verbose_name='33.-Pasivo no corriente')),
+                ('v33_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 32 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v34', models.FloatField(blank=True, help_text='Ingresos operativos del servicio(unidad: Bs.)', null=True, verbose_name='34.-Ingresos operativos del servicio')),
+                ('v34_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 33 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v35', models.FloatField(blank=True, help_text='Ingresos por servicios(unidad: Bs.)', null=True, verbose_name='35.-Ingresos por servicios')),
+                ('v35_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 34 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v36', models.FloatField(blank=True, help_text='Costos operativos del servicio(unidad: Bs.)', null=True, verbose_name='36.-Costos operativos del servicio')),
+                ('v36_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 35 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v37', models.FloatField(blank=True, help_text='Costos operativos totales(unidad: Bs.)', null=True, verbose_name='37.-Costos operativos totales')),
+                ('v37_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 36 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v38', models.FloatField(blank=True, help_text='Inversiones ejecutadas(unidad: Bs.)', null=True, verbose_name='38.-Inversiones ejecutadas')),
+                ('v38_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 37 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v39', models.FloatField(blank=True, help_text='Inversiones presupuestadas(unidad: Bs.)', null=True, verbose_name='39.-Inversiones presupuestadas')),
+                ('v39_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 38 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v40', models.FloatField(blank=True, help_text='Número de empleados técnicos y/o profesionales(unidad: empleados)', null=True, verbose_name='40.-Número de empleados técnicos y/o profesionales')),
+                ('v40_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 39 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v41', models.FloatField(blank=True, help_text='Total personal(unidad: empleados)', null=True, verbose_name='41.-Total personal')),
+                ('v41_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 40 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v42', models.FloatField(blank=True, help_text='Número de reclamos atendidos(unidad: reclamos)', null=True, verbose_name='42.-Número de reclamos atendidos')),
+                ('v42_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 41 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v43', models.FloatField(blank=True, help_text='Número de reclamos presentados(unidad: reclamos)', null=True, verbose_name='43.-Número de reclamos presentados')),
+                ('v43_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 42 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v44', models.FloatField(blank=True, help_text='Número de puntos con presión dentro el rango aceptable según NB o MS(unidad: puntos)', null=True, verbose_name='44.-Número de puntos con presión dentro el rango aceptable según NB o MS')),
+                ('v44_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 43 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v45', models.FloatField(blank=True, help_text='Número total de puntos de muestreo de presión(unidad: puntos)', null=True, verbose_name='45.-Número total de puntos de muestreo de presión')),
+                ('v45_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 44 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v46', models.FloatField(blank=True, help_text='Número de fallas en tubería de red de agua potable(unidad: fallas)', null=True, verbose_name='46.-Número de fallas en tubería de red de agua potable')),
+                ('v46_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 45 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v47', models.FloatField(blank=True, help_text='Número de fallas en conexiones de agua potable(unidad: fallas)', null=True, verbose_name='47.-Número de fallas en conexiones de agua potable')),
+                ('v47_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 46 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v48', models.FloatField(blank=True, help_text='Longitud total de red de agua potable (unidad: km.)', null=True, verbose_name='48.-Longitud total de red de agua potable ')),
+                ('v48_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 47 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v49', models.FloatField(blank=True, help_text='Número de fallas en tubería de red de alcantarillado sanitario(unidad: fallas)', null=True, verbose_name='49.-Número de fallas en tubería de red de alcantarillado sanitario')),
+                ('v49_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 48 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v50', models.FloatField(blank=True, help_text='Número de fallas en conexiones de alcantarillado sanitario(unidad: fallas)', null=True, verbose_name='50.-Número de fallas en conexiones de alcantarillado sanitario')),
+                ('v50_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 49 reportada.', max_length=2, verbose_name='Tipo de dato')),
+                ('v51', models.FloatField(blank=True, help_text='Longitud total de red de alcantarillado sanitario(unidad: km.)', null=True, verbose_name='51.-Longitud total de red de alcantarillado sanitario')),
+                ('v51_type', models.CharField(choices=[('VA', 'valor'), ('NC', 'NC: No Corresponde'), ('NR', 'NR: No Reportó'), ('NB', 'NB: Norma Boliviana'), ('MS', 'MS: Manual de Seguimiento')], default='VA', help_text='Tipo de la variable 50 reportada.', max_length=2, verbose_name='Tipo de dato')),
+            ],
+            options={
+                'verbose_name': 'Reporte de variables',
+                'verbose_name_plural': 'Reportes de variables',
+                'ordering': ['epsa', 'year', 'month'],
+                'unique_together': {('epsa', 'year', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='IndicatorMeasurement',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('epsa', models.CharField(blank=True, help_text='EPSA que reporta las variables', max_length=64, null=True, verbose_name='EPSA')),
+                ('year', models.IntegerField(default=2026, help_text='Año del reporte.', validators=[django.core.validators.MinValueValidator(1900)], verbose_name='año')),
+                ('month', models.IntegerField(blank=True, default=1, help_text='Mes del reporte o blanco si el reporte es anual.', null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)], verbose_name='mes')),
+                ('ind1', models.FloatField(blank=True, help_text='Rendimiento actual de la fuente(unidad: %)', null=True, verbose_name='1.- Rendimiento actual de la fuente')),
+                ('ind2', models.FloatField(blank=True, help_text='Uso eficiente del recurso(unidad: %)', null=True, verbose_name='2.- Uso eficiente del recurso')),
+                ('ind3', models.FloatField(blank=True, help_text='Cobertura de muestras de agua potable(unidad: %)', null=True, verbose_name='3.- Cobertura de muestras de agua potable')),
+                ('ind4', models.FloatField(blank=True, help_text='Conformidad de los análisis de agua potable realizados(unidad: %)', null=True, verbose_name='4.- Conformidad de los análisis de agua potable realizados')),
+                ('ind5', models.FloatField(blank=True, help_text='Dotación(unidad: l/hab/día)', null=True, verbose_name='5.- Dotación')),
+                ('ind6', models.FloatField(blank=True, help_text='Continuidad por racionamiento(unidad: hr/día)', null=True, verbose_name='6.- Continuidad por racionamiento')),
+                ('ind7', models.FloatField(blank=True, help_text='Continuidad por corte(unidad: %)', null=True, verbose_name='7.- Continuidad por corte')),
+                ('ind8', models.FloatField(blank=True, help_text='Cobertura del servicio de agua potable(unidad: %)', null=True, verbose_name='8.- Cobertura del servicio de agua potable')),
+                ('ind9', models.FloatField(blank=True, help_text='Cobertura del servicio de alcantarillado sanitario(unidad: %)', null=True, verbose_name='9.- Cobertura del servicio de alcantarillado sanitario')),
+                ('ind10', models.FloatField(blank=True, help_text='Cobertura de micromedición(unidad: %)', null=True, verbose_name='10.- Cobertura de micromedición')),
+                ('ind11', models.FloatField(blank=True, help_text='Incidencia extracción de agua cruda subterránea (unidad: %)', null=True, verbose_name='11.- Incidencia extracción de agua cruda subterránea ')),
+                ('ind12', models.FloatField(blank=True, help_text='Índice de tratamiento de agua residual(unidad: %)', null=True, verbose_name='12.- Índice de tratamiento de agua residual')),
+                ('ind13', models.FloatField(blank=True, help_text='Control de agua residual(unidad: %)', null=True, verbose_name='13.- Control de agua residual')),
+                ('ind14', models.FloatField(blank=True, help_text='Capacidad instalada de planta de tratamiento de agua potable(unidad: %)', null=True, verbose_name='14.- Capacidad instalada de planta de tratamiento de agua potable')),
+                ('ind15', models.FloatField(blank=True, help_text='Capacidad instalada de planta de tratamiento de agua residual (unidad: %)', null=True, verbose_name='15.- Capacidad instalada de planta de tratamiento de agua residual ')),
+                ('ind16', models.FloatField(blank=True, help_text='Presión del servicio de agua potable(unidad: %)', null=True, verbose_name='16.- Presión del servicio de agua potable')),
+                ('ind17', models.FloatField(blank=True, help_text='Índice de agua no contabilizada en producción(unidad: %)', null=True, verbose_name='17.- Índice de agua no contabilizada en producción')),
+                ('ind18', models.FloatField(blank=True, help_text='Índice de agua no contabilizada en la red(unidad: %)', null=True, verbose_name='18.- Índice de agua no contabilizada en la red')),
+                ('ind19', models.FloatField(blank=True, help_text='Densidad de fallas en tuberías de agua potable(unidad: fallas/100km)', null=True, verbose_name='19.- Densidad de fallas en tuberías de agua potable')),
+                ('ind20', models.FloatField(blank=True, help_text='Densidad de fallas en conexiones de agua potable(unidad: fallas/1000conex.)', null=True, verbose_name='20.- Densidad de fallas en conexiones de agua potable')),
+                ('ind21', models.FloatField(blank=True, help_text='Densidad de fallas en tuberías de agua residual(unidad: fallas/100km)', null=True, verbose_name='21.- Densidad de fallas en tuberías de agua residual')),
+                ('ind22', models.FloatField(blank=True, help_text='Densidad de fallas en conexiones de agua residual(unidad: fallas/1000conex.)', null=True, verbose_name='22.- Densidad de fallas en conexiones de agua residual')),
+                ('ind23', models.FloatField(blank=True, help_text='Índice de operación eficiente(unidad: %)', null=True, verbose_name='23.- Índice de operación eficiente')),
+                ('ind24', models.FloatField(blank=True, help_text='Prueba ácida(unidad: -)', null=True, verbose_name='24.- Prueba ácida')),
+                ('ind25', models.FloatField(blank=True, help_text='Eficiencia de recaudación(unidad: %)', null=True, verbose_name='25.- Eficiencia de recaudación')),
+                ('ind26', models.FloatField(blank=True, help_text='Índice de endeudamiento total(unidad: %)', null=True, verbose_name='26.- Índice de endeudamiento total')),
+                ('ind27', models.FloatField(blank=True, help_text='Tarifa media(unidad: %CUO(Bs.))', null=True, verbose_name='27.- Tarifa media')),
+                ('ind28', models.FloatField(blank=True, help_text='Costo unitario de operación(unidad: %TM(Bs.))', null=True, verbose_name='28.- Costo unitario de operación')),
+                ('ind29', models.FloatField(blank=True, help_text='Índice de ejecución de inversiones(unidad: %)', null=True, verbose_name='29.- Índice de ejecución de inversiones')),
+                ('ind30', models.FloatField(blank=True, help_text='Personal calificado(unidad: %)', null=True, verbose_name='30.- Personal calificado')),
+                ('ind31', models.FloatField(blank=True, help_text='Número de empleados por cada 1000 conexiones(unidad: empleados/1000conex.)', null=True, verbose_name='31.- Número de empleados por cada 1000 conexiones')),
+                ('ind32', models.FloatField(blank=True, help_text='Atención de reclamos(unidad: %)', null=True, verbose_name='32.- Atención de reclamos')),
+            ],
+            options={
+                'verbose_name': 'Medida de indicadores',
+                'verbose_name_plural': 'Medidas de indicadores',
+                'ordering': ['epsa', 'year', 'month'],
+                'unique_together': {('epsa', 'year', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:13
+
+from django.db import migrations
+import django.db.models.deletion
+import performance.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='indicatormeasurement',
+            options={'ordering': ['epsa_id', 'year', 'month'], 'verbose_name': 'Medida de indicadores', 'verbose_name_plural': 'Medidas de indicadores'},
+        ),
+        migrations.AlterModelOptions(
+            name='variablereport',
+            options={'ordering': ['epsa_id', 'year', 'month'], 'verbose_name': 'Reporte de variables', 'verbose_name_plural': 'Reportes de variables'},
+        ),
+        migrations.AlterField(
+            model_name='indicatormeasurement',
+            name='epsa',
+            field=performance.models.EPSAForeignKey(blank=True, db_column='epsa', db_constraint=False, help_text='EPSA que reporta las variables', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='measurements', to='performance.EPSA', verbose_name='EPSA'),
+        ),
+        migrations.AlterField(
+            model_name='variablereport',
+            name='epsa',
+            field=performance.models.EPSAForeignKey(blank=True, db_column='epsa', db_constraint=False, help_text='EPSA que reporta las variables', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='reports', to='performance.EPSA', verbose_name='EPSA'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0002_epsa_foreign_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VariableReportChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epsa', models.CharField(blank=True, max_length=64, null=True, verbose_name='EPSA')),
+                ('year', models.IntegerField(verbose_name='año')),
+                ('month', models.IntegerField(blank=True, null=True, verbose_name='mes')),
+                ('variables', models.CharField(help_text='Números de las variables modificadas separados por comas, o "*" si no se conocen.', max_length=255, verbose_name='variables')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Cambio de reporte de variables',
+                'verbose_name_plural': 'Cambios de reportes de variables',
+                'ordering': ['created'],
+            },
+        ),
+    ]
@@ -0,0 +1,138 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0003_variablereportchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicatorMeasurementRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epsa', models.CharField(blank=True, max_length=64, null=True, verbose_name='EPSA')),
+                ('grain', models.CharField(choices=[('month', 'Mensual'), ('semester', 'Semestral'), ('year', 'Anual')], max_length=8, verbose_name='nivel')),
+                ('year', models.IntegerField(verbose_name='año')),
+                ('period', models.IntegerField(help_text='Mes (1-12) o semestre (1-2) del agregado, o 0 si el agregado es anual.', verbose_name='periodo')),
+                ('reports', models.IntegerField(help_text='Cantidad de reportes agregados.', verbose_name='reportes')),
+                ('ind1', models.FloatField(blank=True, null=True, verbose_name='indicador 1')),
+                ('ind2', models.FloatField(blank=True, null=True, verbose_name='indicador 2')),
+                ('ind3', models.FloatField(blank=True, null=True, verbose_name='indicador 3')),
+                ('ind4', models.FloatField(blank=True, null=True, verbose_name='indicador 4')),
+                ('ind5', models.FloatField(blank=True, null=True, verbose_name='indicador 5')),
+                ('ind6', models.FloatField(blank=True, null=True, verbose_name='indicador 6')),
+                ('ind7', models.FloatField(blank=True, null=True, verbose_name='indicador 7')),
+                ('ind8', models.FloatField(blank=True, null=True, verbose_name='indicador 8')),
+                ('ind9', models.FloatField(blank=True, null=True, verbose_name='indicador 9')),
+                ('ind10', models.FloatField(blank=True, null=True, verbose_name='indicador 10')),
+                ('ind11', models.FloatField(blank=True, null=True, verbose_name='indicador 11')),
+                ('ind12', models.FloatField(blank=True, null=True, verbose_name='indicador 12')),
+                ('ind13', models.FloatField(blank=True, null=True, verbose_name='indicador 13')),
+                ('ind14', models.FloatField(blank=True, null=True, verbose_name='indicador 14')),
+                ('ind15', models.FloatField(blank=True, null=True, verbose_name='indicador 15')),
+                ('ind16', models.FloatField(blank=True, null=True, verbose_name='indicador 16')),
+                ('ind17', models.FloatField(blank=True, null=True, verbose_name='indicador 17')),
+                ('ind18', models.FloatField(blank=True, null=True, verbose_name='indicador 18')),
+                ('ind19', models.FloatField(blank=True, null=True, verbose_name='indicador 19')),
+                ('ind20', models.FloatField(blank=True, null=True, verbose_name='indicador 20')),
+                ('ind21', models.FloatField(blank=True, null=True, verbose_name='indicador 21')),
+                ('ind22', models.FloatField(blank=True, null=True, verbose_name='indicador 22')),
+                ('ind23', models.FloatField(blank=True, null=True, verbose_name='indicador 23')),
+                ('ind24', models.FloatField(blank=True, null=True, verbose_name='indicador 24')),
+                ('ind25', models.FloatField(blank=True, null=True, verbose_name='indicador 25')),
+                ('ind26', models.FloatField(blank=True, null=True, verbose_name='indicador 26')),
+                ('ind27', models.FloatField(blank=True, null=True, verbose_name='indicador 27')),
+                ('ind28', models.FloatField(blank=True, null=True, verbose_name='indicador 28')),
+                ('ind29', models.FloatField(blank=True, null=True, verbose_name='indicador 29')),
+                ('ind30', models.FloatField(blank=True, null=True, verbose_name='indicador 30')),
+                ('ind31', models.FloatField(blank=True, null=True, verbose_name='indicador 31')),
+                ('ind32', models.FloatField(blank=True, null=True, verbose_name='indicador 32')),
+            ],
+            options={
+                'verbose_name': 'Agregado de medidas de indicadores',
+                'verbose_name_plural': 'Agregados de medidas de indicadores',
+                'ordering': ['epsa', 'grain', 'year', 'period'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='VariableReportRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epsa', models.CharField(blank=True, max_length=64, null=True, verbose_name='EPSA')),
+                ('grain', models.CharField(choices=[('month', 'Mensual'), ('semester', 'Semestral'), ('year', 'Anual')], max_length=8, verbose_name='nivel')),
+                ('year', models.IntegerField(verbose_name='año')),
+                ('period', models.IntegerField(help_text='Mes (1-12) o semestre (1-2) del agregado, o 0 si el agregado es anual.', verbose_name='periodo')),
+                ('reports', models.IntegerField(help_text='Cantidad de reportes agregados.', verbose_name='reportes')),
+                ('v1', models.FloatField(blank=True, null=True, verbose_name='variable 1')),
+                ('v2', models.FloatField(blank=True, null=True, verbose_name='variable 2')),
+                ('v3', models.FloatField(blank=True, null=True, verbose_name='variable 3')),
+                ('v4', models.FloatField(blank=True, null=True, verbose_name='variable 4')),
+                ('v5', models.FloatField(blank=True, null=True, verbose_name='variable 5')),
+                ('v6', models.FloatField(blank=True, null=True, verbose_name='variable 6')),
+                ('v7', models.FloatField(blank=True, null=True, verbose_name='variable 7')),
+                ('v8', models.FloatField(blank=True, null=True, verbose_name='variable 8')),
+                ('v9', models.FloatField(blank=True, null=True, verbose_name='variable 9')),
+                ('v10', models.FloatField(blank=True, null=True, verbose_name='variable 10')),
+                ('v11', models.FloatField(blank=True, null=True, verbose_name='variable 11')),
+                ('v12', models.FloatField(blank=True, null=True, verbose_name='variable 12')),
+                ('v13', models.FloatField(blank=True, null=True, verbose_name='variable 13')),
+                ('v14', models.FloatField(blank=True, null=True, verbose_name='variable 14')),
+                ('v15', models.FloatField(blank=True, null=True, verbose_name='variable 15')),
+                ('v16', models.FloatField(blank=True, null=True, verbose_name='variable 16')),
+                ('v17', models.FloatField(blank=True, null=True, verbose_name='variable 17')),
+                ('v18', models.FloatField(blank=True, null=True, verbose_name='variable 18')),
+                ('v19', models.FloatField(blank=True, null=True, verbose_name='variable 19')),
+                ('v20', models.FloatField(blank=True, null=True, verbose_name='variable 20')),
+                ('v21', models.FloatField(blank=True, null=True, verbose_name='variable 21')),
+                ('v22', models.FloatField(blank=True, null=True, verbose_name='variable 22')),
+                ('v23', models.FloatField(blank=True, null=True, verbose_name='variable 23')),
+                ('v24', models.FloatField(blank=True, null=True, verbose_name='variable 24')),
+                ('v25', models.FloatField(blank=True, null=True, verbose_name='variable 25')),
+                ('v26', models.FloatField(blank=True, null=True, verbose_name='variable 26')),
+                ('v27', models.FloatField(blank=True, null=True, verbose_name='variable 27')),
+                ('v28', models.FloatField(blank=True, null=True, verbose_name='variable 28')),
+                ('v29', models.FloatField(blank=True, null=True, verbose_name='variable 29')),
+                ('v30', models.FloatField(blank=True, null=True, verbose_name='variable 30')),
+                ('v31', models.FloatField(blank=True, null=True, verbose_name='variable 31')),
+                ('v32', models.FloatField(blank=True, null=True, verbose_name='variable 32')),
+                ('v33', models.FloatField(blank=True, null=True, verbose_name='variable 33')),
+                ('v34', models.FloatField(blank=True, null=True, verbose_name='variable 34')),
+                ('v35', models.FloatField(blank=True, null=True, verbose_name='variable 35')),
+                ('v36', models.FloatField(blank=True, null=True, verbose_name='variable 36')),
+                ('v37', models.FloatField(blank=True, null=True, verbose_name='variable 37')),
+                ('v38', models.FloatField(blank=True, null=True, verbose_name='variable 38')),
+                ('v39', models.FloatField(blank=True, null=True, verbose_name='variable 39')),
+                ('v40', models.FloatField(blank=True, null=True, verbose_name='variable 40')),
+                ('v41', models.FloatField(blank=True, null=True, verbose_name='variable 41')),
+                ('v42', models.FloatField(blank=True, null=True, verbose_name='variable 42')),
+                ('v43', models.FloatField(blank=True, null=True, verbose_name='variable 43')),
+                ('v44', models.FloatField(blank=True, null=True, verbose_name='variable 44')),
+                ('v45', models.FloatField(blank=True, null=True, verbose_name='variable 45')),
+                ('v46', models.FloatField(blank=True, null=True, verbose_name='variable 46')),
+                ('v47', models.FloatField(blank=True, null=True, verbose_name='variable 47')),
+                ('v48', models.FloatField(blank=True, null=True, verbose_name='variable 48')),
+                ('v49', models.FloatField(blank=True, null=True, verbose_name='variable 49')),
+                ('v50', models.FloatField(blank=True, null=True, verbose_name='variable 50')),
+                ('v51', models.FloatField(blank=True, null=True, verbose_name='variable 51')),
+            ],
+            options={
+                'verbose_name': 'Agregado de reportes de variables',
+                'verbose_name_plural': 'Agregados de reportes de variables',
+                'ordering': ['epsa', 'grain', 'year', 'period'],
+                'abstract': False,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='variablereportrollup',
+            unique_together={('epsa', 'grain', 'year', 'period')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='indicatormeasurementrollup',
+            unique_together={('epsa', 'grain', 'year', 'period')},
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0004_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(help_text='Etiqueta del modelo, por ejemplo "performance.variablereport".', max_length=100, verbose_name='modelo')),
+                ('object_id', models.CharField(help_text='Llave primaria de la instancia eliminada.', max_length=64, verbose_name='id')),
+                ('deleted', models.DateTimeField(auto_now_add=True, verbose_name='eliminado')),
+            ],
+            options={
+                'verbose_name': 'Instancia eliminada',
+                'verbose_name_plural': 'Instancias eliminadas',
+                'ordering': ['deleted'],
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='tombstone',
+            index_together={('model', 'deleted')},
+        ),
+    ]
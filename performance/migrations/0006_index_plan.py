@@ -0,0 +1,70 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0005_tombstone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='epsa',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='indicator',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='indicatormeasurement',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='variable',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='variablereport',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='epsa',
+            index=models.Index(fields=['category', 'code'], name='performance_categor_cda174_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='epsa',
+            index=models.Index(fields=['state'], name='performance_state_0d4eac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indicator',
+            index=models.Index(fields=['criteria'], name='performance_criteri_0bca3b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indicatormeasurement',
+            index=models.Index(fields=['year', 'month'], name='performance_year_0a44e1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='variable',
+            index=models.Index(fields=['var_type'], name='performance_var_typ_5bd9ef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='variablereport',
+            index=models.Index(fields=['year', 'month'], name='performance_year_7f2837_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='variablereportrollup',
+            index=models.Index(fields=['grain', 'year'], name='performance_grain_e0c27e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indicatormeasurementrollup',
+            index=models.Index(fields=['grain', 'year'], name='performance_grain_d2da09_idx'),
+        ),
+    ]
@@ -1,12 +1,18 @@
+from django import forms
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from datetime import datetime
+from performance.dimensions import epsa_dimension
 
 class BaseModel(models.Model):
     '''
     Abstract Django Model that adds a `modified` field to all Models, allowing for smart caching at the client side. 
+
+    Models that are only exposed nested inside another one set `sync_parent` to the name of the foreign key to it,
+    so that their changes and deletions mark the parent as modified instead of being recorded on their own.
     '''
-    modified = models.DateTimeField(auto_now=True)
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+    sync_parent = None
 
     class Meta:
         abstract = True
@@ -24,6 +30,62 @@ state_code_to_name = {
 }
 
 
+class EPSAForeignKey(models.ForeignKey):
+    '''
+    Llave foránea a `EPSA` guardada en la columna `epsa` con la sigla de la EPSA, indexada y sin restricción en la base de datos.
+
+    No se valida que la EPSA exista, por lo que los datos de EPSAs aún no registradas se aceptan igual que cuando la columna era
+    una cadena de texto. Para leer o escribir la sigla sin consultar `EPSA` se usa el atributo `epsa_id`.
+    '''
+    def __init__(self, to='performance.EPSA', on_delete=models.DO_NOTHING, **kwargs):
+        kwargs.setdefault('db_column', 'epsa')
+        kwargs.setdefault('db_constraint', False)
+        super().__init__(to, on_delete, **kwargs)
+
+    def validate(self, value, model_instance):
+        super(models.ForeignKey, self).validate(value, model_instance)
+
+    def formfield(self, **kwargs):
+        kwargs.pop('queryset', None)
+        kwargs.pop('to_field_name', None)
+        return models.Field.formfield(self, **{'form_class': EPSACodeFormField, **kwargs})
+
+
+class EPSACodeFormField(forms.CharField):
+    '''
+    Campo de formulario de `EPSAForeignKey`: un cuadro de texto con la sigla de la EPSA. No consulta `EPSA` ni valida que la
+    EPSA exista, igual que `EPSACodeField` de los serializadores.
+    '''
+    def __init__(self, max_length=64, **kwargs):
+        super().__init__(max_length=max_length, **kwargs)
+
+    def prepare_value(self, value):
+        return value.pk if isinstance(value, EPSA) else value
+
+    def clean(self, value):
+        value = super().clean(value)
+        return EPSA(code=value) if value else None
+
+
+class EPSADimensionMixin:
+    '''
+    Agrega las columnas `get_category` y `get_state` (categoría y departamento de la EPSA) a los modelos con un campo `epsa`
+    que contiene el código de la EPSA. Los datos se leen de la dimensión EPSA en memoria, sin consultas por instancia.
+    '''
+    def get_category(self):
+        info = epsa_dimension.get(self.epsa_id)
+        if info and str(info.category) in ['A','B','C','D']:
+            return str(info.category)
+        return ''
+    get_category.short_description = 'categoría'
+    def get_state(self):
+        info = epsa_dimension.get(self.epsa_id)
+        if info and str(info.state) in state_code_to_name.keys():
+            return state_code_to_name[str(info.state)]
+        return ''
+    get_state.short_description = 'departamento'
+
+
 class EPSA(BaseModel):
     '''
     Modelo representando una EPSA (Entidad Prestadora de Servicios de Agua Potable y Saneamiento).
@@ -78,6 +140,10 @@ class EPSA(BaseModel):
         verbose_name = 'EPSA'
         verbose_name_plural = 'EPSAs'
         ordering = ['category', 'code', ]
+        indexes = [
+            models.Index(fields=['category', 'code']),
+            models.Index(fields=['state']),
+        ]
 
     def __str__(self):
         return self.code
@@ -134,6 +200,7 @@ class Variable(BaseModel):
         verbose_name = 'Variable'
         verbose_name_plural = 'Variables'
         ordering = ['var_id',]
+        indexes = [models.Index(fields=['var_type'])]
     def __str__(self):
         return self.code
 
@@ -197,6 +264,7 @@ class Indicator(BaseModel):
         verbose_name = 'Indicador'
         verbose_name_plural = 'Indicadores'
         ordering = ['ind_id',]
+        indexes = [models.Index(fields=['criteria'])]
     def __str__(self):
         return self.code
 
@@ -211,12 +279,12 @@ for m, m0 in zip(['min', 'max'], ['mínimo', 'máximo']):
             )
         )
 
-class VariableReport(BaseModel):
+class VariableReport(EPSADimensionMixin, BaseModel):
     '''
     Modelo representando un reporte mensual, semestral o anual completo de variables.
     '''
-    epsa = models.CharField(
-        max_length=64,
+    epsa = EPSAForeignKey(
+        related_name='reports',
         verbose_name='EPSA',
         help_text='EPSA que reporta las variables',
         blank=True, null=True,
@@ -238,26 +306,11 @@ class VariableReport(BaseModel):
         unique_together=('epsa','year','month')
         verbose_name = 'Reporte de variables'
         verbose_name_plural = 'Reportes de variables'
-        ordering = ['epsa', 'year','month']
+        ordering = ['epsa_id', 'year','month']
+        indexes = [models.Index(fields=['year', 'month'])]
     def __str__(self):
         m = '-' + str(self.month) if self.month else ''
-        return f'{str(self.epsa)}-{str(self.year)}{m}'
-    def get_category(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            cat = rel_epsa[0].category
-            if str(cat) in ['A','B','C','D']:
-                return str(cat)
-        return ''
-    get_category.short_description = 'categoría'
-    def get_state(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            state_code = str(rel_epsa[0].state)
-            if state_code in state_code_to_name.keys():
-                return state_code_to_name[state_code]
-        return ''
-    get_state.short_description = 'departamento'
+        return f'{str(self.epsa_id)}-{str(self.year)}{m}'
 
 VARIABLE_TYPE_CHOICES = (
     ('VA', 'valor'),
@@ -354,12 +407,12 @@ for i, var_vname, var_htext in zip(range(51), VAR_VNAMES, VAR_HTEXTS):
     )
 
 
-class IndicatorMeasurement(BaseModel):
+class IndicatorMeasurement(EPSADimensionMixin, BaseModel):
     '''
     Modelo Representando la medida de un Indicador en base a un reporte mensual, semestral o anual.
     '''
-    epsa = models.CharField(
-        max_length=64,
+    epsa = EPSAForeignKey(
+        related_name='measurements',
         verbose_name='EPSA',
         help_text='EPSA que reporta las variables',
         blank=True, null=True,
@@ -381,25 +434,10 @@ class IndicatorMeasurement(BaseModel):
         unique_together = ('epsa','year','month',)
         verbose_name = 'Medida de indicadores'
         verbose_name_plural = 'Medidas de indicadores'
-        ordering = ['epsa', 'year','month']
+        ordering = ['epsa_id', 'year','month']
+        indexes = [models.Index(fields=['year', 'month'])]
     def __str__(self):
-        return f'{self.epsa}-{self.year}'
-    def get_category(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            cat = rel_epsa[0].category
-            if str(cat) in ['A','B','C','D']:
-                return str(cat)
-        return ''
-    get_category.short_description = 'categoría'
-    def get_state(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            state_code = str(rel_epsa[0].state)
-            if state_code in state_code_to_name.keys():
-                return state_code_to_name[state_code]
-        return ''
-    get_state.short_description = 'departamento'
+        return f'{self.epsa_id}-{self.year}'
 
 INDICATOR_NAMES = ['Rendimiento actual de la fuente', 'Uso eficiente del recurso', 'Cobertura de muestras de agua potable', 'Conformidad de los análisis de agua potable realizados', 'Dotación', 'Continuidad por racionamiento', 'Continuidad por corte', 'Cobertura del servicio de agua potable', 'Cobertura del servicio de alcantarillado sanitario', 'Cobertura de micromedición', 'Incidencia extracción de agua cruda subterránea ', 'Índice de tratamiento de agua residual', 'Control de agua residual', 'Capacidad instalada de planta de tratamiento de agua potable', 'Capacidad instalada de planta de tratamiento de agua residual ',
                    'Presión del servicio de agua potable', 'Índice de agua no contabilizada en producción', 'Índice de agua no contabilizada en la red', 'Densidad de fallas en tuberías de agua potable', 'Densidad de fallas en conexiones de agua potable', 'Densidad de fallas en tuberías de agua residual', 'Densidad de fallas en conexiones de agua residual', 'Índice de operación eficiente', 'Prueba ácida', 'Eficiencia de recaudación', 'Índice de endeudamiento total', 'Tarifa media', 'Costo unitario de operación', 'Índice de ejecución de inversiones', 'Personal calificado', 'Número de empleados por cada 1000 conexiones', 'Atención de reclamos']
@@ -416,3 +454,100 @@ for i, ind_name, ind_unit in zip(range(32), INDICATOR_NAMES, INDICATOR_UNITS):
     )
 
 
+
+
+class VariableReportChange(models.Model):
+    '''
+    Registro de las variables modificadas en un reporte de variables, utilizado para recalcular sólo los indicadores afectados.
+    '''
+    epsa = models.CharField(max_length=64, blank=True, null=True, verbose_name='EPSA')
+    year = models.IntegerField(verbose_name='año')
+    month = models.IntegerField(blank=True, null=True, verbose_name='mes')
+    variables = models.CharField(
+        max_length=255,
+        verbose_name='variables',
+        help_text='Números de las variables modificadas separados por comas, o "*" si no se conocen.'
+    )
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Cambio de reporte de variables'
+        verbose_name_plural = 'Cambios de reportes de variables'
+        ordering = ['created']
+
+    def __str__(self):
+        return f'{self.epsa}-{self.year}-{self.month}: {self.variables}'
+
+
+class Tombstone(models.Model):
+    '''
+    Registro de una instancia eliminada de un modelo con fecha de modificación, utilizado para la sincronización por diferencias.
+    '''
+    model = models.CharField(max_length=100, verbose_name='modelo', help_text='Etiqueta del modelo, por ejemplo "performance.variablereport".')
+    object_id = models.CharField(max_length=64, verbose_name='id', help_text='Llave primaria de la instancia eliminada.')
+    deleted = models.DateTimeField(auto_now_add=True, verbose_name='eliminado')
+
+    class Meta:
+        verbose_name = 'Instancia eliminada'
+        verbose_name_plural = 'Instancias eliminadas'
+        ordering = ['deleted']
+        index_together = ('model', 'deleted')
+
+    def __str__(self):
+        return f'{self.model}:{self.object_id}'
+
+
+class Rollup(models.Model):
+    '''
+    Modelo abstracto de un agregado por EPSA a nivel mensual, semestral o anual, mantenido a partir de los reportes del periodo.
+    '''
+    GRAIN_CHOICES = (
+        ('month', 'Mensual'),
+        ('semester', 'Semestral'),
+        ('year', 'Anual'),
+    )
+    epsa = models.CharField(max_length=64, blank=True, null=True, verbose_name='EPSA')
+    grain = models.CharField(max_length=8, choices=GRAIN_CHOICES, verbose_name='nivel')
+    year = models.IntegerField(verbose_name='año')
+    period = models.IntegerField(
+        verbose_name='periodo',
+        help_text='Mes (1-12) o semestre (1-2) del agregado, o 0 si el agregado es anual.'
+    )
+    reports = models.IntegerField(verbose_name='reportes', help_text='Cantidad de reportes agregados.')
+
+    class Meta:
+        abstract = True
+        unique_together = ('epsa', 'grain', 'year', 'period')
+        ordering = ['epsa', 'grain', 'year', 'period']
+        indexes = [models.Index(fields=['grain', 'year'])]
+
+    def __str__(self):
+        return f'{self.epsa}-{self.grain}-{self.year}-{self.period}'
+
+class VariableReportRollup(Rollup):
+    '''
+    Sumas de las variables `v1`...`v51` de los reportes de una EPSA por mes, semestre o año.
+    '''
+    class Meta(Rollup.Meta):
+        verbose_name = 'Agregado de reportes de variables'
+        verbose_name_plural = 'Agregados de reportes de variables'
+
+for i in range(51):
+    VariableReportRollup.add_to_class(
+        f'v{i+1}',
+        models.FloatField(verbose_name=f'variable {i+1}', blank=True, null=True)
+    )
+
+class IndicatorMeasurementRollup(Rollup):
+    '''
+    Promedios de los indicadores `ind1`...`ind32` de las medidas de una EPSA por mes, semestre o año.
+    '''
+    class Meta(Rollup.Meta):
+        verbose_name = 'Agregado de medidas de indicadores'
+        verbose_name_plural = 'Agregados de medidas de indicadores'
+
+for i in range(32):
+    IndicatorMeasurementRollup.add_to_class(
+        f'ind{i+1}',
+        models.FloatField(verbose_name=f'indicador {i+1}', blank=True, null=True)
+    )
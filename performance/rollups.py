@@ -0,0 +1,100 @@
+'''
+Mantenimiento de los agregados mensuales, semestrales y anuales de reportes de variables (sumas) y medidas de indicadores (promedios).
+
+Los agregados de una EPSA y año se recalculan a partir de los reportes de ese año cada vez que alguno de ellos cambia.
+El nivel mensual corresponde a los reportes con mes y el semestral a la agregación de los meses 1-6 y 7-12.
+El nivel anual corresponde al reporte anual (sin mes) si existe y, si no, a la agregación de los reportes mensuales.
+'''
+from collections import defaultdict
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+from performance.models import VariableReport, IndicatorMeasurement, VariableReportRollup, IndicatorMeasurementRollup
+
+MISSING_TYPES = ('NC', 'NR')
+
+class RollupSpec:
+    def __init__(self, model, rollup_model, fields, reduce, type_fields=()):
+        self.model = model
+        self.rollup_model = rollup_model
+        self.fields = fields
+        self.reduce = reduce
+        self.type_fields = type_fields
+
+def _nansum(values):
+    return np.where(np.isnan(values).all(axis=0), np.nan, np.nansum(values, axis=0))
+
+def _nanmean(values):
+    counts = (~np.isnan(values)).sum(axis=0)
+    return np.where(counts == 0, np.nan, np.nansum(values, axis=0) / np.maximum(counts, 1))
+
+SPECS = {
+    VariableReport: RollupSpec(
+        VariableReport, VariableReportRollup,
+        [f'v{i+1}' for i in range(51)], _nansum,
+        type_fields=[f'v{i+1}_type' for i in range(51)],
+    ),
+    IndicatorMeasurement: RollupSpec(
+        IndicatorMeasurement, IndicatorMeasurementRollup,
+        [f'ind{i+1}' for i in range(32)], _nanmean,
+    ),
+}
+
+def _epsa_filter(epsas):
+    condition = Q(epsa__in=[epsa for epsa in epsas if epsa is not None])
+    if None in epsas:
+        condition |= Q(epsa__isnull=True)
+    return condition
+
+def _buckets(month):
+    if month is None:
+        return []
+    return [('month', month), ('semester', 1 if month <= 6 else 2)]
+
+def refresh_rollups(model, keys):
+    '''
+    Recalcula los agregados del modelo dado (`VariableReport` o `IndicatorMeasurement`) para las llaves (epsa, año) dadas.
+    '''
+    spec = SPECS[model]
+    keys = set(keys)
+    if not keys:
+        return
+    epsas = {epsa for epsa, year in keys}
+    years = {year for epsa, year in keys}
+    qs = spec.model.objects.filter(_epsa_filter(epsas), year__in=years)
+    rows = [row for row in qs.values_list('epsa', 'year', 'month', *spec.fields, *spec.type_fields) if row[:2] in keys]
+
+    groups = defaultdict(list)
+    annual = {}
+    count = len(spec.fields)
+    for row in rows:
+        values = np.array(row[3:3 + count], dtype=float)
+        if spec.type_fields:
+            values[np.isin(np.array(row[3 + count:], dtype=object), MISSING_TYPES)] = np.nan
+        epsa, year, month = row[:3]
+        if month is None:
+            annual[(epsa, year)] = values
+        for grain, period in _buckets(month):
+            groups[(epsa, grain, year, period)].append(values)
+        if month is not None:
+            groups[(epsa, 'year', year, 0)].append(values)
+    for (epsa, year), values in annual.items():
+        groups[(epsa, 'year', year, 0)] = [values]
+
+    rollups = []
+    for (epsa, grain, year, period), values in groups.items():
+        result = spec.reduce(np.vstack(values)).tolist()
+        props = {field: (None if value != value else value) for field, value in zip(spec.fields, result)}
+        rollups.append(spec.rollup_model(epsa=epsa, grain=grain, year=year, period=period, reports=len(values), **props))
+
+    with transaction.atomic():
+        stale = spec.rollup_model.objects.filter(_epsa_filter(epsas), year__in=years)
+        stale_ids = [pk for pk, epsa, year in stale.values_list('pk', 'epsa', 'year') if (epsa, year) in keys]
+        spec.rollup_model.objects.filter(pk__in=stale_ids).delete()
+        spec.rollup_model.objects.bulk_create(rollups)
+
+def rebuild_rollups(model):
+    '''
+    Recalcula todos los agregados del modelo dado.
+    '''
+    refresh_rollups(model, set(model.objects.values_list('epsa', 'year').distinct()))
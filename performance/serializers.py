@@ -1,10 +1,16 @@
 from rest_framework import serializers
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.fields import SkipField
 from rest_framework.relations import PKOnlyObject
 from drf_queryfields import QueryFieldsMixin
-from performance.models import EPSA, Variable, Indicator, VariableReport, IndicatorMeasurement
+from performance.models import EPSA, EPSAForeignKey, Variable, Indicator, VariableReport, IndicatorMeasurement
+from performance.signals import post_bulk_write
 
 class CustomModelSerializer(QueryFieldsMixin,serializers.ModelSerializer):
+    skip_empty_fields = True
     def to_representation(self,instance):
         fields = self._readable_fields
         ret = OrderedDict()
@@ -22,6 +28,30 @@ class CustomModelSerializer(QueryFieldsMixin,serializers.ModelSerializer):
                 ret[field.field_name] = field.to_representation(attribute)
         return ret
 
+class EPSACodeField(serializers.CharField):
+    '''
+    Campo de las llaves foráneas a `EPSA` (`EPSAForeignKey`), leído y escrito como la sigla de la EPSA, igual que cuando
+    la columna era una cadena de texto. No consulta `EPSA` ni valida que la EPSA exista.
+    '''
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_length', 64)
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return instance.serializable_value(self.source)
+
+    def run_validation(self, data=serializers.empty):
+        value = super().run_validation(data)
+        return value if value is None else EPSA(code=value)
+
+def instance_kwargs(model, props):
+    '''
+    Traduce los nombres de las llaves foráneas de `props` a sus columnas (por ejemplo `epsa` -> `epsa_id`),
+    para construir instancias de `model` a partir de los valores recibidos sin consultar los modelos relacionados.
+    '''
+    attnames = {f.name: f.attname for f in model._meta.concrete_fields}
+    return {attnames.get(name, name): value for name, value in props.items()}
+
 class CustomListModelSerializer(serializers.ListSerializer):
     def is_valid(self,raise_exception=False):
         if not hasattr(self, '_validated_data'):
@@ -29,27 +59,162 @@ class CustomListModelSerializer(serializers.ListSerializer):
             self._errors = {}
         return True
 
-def bulk_create_or_update(model,data,unique_together=[]):
-    ret = []
-    for props in data:
+    def bulk_create_or_update(self, model, validated_data, unique_together):
+        return bulk_create_or_update(model, validated_data, unique_together, unknown_epsa=unknown_epsa_mode(self.context.get('request')))
+
+def _chunks(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+def _existing_pks(model, unique_together, keys, batch_size):
+    '''
+    Resuelve en pocas consultas las llaves `unique_together` que ya existen en la base de datos.
+    Retorna un diccionario {llave: [pk, ...]} con todas las instancias de cada llave, ya que las llaves con valores nulos
+    (por ejemplo, `month` en los reportes anuales) pueden repetirse.
+    '''
+    existing = defaultdict(list)
+    for chunk in _chunks(list(keys), batch_size):
+        condition = Q()
+        for i, key_prop in enumerate(unique_together):
+            values = {key[i] for key in chunk}
+            key_condition = Q(**{f'{key_prop}__in': [v for v in values if v is not None]})
+            if None in values:
+                key_condition |= Q(**{f'{key_prop}__isnull': True})
+            condition &= key_condition
+        for row in model.objects.filter(condition).values_list('pk', *unique_together):
+            existing[tuple(row[1:])].append(row[0])
+    return dict(existing)
+
+UNKNOWN_EPSA_MODES = ('flag', 'reject', 'create')
+
+def unknown_epsa_mode(request):
+    '''
+    Lee el parámetro `unknown_epsa` del pedido (`flag` por defecto), que indica qué hacer con los objetos de siglas de EPSA no registradas.
+    '''
+    mode = request.query_params.get('unknown_epsa', 'flag') if request is not None else 'flag'
+    if mode not in UNKNOWN_EPSA_MODES:
+        raise serializers.ValidationError({'unknown_epsa': f'Valores permitidos: {", ".join(UNKNOWN_EPSA_MODES)}.'})
+    return mode
+
+def check_epsa_codes(data, mode, batch_size=500):
+    '''
+    Verifica que las siglas `epsa` de los objetos de `data` estén registradas, consultando `EPSA` una sola vez por cada
+    `batch_size` siglas distintas.
+
+    Retorna las siglas desconocidas y un diccionario {posición: motivo} con los objetos que las usan. Con `mode` igual a
+    `reject` el motivo es un error (`epsa_desconocida`) y los objetos deben ser ignorados; con `flag` y `create` es una
+    advertencia y los objetos se guardan igual.
+    '''
+    codes = {str(props['epsa']) for props in data if isinstance(props, dict) and props.get('epsa') not in (None, '')}
+    known = set()
+    for chunk in _chunks(sorted(codes), batch_size):
+        known.update(EPSA.objects.filter(code__in=chunk).values_list('code', flat=True))
+    unknown = codes - known
+    messages = {
+        'flag': ('epsa_desconocida', 'La EPSA {} no está registrada.'),
+        'reject': ('epsa_desconocida', 'La EPSA {} no está registrada. El objeto no fue guardado.'),
+        'create': ('epsa_creada', 'La EPSA {} no estaba registrada y fue creada.'),
+    }
+    reason, message = messages[mode]
+    flagged = {
+        index: {reason: message.format(props['epsa'])}
+        for index, props in enumerate(data)
+        if isinstance(props, dict) and props.get('epsa') not in (None, '') and str(props['epsa']) in unknown
+    }
+    return unknown, flagged
+
+def create_epsas(codes, batch_size=500):
+    '''
+    Registra en masa las EPSAs de las siglas dadas, sin otros datos.
+    '''
+    if not codes:
+        return
+    EPSA.objects.bulk_create([EPSA(code=code) for code in sorted(codes)], batch_size=batch_size, ignore_conflicts=True)
+    post_bulk_write.send(sender=EPSA, created=[{'code': code} for code in sorted(codes)], updated=[])
+
+def bulk_create_or_update(model,data,unique_together=[],batch_size=500,unknown_epsa=None):
+    '''
+    Crea o actualiza en masa las instancias de `model` descritas en `data`, identificándolas por los campos `unique_together`.
+
+    Las llaves existentes se resuelven en lotes y la escritura se realiza con `bulk_create` y `bulk_update` dentro de una sola transacción.
+    Si una llave corresponde a varias instancias (llaves con valores nulos repetidas), todas son actualizadas.
+    Retorna un reporte por objeto (`creado`, `actualizado` o `ignorado`) en el mismo orden de `data`.
+
+    Si `unknown_epsa` es dado y el modelo tiene una llave foránea a `EPSA`, las siglas se verifican en lote con `check_epsa_codes`:
+    los objetos de EPSAs no registradas se guardan con una advertencia (`flag`), se ignoran (`reject`), o las EPSAs se crean en masa (`create`).
+    '''
+    opts = model._meta
+    field_names = {f.name for f in opts.concrete_fields} | {f.attname for f in opts.concrete_fields}
+    key_fields = [opts.get_field(key_prop) for key_prop in unique_together]
+    ret = [None] * len(data)
+    entries = OrderedDict()
+    positions = []
+    unknown_codes, flagged = set(), {}
+    if unknown_epsa is not None and any(isinstance(f, EPSAForeignKey) for f in opts.concrete_fields):
+        unknown_codes, flagged = check_epsa_codes(data, unknown_epsa, batch_size)
+    for index, props in enumerate(data):
+        if unknown_epsa == 'reject' and index in flagged:
+            ret[index] = {'ignorado': flagged[index]}
+            continue
         if not set(unique_together) <= set(props.keys()):
-            ret.append({'ignorado':{'no_identificable':'No se proporcionaron todos los campos necesarios para identificar la instancia de manera única.'}})
+            ret[index] = {'ignorado':{'no_identificable':'No se proporcionaron todos los campos necesarios para identificar la instancia de manera única.'}}
             continue
         key_vals = [props.get(key_prop) for key_prop in unique_together]
         if not any(key_vals):
-            ret.append({'ignorado':{'objeto_en_blanco':'Todas las propiedades clave de este objeto estan en blanco.'}})
+            ret[index] = {'ignorado':{'objeto_en_blanco':'Todas las propiedades clave de este objeto estan en blanco.'}}
+            continue
+        unknown = sorted(set(props.keys()) - field_names)
+        if unknown:
+            ret[index] = {'ignorado':{'campos_desconocidos':f'Los siguientes campos no existen en el modelo: {", ".join(unknown)}.'}}
+            continue
+        try:
+            key = tuple(field.to_python(val) for field, val in zip(key_fields, key_vals))
+        except ValidationError as e:
+            ret[index] = {'ignorado':{'valor_invalido':' '.join(e.messages)}}
             continue
-        qs = model.objects.filter(**{k:v for k,v in zip(unique_together,key_vals)})
-        if qs.count() > 0:
-            qs.update(**props)
-            ret_key = 'actualizado'
+        if key in entries:
+            entries[key].update(props)
         else:
-            e,created = model.objects.get_or_create(**props)
-            if created:
-                ret_key = 'creado'
-            else:
-                ret_key = 'ignorado'
-        ret.append({ret_key: props})
+            entries[key] = dict(props)
+        positions.append((index, key))
+
+    auto_now_fields = [f for f in opts.concrete_fields if getattr(f, 'auto_now', False)]
+    with transaction.atomic():
+        if unknown_epsa == 'create':
+            create_epsas(unknown_codes & {str(props.get('epsa')) for props in entries.values()}, batch_size)
+        existing = _existing_pks(model, unique_together, entries.keys(), batch_size)
+        to_create = []
+        to_update = defaultdict(list)
+        created, updated = [], []
+        for key, props in entries.items():
+            normalized = dict(props, **dict(zip(unique_together, key)))
+            if key not in existing:
+                to_create.append(model(**instance_kwargs(model, props)))
+                created.append(normalized)
+                continue
+            updated.append(normalized)
+            update_fields = {opts.get_field(name).name for name in props} | {f.name for f in auto_now_fields}
+            update_fields.discard(opts.pk.name)
+            if not update_fields:
+                continue
+            for pk in existing[key]:
+                instance = model(**instance_kwargs(model, props))
+                instance.pk = pk
+                for field in auto_now_fields:
+                    field.pre_save(instance, add=False)
+                to_update[tuple(sorted(update_fields))].append(instance)
+        model.objects.bulk_create(to_create, batch_size=batch_size)
+        for update_fields, instances in to_update.items():
+            model.objects.bulk_update(instances, update_fields, batch_size=batch_size)
+        post_bulk_write.send(sender=model, created=created, updated=updated)
+
+    seen = set()
+    for index, key in positions:
+        ret_key = 'actualizado' if key in existing or key in seen else 'creado'
+        ret[index] = {ret_key: data[index]}
+        if index in flagged:
+            ret[index]['advertencias'] = flagged[index]
+        seen.add(key)
     return ret
 
 class EPSAListSerializer(CustomListModelSerializer):
@@ -85,9 +250,9 @@ class IndicatorSerializer(QueryFieldsMixin, serializers.ModelSerializer):
 class VariableReportListSerializer(CustomListModelSerializer):
     def create(self, validated_data):
         unique_together = ['epsa','year','month',]
-        return bulk_create_or_update(VariableReport,validated_data,unique_together)
+        return self.bulk_create_or_update(VariableReport,validated_data,unique_together)
 class VariableReportSerializer(QueryFieldsMixin, serializers.ModelSerializer):
-    # epsa = serializers.CharField(allow_blank=True,required=False)
+    epsa = EPSACodeField(allow_blank=True, allow_null=True, required=False)
     class Meta:
         model = VariableReport
         fields = '__all__'
@@ -106,9 +271,9 @@ class VariableReportSerializer(QueryFieldsMixin, serializers.ModelSerializer):
 class IndicatorMeasurementListSerializer(CustomListModelSerializer):
     def create(self, validated_data):
         unique_together = ['epsa','year','month',]
-        return bulk_create_or_update(IndicatorMeasurement,validated_data,unique_together)
+        return self.bulk_create_or_update(IndicatorMeasurement,validated_data,unique_together)
 class IndicatorMeasurementSerializer(QueryFieldsMixin, serializers.ModelSerializer):
-    # epsa = serializers.CharField(allow_blank=True,required=False)
+    epsa = EPSACodeField(allow_blank=True, allow_null=True, required=False)
     class Meta:
         model = IndicatorMeasurement
         fields = '__all__'
@@ -0,0 +1,82 @@
+import re
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from aapsapi import cache as response_cache
+from performance import rollups
+from performance.snapshot import snapshot
+from performance.dimensions import epsa_dimension
+from performance.models import EPSA, VariableReport, IndicatorMeasurement, VariableReportChange, Tombstone
+
+# Enviada por las rutas de escritura masiva que no disparan `post_save` (`bulk_create`, `UPDATE` por lotes).
+# `created` y `updated` son listas con las propiedades de los objetos creados y actualizados.
+post_bulk_write = Signal(providing_args=['created', 'updated'])
+
+VARIABLE_FIELD = re.compile(r'^v(\d+)(_type)?$')
+
+def changed_variables(props):
+    return ','.join(sorted({m.group(1) for m in map(VARIABLE_FIELD.match, props) if m}, key=int))
+
+@receiver(post_save, sender=VariableReport)
+def record_report_save(sender, instance, **kwargs):
+    VariableReportChange.objects.create(epsa=instance.epsa_id, year=instance.year, month=instance.month, variables='*')
+
+@receiver(post_delete, sender=VariableReport)
+def discard_report_snapshot(sender, instance, **kwargs):
+    snapshot.discard(instance.pk)
+
+@receiver(post_bulk_write, sender=VariableReport)
+def record_report_bulk_write(sender, created=(), updated=(), **kwargs):
+    changes = [VariableReportChange(epsa=props.get('epsa'), year=props.get('year'), month=props.get('month'), variables='*') for props in created]
+    changes += [
+        VariableReportChange(epsa=props.get('epsa'), year=props.get('year'), month=props.get('month'), variables=changed_variables(props))
+        for props in updated
+    ]
+    VariableReportChange.objects.bulk_create(changes)
+
+@receiver(post_save, sender=EPSA)
+@receiver(post_delete, sender=EPSA)
+@receiver(post_bulk_write, sender=EPSA)
+def invalidate_epsa_dimension(sender, **kwargs):
+    epsa_dimension.invalidate()
+    transaction.on_commit(epsa_dimension.invalidate)
+
+@receiver(pre_save, sender=VariableReport)
+@receiver(pre_save, sender=IndicatorMeasurement)
+def capture_rollup_key(sender, instance, raw=False, **kwargs):
+    # La EPSA y el año guardados antes de la edición, para actualizar también los agregados del periodo anterior.
+    if raw or instance.pk is None:
+        instance._rollup_key = None
+        return
+    instance._rollup_key = sender.objects.filter(pk=instance.pk).values_list('epsa', 'year').first()
+
+@receiver(post_save, sender=VariableReport)
+@receiver(post_delete, sender=VariableReport)
+@receiver(post_save, sender=IndicatorMeasurement)
+@receiver(post_delete, sender=IndicatorMeasurement)
+def refresh_rollups(sender, instance, **kwargs):
+    keys = {(instance.epsa_id, instance.year)}
+    previous = getattr(instance, '_rollup_key', None)
+    if previous is not None:
+        keys.add(previous)
+    rollups.refresh_rollups(sender, keys)
+
+@receiver(post_bulk_write, sender=VariableReport)
+@receiver(post_bulk_write, sender=IndicatorMeasurement)
+def refresh_rollups_bulk(sender, created=(), updated=(), **kwargs):
+    rollups.refresh_rollups(sender, {(props.get('epsa'), props.get('year')) for props in list(created) + list(updated)})
+
+# `touch_sync_parent` y `record_tombstone` se conectan en `PerformanceConfig.ready` para cada subclase de `BaseModel`. Un
+# receptor de `post_delete` sin `sender` impediría el borrado rápido (sin cargar los objetos) de todos los modelos.
+def touch_sync_parent(sender, instance, **kwargs):
+    field = sender._meta.get_field(sender.sync_parent)
+    field.related_model.objects.filter(pk=getattr(instance, field.attname)).update(modified=timezone.now())
+    response_cache.bump(field.related_model)
+
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=str(instance.pk))
+
+# Se conecta en `PerformanceConfig.ready` sólo para los modelos de los que dependen las respuestas guardadas.
+def bump_response_cache(sender, **kwargs):
+    response_cache.bump(sender)
@@ -0,0 +1,180 @@
+'''
+Copia columnar en memoria (por proceso) de los reportes de variables (`VariableReport`) para cálculos analíticos.
+
+Los valores `v1`...`v51` se guardan en una matriz float64, los tipos `v1_type`...`v51_type` en una matriz de códigos uint8
+y la EPSA, año y mes de cada reporte en arreglos índice. La copia se actualiza de manera incremental leyendo sólo los reportes
+cuyo campo `modified` cambió desde la última actualización, y quitando los reportes con registro de eliminación (`Tombstone`)
+posterior a la lectura anterior, incluso si fueron eliminados por otro proceso.
+'''
+import threading
+from datetime import timedelta
+import numpy as np
+from django.utils import timezone
+from aapsapi.mixins import sync_cutoff
+from performance.models import Tombstone, VariableReport, VARIABLE_TYPE_CHOICES
+
+VARIABLE_COUNT = 51
+TYPE_CODES = [code for code, name in VARIABLE_TYPE_CHOICES]
+MISSING_TYPES = ('NC', 'NR')
+# Los reportes modificados poco antes de la última actualización se vuelven a leer, para no perder transacciones confirmadas tarde.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+class ReportSnapshot:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.epsa = np.empty(0, dtype=np.int32)
+        self.year = np.empty(0, dtype=np.int32)
+        self.month = np.empty(0, dtype=np.int8)
+        self.values = np.empty((0, VARIABLE_COUNT), dtype=np.float64)
+        self.types = np.empty((0, VARIABLE_COUNT), dtype=np.uint8)
+        self.epsa_codes = []
+        self._epsa_index = {}
+        self._rows = {}
+        self._deleted = set()
+        self.watermark = None
+        self.deleted_watermark = None
+
+    def _epsa_code_index(self, code):
+        if code not in self._epsa_index:
+            self._epsa_index[code] = len(self.epsa_codes)
+            self.epsa_codes.append(code)
+        return self._epsa_index[code]
+
+    def discard(self, report_id):
+        '''
+        Marca un reporte eliminado para quitarlo en la próxima actualización.
+        '''
+        with self.lock:
+            self._deleted.add(report_id)
+
+    def _remove_deleted(self):
+        keep = ~np.isin(self.ids, list(self._deleted))
+        for name in ['ids', 'epsa', 'year', 'month', 'values', 'types']:
+            setattr(self, name, getattr(self, name)[keep])
+        self._rows = {report_id: i for i, report_id in enumerate(self.ids.tolist())}
+        self._deleted = set()
+
+    def _read_tombstones(self):
+        '''
+        Marca para quitar los reportes eliminados desde la lectura anterior, según los registros `Tombstone`.
+        '''
+        start = timezone.now()
+        tombstones = Tombstone.objects.filter(
+            model=VariableReport._meta.label_lower,
+            deleted__gte=self.deleted_watermark - REFRESH_OVERLAP,
+        )
+        self._deleted.update(int(object_id) for object_id in tombstones.values_list('object_id', flat=True))
+        self.deleted_watermark = start
+
+    def refresh(self):
+        '''
+        Quita los reportes eliminados e incorpora los reportes creados o modificados desde la última actualización.
+        '''
+        value_fields = [f'v{i+1}' for i in range(VARIABLE_COUNT)]
+        type_fields = [f'v{i+1}_type' for i in range(VARIABLE_COUNT)]
+        with self.lock:
+            if self.deleted_watermark is not None and self.deleted_watermark < sync_cutoff():
+                # Los registros de eliminación desde la última actualización pueden haber sido borrados: se recarga la copia.
+                self.clear()
+            if self.deleted_watermark is None:
+                self.deleted_watermark = timezone.now()
+            else:
+                self._read_tombstones()
+            if self._deleted:
+                self._remove_deleted()
+            qs = VariableReport.objects.all()
+            if self.watermark is not None:
+                qs = qs.filter(modified__gte=self.watermark - REFRESH_OVERLAP)
+            rows = list(qs.values_list('id', 'modified', 'epsa', 'year', 'month', *value_fields, *type_fields))
+            if rows:
+                self._apply(rows)
+                latest = max(row[1] for row in rows)
+                self.watermark = latest if self.watermark is None else max(self.watermark, latest)
+
+    def _apply(self, rows):
+        type_index = {code: i for i, code in enumerate(TYPE_CODES)}
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        epsa = np.array([self._epsa_code_index(row[2]) for row in rows], dtype=np.int32)
+        year = np.array([row[3] for row in rows], dtype=np.int32)
+        month = np.array([row[4] or 0 for row in rows], dtype=np.int8)
+        values = np.array([row[5:5 + VARIABLE_COUNT] for row in rows], dtype=np.float64).reshape(len(rows), VARIABLE_COUNT)
+        types = np.array([[type_index.get(t, 0) for t in row[5 + VARIABLE_COUNT:]] for row in rows], dtype=np.uint8).reshape(len(rows), VARIABLE_COUNT)
+
+        positions = np.array([self._rows.get(report_id, -1) for report_id in ids.tolist()], dtype=np.int64)
+        existing = positions >= 0
+        if existing.any():
+            target = positions[existing]
+            self.epsa[target] = epsa[existing]
+            self.year[target] = year[existing]
+            self.month[target] = month[existing]
+            self.values[target] = values[existing]
+            self.types[target] = types[existing]
+        new = ~existing
+        if new.any():
+            start = len(self.ids)
+            self.ids = np.concatenate([self.ids, ids[new]])
+            self.epsa = np.concatenate([self.epsa, epsa[new]])
+            self.year = np.concatenate([self.year, year[new]])
+            self.month = np.concatenate([self.month, month[new]])
+            self.values = np.concatenate([self.values, values[new]])
+            self.types = np.concatenate([self.types, types[new]])
+            for i, report_id in enumerate(ids[new].tolist()):
+                self._rows[report_id] = start + i
+
+    def select(self, epsas=None, years=None, months=None, mask_missing=True):
+        '''
+        Retorna las llaves (epsa, año, mes) y una copia de la matriz de valores de los reportes de las EPSA, años y meses dados
+        (todos por defecto; el mes 0 corresponde a los reportes anuales). Con `mask_missing`, los valores reportados como NC o NR son `nan`.
+        Los valores nulos son siempre `nan`.
+        '''
+        with self.lock:
+            mask = np.ones(len(self.ids), dtype=bool)
+            if epsas is not None:
+                codes = [self._epsa_index[code] for code in epsas if code in self._epsa_index]
+                mask &= np.isin(self.epsa, codes)
+            if years is not None:
+                mask &= np.isin(self.year, list(years))
+            if months is not None:
+                mask &= np.isin(self.month, list(months))
+            values = self.values[mask]
+            if mask_missing:
+                missing = np.isin(self.types[mask], [TYPE_CODES.index(code) for code in MISSING_TYPES])
+                values[missing] = np.nan
+            keys = [
+                (self.epsa_codes[e], y, m or None)
+                for e, y, m in zip(self.epsa[mask].tolist(), self.year[mask].tolist(), self.month[mask].tolist())
+            ]
+        return keys, values
+
+def group_aggregate(groups, count, values, aggs):
+    '''
+    Agrega las columnas de `values` por grupo como lo haría la base de datos, ignorando los valores nulos (`nan`).
+    `groups` es el índice de grupo (0...`count`-1) de cada fila. Retorna un diccionario {función: matriz grupos x columnas}
+    para las funciones `sum`, `mean`, `count`, `min` y `max` pedidas en `aggs`; los grupos sin valores son `nan` (salvo en `count`).
+    '''
+    present = ~np.isnan(values)
+    counts = np.zeros((count, values.shape[1]))
+    np.add.at(counts, groups, present)
+    sums = np.zeros((count, values.shape[1]))
+    np.add.at(sums, groups, np.where(present, values, 0))
+    empty = counts == 0
+    result = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if 'sum' in aggs:
+            result['sum'] = np.where(empty, np.nan, sums)
+        if 'mean' in aggs:
+            result['mean'] = np.where(empty, np.nan, sums / counts)
+    if 'count' in aggs:
+        result['count'] = counts.astype(np.int64)
+    for agg, reduce, start in [('min', np.minimum, np.inf), ('max', np.maximum, -np.inf)]:
+        if agg in aggs:
+            extreme = np.full((count, values.shape[1]), start)
+            reduce.at(extreme, groups, np.where(present, values, start))
+            result[agg] = np.where(empty, np.nan, extreme)
+    return result
+
+snapshot = ReportSnapshot()
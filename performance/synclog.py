@@ -0,0 +1,34 @@
+'''
+Retención de los registros de sincronización: eliminaciones (`Tombstone`) y cambios de reportes de variables
+(`VariableReportChange`) anteriores a `SYNC_LOG_RETENTION_DAYS` días.
+'''
+from collections import defaultdict
+from django.db import transaction
+from aapsapi.mixins import sync_cutoff
+from performance.models import Tombstone, VariableReportChange
+
+def purge(cutoff=None):
+    '''
+    Elimina los registros de eliminaciones anteriores a `cutoff` (por defecto, el inicio del periodo de retención) y compacta
+    los cambios de reportes anteriores en un solo cambio por reporte, para no perder los que aún no fueron procesados por el
+    cálculo incremental de indicadores. Retorna la cantidad de eliminaciones borradas y de cambios compactados.
+    '''
+    cutoff = cutoff or sync_cutoff()
+    with transaction.atomic():
+        tombstones, _ = Tombstone.objects.filter(deleted__lt=cutoff).delete()
+        old = VariableReportChange.objects.filter(created__lt=cutoff)
+        changed = defaultdict(set)
+        count = 0
+        for epsa, year, month, variables in old.values_list('epsa', 'year', 'month', 'variables'):
+            changed[(epsa, year, month)].update(variables.split(','))
+            count += 1
+        if len(changed) < count:
+            old.delete()
+            VariableReportChange.objects.bulk_create([
+                VariableReportChange(
+                    epsa=epsa, year=year, month=month,
+                    variables='*' if '*' in variables else ','.join(sorted(filter(None, variables), key=int)),
+                )
+                for (epsa, year, month), variables in changed.items()
+            ])
+    return tombstones, count - len(changed)
@@ -1,3 +1,579 @@
+import csv
+import io
+from datetime import timedelta
+from unittest import mock, skipIf
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from aapsapi.mixins import ResponseCacheMixin
+from aapsapi.testing import QueryBudgetMixin, QueryPlanMixin, UnknownEPSAMixin, shared_cache
+from performance import compliance, indicators, synclog, views
+from performance.models import EPSA, Variable, Indicator, VariableReport, IndicatorMeasurement, VariableReportRollup, VariableReportChange, Tombstone
+from performance.serializers import _existing_pks, bulk_create_or_update, check_epsa_codes
+from performance.snapshot import snapshot
 
-# Create your tests here.
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+EPSAS = [f'EPSA{i}' for i in range(40)]
+# Presupuesto de consultas de las listas del admin: sesión, usuario, EPSAs del filtro `epsa`, conteos total y filtrado, filas
+# (con la categoría y el departamento anotados), valores de los filtros `year` (y `month`) y menú de `jet` (2 consultas).
+ADMIN_CHANGELIST_BUDGETS = {'variablereport': 9, 'indicatormeasurement': 10}
+YEARS = range(2010, 2020)
+
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    '''
+    Verifica que las consultas principales de cada punto de acceso, de los filtros del admin y de las cargas masivas usan índices.
+    '''
+    view_filters = [
+        (views.EPSAViewSet, {'code': 'EPSA1'}),
+        (views.EPSAViewSet, {'state': 'LP'}),
+        (views.EPSAViewSet, {'category': 'A'}),
+        (views.VariableViewSet, {'var_id': 5}),
+        (views.IndicatorViewSet, {'ind_id': 5}),
+        *[
+            (viewset, params)
+            for viewset in [views.VariableReportViewSet, views.IndicatorMeasurementViewSet]
+            for params in [{'epsa': 'EPSA1'}, {'year': 2017}, {'year': 2017, 'month': 6}, {'epsa': 'EPSA1', 'year': 2017, 'month': 6}]
+        ],
+        *[
+            (viewset, {'modified_since': timezone.now().isoformat()})
+            for viewset in [views.EPSAViewSet, views.VariableReportViewSet, views.IndicatorMeasurementViewSet]
+        ],
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        states = [code for code, name in EPSA.STATE_CHOICES]
+        categories = [code for code, name in EPSA.CATEGORY_CHOICES]
+        types = [code for code, name in Variable.TYPE_CHOICES]
+        criteria = [code for code, name in Indicator.CRITERIA_TYPES]
+        EPSA.objects.bulk_create([
+            EPSA(code=code, state=states[i % len(states)], category=categories[i % len(categories)])
+            for i, code in enumerate(EPSAS)
+        ])
+        Variable.objects.bulk_create([Variable(code=f'V{i}', var_id=i, var_type=types[i % len(types)]) for i in range(1, 52)])
+        Indicator.objects.bulk_create([Indicator(code=f'I{i}', ind_id=i, criteria=criteria[i % len(criteria)]) for i in range(1, 33)])
+        for model in [VariableReport, IndicatorMeasurement]:
+            model.objects.bulk_create([
+                model(epsa_id=epsa, year=year, month=month)
+                for epsa in EPSAS for year in YEARS for month in [None, 1, 6, 12]
+            ])
+        cls.analyze()
+
+    def test_variable_and_indicator_filters(self):
+        self.assertUsesIndex(Variable.objects.filter(var_type=Variable.TYPE_CHOICES[0][0]))
+        self.assertUsesIndex(Indicator.objects.filter(criteria=Indicator.CRITERIA_TYPES[0][0]))
+
+    def test_epsa_join_filters(self):
+        for model in [VariableReport, IndicatorMeasurement]:
+            self.assertUsesIndex(model.objects.filter(epsa__state='SC'))
+            self.assertUsesIndex(model.objects.filter(epsa__category='A', year=2017))
+
+    def test_tombstones(self):
+        self.assertUsesIndex(Tombstone.objects.filter(model='performance.variablereport', deleted__gte=timezone.now()))
+
+    def test_rollup_series(self):
+        self.assertUsesIndex(VariableReportRollup.objects.filter(grain='year', year__in=[2016, 2017]))
+        self.assertUsesIndex(VariableReportRollup.objects.filter(grain='year', epsa__in=['EPSA1']))
+
+    def test_bulk_upsert_lookup(self):
+        keys = [(epsa, 2017, 6) for epsa in EPSAS[:5]]
+        with self.assertNumQueries(1):
+            existing = _existing_pks(VariableReport, ['epsa', 'year', 'month'], keys, 500)
+        self.assertEqual(set(existing), set(keys))
+        queryset = VariableReport.objects.filter(epsa__in=EPSAS[:5], year__in=[2017], month__in=[6])
+        self.assertUsesIndex(queryset)
+
+    def test_bulk_epsa_check(self):
+        self.assertUsesIndex(EPSA.objects.filter(code__in=EPSAS[:5]))
+
+
+class IncrementalIndicatorTests(TestCase):
+    '''
+    Verifica que el cálculo incremental de indicadores sigue el registro de cambios de los reportes de variables.
+    '''
+    def setUp(self):
+        snapshot.clear()
+
+    def update_report(self, **props):
+        bulk_create_or_update(VariableReport, [dict(epsa='AAPOS', year=2017, month=None, **props)], indicators.KEY_FIELDS)
+
+    def test_recomputes_changed_reports(self):
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=None, v11=5, v12=10)
+        self.assertEqual(indicators.compute_indicators_incremental()['creado'], 1)
+        self.assertEqual(IndicatorMeasurement.objects.get().ind3, 50)
+        self.assertFalse(VariableReportChange.objects.exists())
+        self.assertEqual(indicators.compute_indicators_incremental(), {'creado': 0, 'actualizado': 0, 'ignorado': 0})
+
+        # Editar la medida a mano no oculta un cambio pendiente del reporte.
+        self.update_report(v11=8)
+        IndicatorMeasurement.objects.get().save()
+        self.assertEqual(indicators.compute_indicators_incremental()['actualizado'], 1)
+        self.assertEqual(IndicatorMeasurement.objects.get().ind3, 80)
+
+    def test_changes_during_compute_stay_pending(self):
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=None, v11=5, v12=10)
+        load_reports = indicators.load_reports
+
+        def load_and_edit(*args):
+            ret = load_reports(*args)
+            self.update_report(v11=9)
+            return ret
+
+        with mock.patch.object(indicators, 'load_reports', load_and_edit):
+            indicators.compute_indicators_incremental()
+        self.assertEqual(IndicatorMeasurement.objects.get().ind3, 50)
+        self.assertEqual(list(VariableReportChange.objects.values_list('variables', flat=True)), ['11'])
+        indicators.compute_indicators_incremental()
+        self.assertEqual(IndicatorMeasurement.objects.get().ind3, 90)
+
+    def test_filters(self):
+        for epsa, year in [('AAPOS', 2017), ('AAPOS', 2018), ('EPSAS', 2017)]:
+            VariableReport.objects.create(epsa_id=epsa, year=year, month=None, v11=5, v12=10)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        response = client.post('/api/measurements/compute/?incremental=true&epsa=AAPOS&year=2017')
+        self.assertEqual(response.data['creado'], 1)
+        self.assertEqual(list(IndicatorMeasurement.objects.values_list('epsa', 'year')), [('AAPOS', 2017)])
+        call_command('compute_indicators', '--incremental', '--epsa=AAPOS', stdout=io.StringIO())
+        self.assertEqual(sorted(IndicatorMeasurement.objects.values_list('epsa', 'year')), [('AAPOS', 2017), ('AAPOS', 2018)])
+        self.assertEqual(list(VariableReportChange.objects.values_list('epsa', 'year')), [('EPSAS', 2017)])
+
+
+class UploadTests(TestCase):
+    '''
+    Verifica el ingreso masivo de reportes de variables por `/api/reports/upload/`.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        EPSA.objects.create(code='EPSAS', state='LP', category='A')
+
+    def setUp(self):
+        snapshot.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, body, content_type='text/csv', **params):
+        return self.client.post('/api/reports/upload/', body, content_type=content_type, QUERY_STRING='&'.join(f'{k}={v}' for k, v in params.items()))
+
+    def test_invalid_values_are_reported(self):
+        response = self.upload('epsa,year,month,v1\nEPSAS,2017,1,10.5\nEPSAS,2018,1,abc\nEPSAS,,2,1\nEPSAS,2018,2,3\n')
+        self.assertEqual(response.status_code, 200)
+        [block] = response.json()
+        self.assertEqual((block['creado'], block['actualizado'], block['ignorado']), (2, 0, 2))
+        self.assertEqual([e['linea'] for e in block['errores']], [3, 4])
+        self.assertTrue(block['errores'][0]['error']['valor_invalido'].startswith('v1:'))
+        self.assertTrue(block['errores'][1]['error']['valor_invalido'].startswith('year:'))
+        self.assertEqual(sorted(VariableReport.objects.values_list('year', 'month', 'v1')), [(2017, 1, 10.5), (2018, 2, 3.0)])
+
+    def test_excel_csv_with_ids(self):
+        existing = VariableReport.objects.create(epsa_id='EPSAS', year=2016, month=1, v1=1)
+        body = f'\ufeffid,epsa,year,month,v1\n{existing.pk},EPSAS,2017,1,2\n{existing.pk},EPSAS,2016,1,3\n'.encode('utf-8')
+        response = self.upload(body)
+        self.assertEqual(response.status_code, 200)
+        [block] = response.json()
+        self.assertEqual((block['creado'], block['actualizado'], block['ignorado']), (1, 1, 0))
+        self.assertEqual(sorted(VariableReport.objects.values_list('year', 'v1')), [(2016, 3.0), (2017, 2.0)])
+        self.assertEqual(VariableReport.objects.get(year=2016).pk, existing.pk)
+
+
+class ReportSnapshotTests(TestCase):
+    '''
+    Verifica la copia en memoria de los reportes de variables y la agregación calculada sobre ella.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        EPSA.objects.create(code='AAPOS', state='PO', category='A')
+        EPSA.objects.create(code='EPSAS', state='LP', category='A')
+        EPSA.objects.create(code='SAGUAPAC', state='SC', category='B')
+        VariableReport.objects.bulk_create([
+            VariableReport(epsa_id='AAPOS', year=2017, month=None, v1=10, v2=1),
+            VariableReport(epsa_id='AAPOS', year=2017, month=6, v1=4, v2=None),
+            VariableReport(epsa_id='EPSAS', year=2017, month=None, v1=7, v2=3, v2_type='NC'),
+            VariableReport(epsa_id='SAGUAPAC', year=2018, month=None, v1=None, v2=None),
+            VariableReport(epsa_id='NUEVA', year=2018, month=None, v1=2, v2=5),
+        ])
+
+    def setUp(self):
+        snapshot.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_deletions_of_other_processes(self):
+        snapshot.refresh()
+        report = VariableReport.objects.get(epsa='EPSAS')
+        # Eliminación en otro proceso: sin la señal de este proceso, sólo queda el registro de eliminación.
+        VariableReport.objects.filter(pk=report.pk)._raw_delete(VariableReport.objects.db)
+        Tombstone.objects.create(model='performance.variablereport', object_id=str(report.pk))
+        with self.assertNumQueries(2):
+            snapshot.refresh()
+        keys, values = snapshot.select()
+        self.assertNotIn(('EPSAS', 2017, None), keys)
+        self.assertEqual(len(keys), 4)
+
+    def aggregate(self, **params):
+        with mock.patch.object(ResponseCacheMixin, 'cache_responses', False):
+            response = self.client.get('/api/reports/aggregate/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_aggregate_matches_database(self):
+        for params in [
+            dict(fields='v1,v2', agg='sum,mean,count,min,max'),
+            dict(fields='v1,v2', agg='sum,mean,count,min,max', group_by='year,month'),
+            dict(fields='v1,v2', agg='sum,count', group_by='state,category'),
+            dict(fields='v1', agg='sum', group_by='epsa', year='2017'),
+            dict(fields='v1', agg='sum,count', year='2019'),
+        ]:
+            from_snapshot = self.aggregate(**params)
+            with mock.patch.object(views.VariableReportViewSet, 'aggregate_snapshot', None):
+                self.assertEqual(from_snapshot, self.aggregate(**params), params)
+
+    @mock.patch.object(views.VariableReportViewSet, 'filterset_fields', ('epsa', 'year', 'month', 'v2_type'))
+    def test_other_filters_use_the_database(self):
+        with mock.patch.object(snapshot, 'select') as select:
+            data = self.aggregate(fields='v1', agg='sum', group_by='epsa', v2_type='NC', year='2017')
+        select.assert_not_called()
+        self.assertEqual(data, [{'epsa': 'EPSAS', 'v1_sum': 7.0}])
+
+    def test_aggregate_validates_filters(self):
+        with mock.patch.object(ResponseCacheMixin, 'cache_responses', False):
+            response = self.client.get('/api/reports/aggregate/', {'fields': 'v1', 'year': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkCreateOrUpdateTests(TestCase):
+    '''
+    Verifica el reporte por objeto y las escrituras de `bulk_create_or_update`.
+    '''
+    def setUp(self):
+        snapshot.clear()
+
+    def test_report(self):
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=6, v1=1)
+        data = [
+            {'epsa': 'AAPOS', 'year': 2017, 'month': 6, 'v1': 2},
+            {'epsa': 'AAPOS', 'year': 2018, 'month': 6, 'v1': 3},
+            {'epsa': 'AAPOS', 'year': 2018, 'month': 6, 'v2': 4},
+            {'epsa': 'AAPOS', 'year': 2019},
+            {'epsa': 'AAPOS', 'year': 2019, 'month': 1, 'v99': 1},
+            {'epsa': None, 'year': None, 'month': None},
+            {'epsa': 'AAPOS', 'year': 'abc', 'month': 1},
+        ]
+        ret = bulk_create_or_update(VariableReport, data, ['epsa', 'year', 'month'])
+        self.assertEqual([next(iter(item)) for item in ret], ['actualizado', 'creado', 'actualizado'] + ['ignorado'] * 4)
+        self.assertEqual(ret[0]['actualizado'], data[0])
+        self.assertIn('no_identificable', ret[3]['ignorado'])
+        self.assertIn('campos_desconocidos', ret[4]['ignorado'])
+        self.assertIn('objeto_en_blanco', ret[5]['ignorado'])
+        self.assertIn('valor_invalido', ret[6]['ignorado'])
+        self.assertEqual(
+            sorted(VariableReport.objects.values_list('year', 'month', 'v1', 'v2')),
+            [(2017, 6, 2.0, None), (2018, 6, 3.0, 4.0)],
+        )
+
+    def test_updates_every_duplicate_of_a_null_key(self):
+        # La restricción única no impide reportes anuales repetidos: los meses nulos no son iguales entre sí.
+        VariableReport.objects.bulk_create([VariableReport(epsa_id='AAPOS', year=2017, month=None, v1=i) for i in range(2)])
+        ret = bulk_create_or_update(VariableReport, [{'epsa': 'AAPOS', 'year': 2017, 'month': None, 'v1': 5}], ['epsa', 'year', 'month'])
+        self.assertEqual(next(iter(ret[0])), 'actualizado')
+        self.assertEqual(list(VariableReport.objects.values_list('v1', flat=True)), [5.0, 5.0])
+
+
+class RollupSignalTests(TestCase):
+    '''
+    Verifica que los agregados se actualizan al guardar un reporte de variables.
+    '''
+    def setUp(self):
+        snapshot.clear()
+
+    def annual(self):
+        return sorted(VariableReportRollup.objects.filter(grain='year').values_list('epsa', 'year', 'v1'))
+
+    def test_moving_a_report_refreshes_both_keys(self):
+        report = VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=6, v1=5)
+        self.assertEqual(self.annual(), [('AAPOS', 2017, 5.0)])
+        report.year = 2018
+        report.save()
+        self.assertEqual(self.annual(), [('AAPOS', 2018, 5.0)])
+        report = VariableReport.objects.get()
+        report.epsa_id = 'EPSAS'
+        report.save()
+        self.assertEqual(self.annual(), [('EPSAS', 2018, 5.0)])
+
+
+@shared_cache
+class ComplianceCacheTests(TestCase):
+    '''
+    Verifica que la matriz de cumplimiento guardada en el caché depende de las versiones de los modelos.
+    '''
+    def setUp(self):
+        snapshot.clear()
+        cache.clear()
+        EPSA.objects.create(code='AAPOS', state='PO', category='A')
+        Indicator.objects.create(code='I1', ind_id=1, par_min_A=50)
+        # Las versiones se incrementan al confirmar la transacción, lo que no ocurre dentro de `TestCase`.
+        patcher = mock.patch('aapsapi.cache.transaction.on_commit', lambda func: func())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_writes_invalidate_the_matrix(self):
+        measurement = IndicatorMeasurement.objects.create(epsa_id='AAPOS', year=2017, month=None, ind1=60)
+        self.assertIs(compliance.compliance_matrix(2017)[0]['ind1'], True)
+        with mock.patch.object(compliance, 'compute_compliance') as compute:
+            self.assertIs(compliance.compliance_matrix(2017)[0]['ind1'], True)
+        compute.assert_not_called()
+        measurement.ind1 = 40
+        measurement.save()
+        self.assertIs(compliance.compliance_matrix(2017)[0]['ind1'], False)
+        indicator = Indicator.objects.get(ind_id=1)
+        indicator.par_min_A = 30
+        indicator.save()
+        self.assertIs(compliance.compliance_matrix(2017)[0]['ind1'], True)
+
+
+class SyncLogRetentionTests(TestCase):
+    '''
+    Verifica la depuración de los registros de eliminaciones y de cambios anteriores al periodo de retención.
+    '''
+    def test_purge(self):
+        old = timezone.now() - timedelta(days=100)
+        Tombstone.objects.bulk_create([Tombstone(model='performance.variablereport', object_id=str(i)) for i in range(3)])
+        Tombstone.objects.filter(object_id__in=['0', '1']).update(deleted=old)
+        VariableReportChange.objects.bulk_create([
+            VariableReportChange(epsa='AAPOS', year=2017, month=None, variables='1,3'),
+            VariableReportChange(epsa='AAPOS', year=2017, month=None, variables='2'),
+            VariableReportChange(epsa='AAPOS', year=2018, month=None, variables='*'),
+            VariableReportChange(epsa='AAPOS', year=2018, month=None, variables='4'),
+            VariableReportChange(epsa='EPSAS', year=2017, month=1, variables='5'),
+        ])
+        VariableReportChange.objects.exclude(epsa='EPSAS').update(created=old)
+        self.assertEqual(synclog.purge(), (2, 2))
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), ['2'])
+        self.assertEqual(
+            sorted(VariableReportChange.objects.values_list('epsa', 'year', 'variables')),
+            [('AAPOS', 2017, '1,2,3'), ('AAPOS', 2018, '*'), ('EPSAS', 2017, '5')],
+        )
+
+
+class UnknownEPSATests(UnknownEPSAMixin, TestCase):
+    '''
+    Verifica el tratamiento de las siglas de EPSAs no registradas (`unknown_epsa`) en las cargas masivas de reportes.
+    '''
+    url = '/api/reports/'
+    model = VariableReport
+    data = ({'epsa': 'AAPOS', 'year': 2017, 'month': 1}, {'epsa': 'NUEVA', 'year': 2017, 'month': 1})
+
+    def setUp(self):
+        super().setUp()
+        snapshot.clear()
+
+    def test_check_epsa_codes(self):
+        data = [{'epsa': 'AAPOS', 'year': 2017}, {'epsa': 'NUEVA', 'year': 2017}, {'year': 2017}]
+        with self.assertNumQueries(1):
+            unknown, flagged = check_epsa_codes(data, 'reject')
+        self.assertEqual(unknown, {'NUEVA'})
+        self.assertEqual(flagged, {1: {'epsa_desconocida': 'La EPSA NUEVA no está registrada. El objeto no fue guardado.'}})
+
+    def test_create_several(self):
+        response = self.post('create', [{'epsa': 'NUEVA', 'year': 2017, 'month': 1}, {'epsa': 'OTRA', 'year': 2017, 'month': 1}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['advertencias'] for item in response.data], [
+            {'epsa_creada': 'La EPSA NUEVA no estaba registrada y fue creada.'},
+            {'epsa_creada': 'La EPSA OTRA no estaba registrada y fue creada.'},
+        ])
+        self.assertEqual(sorted(EPSA.objects.values_list('code', flat=True)), ['AAPOS', 'NUEVA', 'OTRA'])
+        self.assertEqual(VariableReport.objects.count(), 2)
+
+    def test_upload(self):
+        body = 'epsa,year,month,v1\nAAPOS,2017,1,1\nNUEVA,2017,1,2\n'
+        block, = self.client.post('/api/reports/upload/?unknown_epsa=reject', body, content_type='text/csv').json()
+        self.assertEqual((block['creado'], block['ignorado']), (1, 1))
+        self.assertEqual(block['errores'][0]['linea'], 3)
+        self.assertIn('epsa_desconocida', block['errores'][0]['error'])
+        block, = self.client.post('/api/reports/upload/?unknown_epsa=flag', body, content_type='text/csv').json()
+        self.assertEqual((block['creado'], block['actualizado']), (1, 1))
+        self.assertEqual(block['advertencias'], [{'linea': 3, 'advertencia': {'epsa_desconocida': 'La EPSA NUEVA no está registrada.'}}])
+        self.assertFalse(EPSA.objects.filter(code='NUEVA').exists())
+        block, = self.client.post('/api/reports/upload/?unknown_epsa=create', body, content_type='text/csv').json()
+        self.assertEqual(block['actualizado'], 2)
+        self.assertIn('epsa_creada', block['advertencias'][0]['advertencia'])
+        self.assertTrue(EPSA.objects.filter(code='NUEVA').exists())
+
+
+@mock.patch.object(ResponseCacheMixin, 'cache_responses', False)
+class ConditionalGetTests(TestCase):
+    '''
+    Verifica el validador `Last-Modified` de la lista de reportes.
+    '''
+    def setUp(self):
+        snapshot.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        self.modified = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+        for year in (2017, 2018):
+            VariableReport.objects.create(epsa_id='AAPOS', year=year, v1=1)
+        VariableReport.objects.update(modified=self.modified)
+
+    def test_delete_changes_last_modified(self):
+        last_modified = self.client.get('/api/reports/')['Last-Modified']
+        self.assertEqual(last_modified, http_date(self.modified.timestamp()))
+        self.assertEqual(self.client.get('/api/reports/', HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        VariableReport.objects.filter(year=2018).delete()
+        Tombstone.objects.update(deleted=self.modified + timedelta(minutes=1))
+        response = self.client.get('/api/reports/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([report['year'] for report in response.json()], [2017])
+        self.assertEqual(response['Last-Modified'], http_date((self.modified + timedelta(minutes=1)).timestamp()))
+
+    def test_current_second_is_not_a_validator(self):
+        report = VariableReport.objects.get(year=2017)
+        report.v1 = 2
+        report.save()
+        with mock.patch('django.utils.timezone.now', return_value=report.modified):
+            response = self.client.get('/api/reports/', HTTP_IF_MODIFIED_SINCE=http_date(report.modified.timestamp()))
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Last-Modified', response)
+            self.assertEqual(self.client.get('/api/reports/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class ExportTests(TestCase):
+    '''
+    Verifica la descarga de reportes de variables como CSV y Parquet.
+    '''
+    def setUp(self):
+        snapshot.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=None, v1=1.5, v2=2)
+        VariableReport.objects.create(epsa_id='AAPOS', year=2018, month=None, v1=None, v2=3)
+        VariableReport.objects.create(epsa_id='EPSAS', year=2017, month=6, v1=4, v2=5)
+
+    def export(self, format, **params):
+        response = self.client.get(f'/api/reports/export.{format}', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Disposition'].endswith(f'.{format}"'))
+        return b''.join(response.streaming_content)
+
+    def test_csv(self):
+        content = self.export('csv', year=2017, fields='epsa,year,month,v1')
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8'))))
+        self.assertEqual(rows, [['epsa', 'year', 'month', 'v1'], ['AAPOS', '2017', '', '1.5'], ['EPSAS', '2017', '6', '4.0']])
+
+    def test_csv_excluded_fields(self):
+        content = self.export('csv', epsa='AAPOS', **{'fields!': ','.join(f'v{i}' for i in range(2, 52)) + ',id,modified'})
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8'))))
+        self.assertEqual(rows[0][:3], ['epsa', 'year', 'month'])
+        self.assertIn('v1', rows[0])
+        self.assertNotIn('v2', rows[0])
+        self.assertEqual(len(rows), 3)
+
+    @skipIf(pq is None, 'pyarrow no está instalado')
+    def test_parquet(self):
+        content = self.export('parquet', epsa='AAPOS', fields='epsa,year,v1,v2')
+        table = pq.read_table(io.BytesIO(content))
+        self.assertEqual(table.column_names, ['epsa', 'year', 'v1', 'v2'])
+        self.assertEqual(table.to_pydict(), {'epsa': ['AAPOS', 'AAPOS'], 'year': [2017, 2018], 'v1': [1.5, None], 'v2': [2.0, 3.0]})
+
+    def test_invalid_field(self):
+        for format in ('csv', 'parquet'):
+            response = self.client.get(f'/api/reports/export.{format}', {'fields': 'epsa,bogus'})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('bogus', response.json()['fields'])
+
+
+class AdminTests(QueryBudgetMixin, TestCase):
+    '''
+    Verifica los formularios y las listas del admin de los modelos con EPSA.
+    '''
+    def setUp(self):
+        snapshot.clear()
+        EPSA.objects.create(code='AAPOS', state='PO', category='A')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+
+    def test_unregistered_epsa_is_saved(self):
+        response = self.client.get('/admin/performance/variablereport/add/')
+        self.assertContains(response, 'name="epsa"')
+        self.assertNotContains(response, '<option value="AAPOS"')
+        data = {'epsa': 'NUEVA', 'year': 2019, **{f'v{i}_type': 'VA' for i in range(1, 52)}}
+        response = self.client.post('/admin/performance/variablereport/add/', data)
+        self.assertEqual(response.status_code, 302)
+        report = VariableReport.objects.get()
+        self.assertEqual((report.epsa_id, report.year), ('NUEVA', 2019))
+        self.assertFalse(EPSA.objects.filter(code='NUEVA').exists())
+        response = self.client.get(f'/admin/performance/variablereport/{report.pk}/change/')
+        self.assertContains(response, 'value="NUEVA"')
+
+    def seed(self, size):
+        for i in range(size):
+            code = f'EPSA{size}_{i}'
+            EPSA.objects.create(code=code, state='LP', category='ABCD'[i % 4])
+            VariableReport.objects.create(epsa_id=code, year=2017, month=None)
+            IndicatorMeasurement.objects.create(epsa_id=code, year=2017, month=None)
+        VariableReport.objects.create(epsa_id=f'NUEVA{size}', year=2017, month=None)
+
+    def test_report_changelist_query_budget(self):
+        self.assertUrlQueryBudget('/admin/performance/variablereport/', ADMIN_CHANGELIST_BUDGETS['variablereport'], self.seed)
+
+    def test_measurement_changelist_query_budget(self):
+        self.assertUrlQueryBudget('/admin/performance/indicatormeasurement/?epsa_category=A', ADMIN_CHANGELIST_BUDGETS['indicatormeasurement'], self.seed)
+
+
+class FormulaTests(TestCase):
+    '''
+    Verifica las fórmulas de los indicadores con valores calculados a mano.
+    '''
+    def setUp(self):
+        snapshot.clear()
+
+    def test_report(self):
+        VariableReport.objects.create(
+            epsa_id='AAPOS', year=2017, month=None,
+            v1=100, v2=50, v3=30, v5=20, v6=4, v7=10, v11=5, v12=10, v26=5, v44=3, v44_type='NC', v45=6,
+        )
+        indicators.compute_indicators()
+        measurement = IndicatorMeasurement.objects.get()
+        self.assertAlmostEqual(measurement.ind1, 300)  # (100 + 50) / (10 * 5) * 100
+        self.assertAlmostEqual(measurement.ind2, 20)  # 30 / (100 + 50) * 100
+        self.assertAlmostEqual(measurement.ind3, 50)  # 5 / 10 * 100
+        self.assertAlmostEqual(measurement.ind12, 20)  # 4 / 20 * 100
+        self.assertAlmostEqual(measurement.ind17, 80)  # (150 - 30) / 150 * 100
+        self.assertAlmostEqual(measurement.ind18, 100 / 3)  # (30 - 20) / 30 * 100
+        self.assertIsNone(measurement.ind16)  # v44 reportada como NC
+        self.assertIsNone(measurement.ind4)  # sin v13 ni v14
+
+    def test_rationing_continuity(self):
+        values = np.full((2, 51), np.nan)
+        values[:, [16, 24, 25, 26]] = [[1000, 8760, 8760, 0], [1000, 8760, 8760, 876000]]  # v17, v25, v26 y v27
+        result = indicators.compute_matrix(values, [6])[6]
+        self.assertAlmostEqual(result[0], 24)  # (8760 - 0 / 1000) * 24 / 8760
+        self.assertAlmostEqual(result[1], 21.6)  # (8760 - 876000 / 1000) * 24 / 8760
+
+    def test_add_ignores_missing_values(self):
+        nan = np.nan
+        result = indicators._add(np.array([nan, 1, nan, 2]), np.array([3, nan, nan, 4]))
+        np.testing.assert_array_equal(result, [3, 1, nan, 6])
+
+    def test_missing_addend(self):
+        values = np.full((1, 51), np.nan)
+        values[0, [1, 2]] = [50, 30]  # v2 y v3, sin v1
+        self.assertAlmostEqual(indicators.compute_matrix(values, [2])[2][0], 60)  # 30 / 50 * 100
+
+    def test_division_by_zero(self):
+        values = np.full((2, 51), np.nan)
+        values[:, [10, 11]] = [[5, 0], [0, 0]]  # v11 y v12
+        np.testing.assert_array_equal(indicators.compute_matrix(values, [3])[3], [np.nan, np.nan])
+        VariableReport.objects.create(epsa_id='AAPOS', year=2017, month=None, v11=5, v12=0)
+        indicators.compute_indicators()
+        self.assertIsNone(IndicatorMeasurement.objects.get().ind3)
@@ -1,9 +1,21 @@
 from rest_framework import viewsets
-from performance import models, serializers
+from aapsapi.filters import CustomFilterBackend
+from aapsapi.mixins import ConditionalGetMixin, DeltaSyncMixin, FastListMixin, FieldsProjectionMixin, ResponseCacheMixin, StreamingListMixin, get_cursor_ordering
+from performance import models, serializers, ingest, indicators, compliance, export, snapshot
+from performance.dimensions import epsa_dimension
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 from rest_framework import status
+from django.db import connections
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from django.http import StreamingHttpResponse
+from django_filters.utils import translate_validation
+import numpy as np
 
-class CustomViewSet(viewsets.ModelViewSet):
+class CustomViewSet(ResponseCacheMixin, DeltaSyncMixin, ConditionalGetMixin, StreamingListMixin, FastListMixin, FieldsProjectionMixin, viewsets.ModelViewSet):
     def get_serializer(self, *args, **kwargs):
         if isinstance(kwargs.get('data', {}), list):
             kwargs['many'] = True
@@ -16,6 +28,193 @@ class CustomViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.initial_data)
         return Response(serializer.instance, status=status.HTTP_201_CREATED)
 
+def list_param(request, name, allowed):
+    '''
+    Lee un parámetro con valores separados por comas y valida que todos estén permitidos.
+    '''
+    values = [v.strip() for v in request.query_params.get(name, '').split(',') if v.strip()]
+    invalid = [v for v in values if v not in allowed]
+    if invalid:
+        raise ValidationError({name: f'Valores no soportados: {", ".join(invalid)}. Valores permitidos: {", ".join(allowed)}.'})
+    return values
+
+class AggregateMixin:
+    '''
+    Agrega la acción `aggregate`, que calcula sumas, promedios y conteos agrupados.
+    Las vistas deben definir `aggregate_fields`, los campos numéricos que pueden ser agregados.
+
+    Si la vista define `aggregate_snapshot` (la copia en memoria de `performance.snapshot`), la agregación se calcula sobre
+    la copia actualizada en lugar de consultar la base de datos. En ese caso `aggregate_fields` son los campos `v1`...`v51`.
+    La copia sólo se filtra por `aggregate_snapshot_filters`: con cualquier otro parámetro de filtro (por ejemplo
+    `modified_since`) la agregación se calcula en la base de datos.
+    '''
+    aggregate_fields = ()
+    aggregate_group_fields = ('epsa', 'year', 'month', 'state', 'category',)
+    aggregate_functions = {'sum': Sum, 'mean': Avg, 'count': Count, 'min': Min, 'max': Max}
+    aggregate_params = ('group_by', 'fields', 'agg', api_settings.URL_FORMAT_OVERRIDE)
+    aggregate_snapshot = None
+    aggregate_snapshot_filters = ('epsa', 'year', 'month')
+
+    @action(detail=False, methods=['get'])
+    def aggregate(self, request):
+        '''
+        Retorna valores agregados de los campos pedidos, agrupados por los campos dados.
+
+        Soporta los parámetros `group_by` (`epsa`, `year`, `month`, `state` y `category`, donde `state` y `category` son el departamento y la categoría de la EPSA),
+        `fields` (los campos a agregar) y `agg` (`sum`, `mean`, `count`, `min` y `max`), además de los parámetros de filtro de la lista. Por ejemplo,
+
+            /api/reports/aggregate/?group_by=state,category,year&fields=v1,v5&agg=sum,mean,count
+
+        retorna un objeto por cada combinación de departamento, categoría y año con los campos `v1_sum`, `v1_mean`, `v1_count`, `v5_sum`, `v5_mean` y `v5_count`.
+        '''
+        group_by = list_param(request, 'group_by', self.aggregate_group_fields)
+        fields = list_param(request, 'fields', self.aggregate_fields)
+        aggs = list_param(request, 'agg', list(self.aggregate_functions)) or ['sum']
+        if not fields:
+            raise ValidationError({'fields': 'Se debe indicar al menos un campo a agregar.'})
+
+        if self.use_aggregate_snapshot(request):
+            return Response(self.aggregate_from_snapshot(group_by, fields, aggs))
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'state' in group_by:
+            queryset = queryset.annotate(state=F('epsa__state'))
+        if 'category' in group_by:
+            queryset = queryset.annotate(category=F('epsa__category'))
+        annotations = {
+            f'{field}_{agg}': self.aggregate_functions[agg](field)
+            for field in fields for agg in aggs
+        }
+        if group_by:
+            ordering = ['epsa_id' if field == 'epsa' else field for field in group_by]
+            data = list(queryset.values(*group_by).annotate(**annotations).order_by(*ordering))
+        else:
+            data = [queryset.aggregate(**annotations)]
+        return Response(data)
+
+    def use_aggregate_snapshot(self, request):
+        '''
+        Indica si la agregación del pedido puede calcularse sobre `aggregate_snapshot`, es decir, si todos sus parámetros
+        son de la agregación o filtros soportados por la copia.
+        '''
+        if self.aggregate_snapshot is None:
+            return False
+        allowed = set(self.aggregate_params) | set(self.aggregate_snapshot_filters)
+        return all(name in allowed for name in request.query_params)
+
+    def aggregate_from_snapshot(self, group_by, fields, aggs):
+        '''
+        Calcula la agregación sobre `aggregate_snapshot` con los filtros `epsa`, `year` y `month` de la lista, con el mismo
+        resultado que la consulta agregada: los valores nulos se ignoran y el departamento y la categoría de las EPSAs no
+        registradas son nulos.
+        '''
+        filterset = CustomFilterBackend().get_filterset(self.request, self.get_queryset(), self)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        params = filterset.form.cleaned_data
+        self.aggregate_snapshot.refresh()
+        keys, values = self.aggregate_snapshot.select(
+            epsas=[params['epsa']] if params.get('epsa') else None,
+            years=[params['year']] if params.get('year') is not None else None,
+            months=[params['month']] if params.get('month') is not None else None,
+            mask_missing=False,
+        )
+        by_epsa = 'state' in group_by or 'category' in group_by
+        groups = []
+        group_index = {}
+        for epsa, year, month in keys:
+            info = epsa_dimension.get(epsa) if by_epsa else None
+            props = {'epsa': epsa, 'year': year, 'month': month, 'state': info and info.state, 'category': info and info.category}
+            key = tuple(props[field] for field in group_by)
+            groups.append(group_index.setdefault(key, len(group_index)))
+        columns = [int(field[1:]) - 1 for field in fields]
+        result = snapshot.group_aggregate(np.array(groups, dtype=np.int64), max(len(group_index), 1), values[:, columns], aggs)
+        # Los nulos se ordenan como en la base de datos (al final en PostgreSQL, al principio en SQLite).
+        nulls_largest = connections[self.get_queryset().db].features.nulls_order_largest
+        ordered = sorted(group_index.items(), key=lambda item: [((v is None) == nulls_largest, v) for v in item[0]])
+        data = []
+        for key, group in ordered if group_by else [((), 0)]:
+            item = dict(zip(group_by, key))
+            for i, field in enumerate(fields):
+                for agg in aggs:
+                    value = result[agg][group, i]
+                    item[f'{field}_{agg}'] = int(value) if agg == 'count' else (None if np.isnan(value) else float(value))
+            data.append(item)
+        return data
+
+class ExportMixin:
+    '''
+    Agrega la acción `export`, que descarga el conjunto filtrado como archivo plano CSV o Parquet, generado por lotes.
+    '''
+    @action(detail=False, methods=['get'], renderer_classes=[export.CSVRenderer, export.ParquetRenderer])
+    def export(self, request, format=None):
+        '''
+        Descarga las instancias como archivo CSV o Parquet, según el sufijo de la ruta o el parámetro `format`. Por ejemplo,
+
+            /api/reports/export.csv?year=2017&fields=epsa,year,month,v1,v2
+            /api/measurements/export.parquet?epsa=EPSAS
+
+        Soporta los mismos parámetros de filtro que la lista, y los parámetros `fields` y `fields!` para elegir o excluir columnas.
+        '''
+        model = self.get_queryset().model
+        names = [field.name for field in model._meta.concrete_fields]
+        fields = export.export_columns(model, list_param(request, 'fields', names), list_param(request, 'fields!', names))
+        queryset = self.filter_queryset(self.get_queryset()).order_by(*(get_cursor_ordering(self) or ['pk']))
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(export.EXPORTERS[renderer.format](queryset, fields), content_type=renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}.{renderer.format}"'
+        return response
+
+    def handle_exception(self, exc):
+        if getattr(self, 'action', None) == 'export':
+            self.request.accepted_renderer = JSONRenderer()
+            self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
+
+class SeriesMixin:
+    '''
+    Agrega la acción `series`, que retorna series de tiempo leídas de los agregados mensuales, semestrales y anuales (`Rollup`).
+    Las vistas deben definir `series_model`, el modelo de agregados, `series_param`, el nombre del parámetro con los campos pedidos, y `series_fields`, los campos disponibles.
+    '''
+    series_model = None
+    series_param = 'fields'
+    series_fields = ()
+
+    @action(detail=False, methods=['get'])
+    def series(self, request):
+        '''
+        Retorna una serie de tiempo por EPSA leída de los agregados mensuales, semestrales o anuales mantenidos por el sistema.
+
+        Soporta los parámetros `epsa` y `year`, que pueden repetirse, `grain` (`month`, `semester` o `year`; `year` por defecto) y la lista de campos a retornar. Por ejemplo,
+
+            /api/reports/series/?epsa=AAPOS&vars=v1,v3&grain=year
+
+        retorna las sumas anuales de las variables 1 y 3 de la EPSA AAPOS. Los reportes de variables se agregan como sumas y las medidas de indicadores como promedios.
+        El año se calcula en base al reporte anual si existe, o en base a los reportes mensuales si no existe.
+        '''
+        grain = request.query_params.get('grain', 'year')
+        if grain not in dict(models.Rollup.GRAIN_CHOICES):
+            raise ValidationError({'grain': 'Valores permitidos: month, semester, year.'})
+        fields = list_param(request, self.series_param, self.series_fields)
+        if not fields:
+            raise ValidationError({self.series_param: 'Se debe indicar al menos un campo.'})
+        queryset = self.series_model.objects.filter(grain=grain)
+        epsas = request.query_params.getlist('epsa')
+        if epsas:
+            queryset = queryset.filter(epsa__in=epsas)
+        try:
+            years = [int(y) for y in request.query_params.getlist('year')]
+        except ValueError:
+            raise ValidationError({'year': 'Debe ser un número entero.'})
+        if years:
+            queryset = queryset.filter(year__in=years)
+        data = []
+        for item in queryset.values('epsa', 'year', 'period', *fields).order_by('epsa', 'year', 'period'):
+            period = item.pop('period')
+            if grain != 'year':
+                item[grain] = period
+            data.append(item)
+        return Response(data)
+
 class EPSAViewSet(CustomViewSet):
     '''
     list:
@@ -392,7 +591,7 @@ class IndicatorViewSet(CustomViewSet):
     queryset = models.Indicator.objects.all()
     filterset_fields = ('code','ind_id')
 
-class VariableReportViewSet(CustomViewSet):
+class VariableReportViewSet(AggregateMixin, SeriesMixin, ExportMixin, CustomViewSet):
     '''
     list:
     Retorna un conjunto de instancias del modelo `VariableReport` (reporte de variables).
@@ -444,6 +643,8 @@ class VariableReportViewSet(CustomViewSet):
 
     Si los objetos ingresados no pasan el proceso de validación del sistema, las instancias no serán creadas y el error será retornado como respuesta al pedido.
 
+    En el ingreso en masa, las siglas `epsa` de todos los objetos se verifican con una sola consulta. El parámetro `unknown_epsa` indica qué hacer con los objetos de EPSAs no registradas: `flag` (por defecto) los guarda e incluye sus `advertencias` en la respuesta, `reject` los ignora, y `create` registra las EPSAs faltantes en masa antes de guardarlos. Por ejemplo, `POST /api/reports/?unknown_epsa=reject`.
+
     read:
     Retorna una instancia específica del modelo `VariableReport` (reporte de variables).
 
@@ -530,8 +731,45 @@ class VariableReportViewSet(CustomViewSet):
     serializer_class = serializers.VariableReportSerializer
     queryset = models.VariableReport.objects.all()
     filterset_fields = ('epsa','year','month',)
-
-class IndicatorMeasurementViewSet(CustomViewSet):
+    cursor_ordering = ('epsa_id','year','month','id',)
+    aggregate_fields = tuple(f'v{i+1}' for i in range(51))
+    aggregate_snapshot = snapshot.snapshot
+    series_model = models.VariableReportRollup
+    series_param = 'vars'
+    series_fields = aggregate_fields
+
+    @action(detail=False, methods=['post'])
+    def upload(self, request):
+        '''
+        Ingreso masivo de reportes de variables leídos del cuerpo del pedido a medida que llegan, sin cargar el archivo completo en memoria.
+
+        El cuerpo del pedido puede ser del tipo `application/x-ndjson` (un objeto JSON por línea) o `text/csv` (con una fila de encabezado con los nombres de los campos). Por ejemplo,
+
+            POST /api/reports/upload/?chunk_size=500
+            Content-Type: text/csv
+
+            epsa,year,month,v1,v1_type
+            AAPOS,2017,,790840.00,VA
+            SAGUAPAC,2017,,10738512.20,VA
+
+        Los reportes son validados y guardados en bloques de `chunk_size` líneas (1000 por defecto). Cada bloque es confirmado por separado y la respuesta contiene un resumen por bloque con las cantidades de reportes creados, actualizados e ignorados y los errores encontrados en cada línea.
+
+        Las siglas `epsa` de cada bloque se verifican con una sola consulta. El parámetro `unknown_epsa` indica qué hacer con los reportes de EPSAs no registradas: `flag` (por defecto) los guarda y los lista en las `advertencias` del bloque, `reject` los ignora, y `create` registra las EPSAs faltantes en masa antes de guardarlos.
+        '''
+        try:
+            chunk_size = min(max(int(request.query_params.get('chunk_size', 1000)), 1), 10000)
+        except ValueError:
+            return Response({'chunk_size': 'Debe ser un número entero.'}, status=status.HTTP_400_BAD_REQUEST)
+        unknown_epsa = serializers.unknown_epsa_mode(request)
+        lines = ingest.iter_lines(request.stream)
+        if request.content_type.startswith('text/csv'):
+            records = ingest.iter_csv(lines)
+        else:
+            records = ingest.iter_ndjson(lines)
+        summary = ingest.ingest(models.VariableReport, records, ['epsa','year','month',], chunk_size, unknown_epsa)
+        return Response(summary, status=status.HTTP_200_OK)
+
+class IndicatorMeasurementViewSet(AggregateMixin, SeriesMixin, ExportMixin, CustomViewSet):
     '''
     list:
     Retorna un conjunto de instancias del modelo `IndicatorMeasurement` (medidad de indicadores).
@@ -581,6 +819,9 @@ class IndicatorMeasurementViewSet(CustomViewSet):
     Añadiría las instancias correspondientes a los indicadores calculadors para las EPSAs 6 DE OCTUBRE y AAPOS de los años 2017 y 2014 respectivamente.
 
     Si los objetos ingresados no pasan el proceso de validación del sistema, las instancias no serán creadas y el error será retornado como respuesta al pedido.
+
+    En el ingreso en masa, las siglas `epsa` de todos los objetos se verifican con una sola consulta. El parámetro `unknown_epsa` indica qué hacer con los objetos de EPSAs no registradas: `flag` (por defecto) los guarda e incluye sus `advertencias` en la respuesta, `reject` los ignora, y `create` registra las EPSAs faltantes en masa antes de guardarlos. Por ejemplo, `POST /api/measurements/?unknown_epsa=reject`.
+
     read:
     Retorna una instancia específica del modelo `IndicatorMeasurement` (medida de indicadores).
 
@@ -668,4 +909,60 @@ class IndicatorMeasurementViewSet(CustomViewSet):
     serializer_class = serializers.IndicatorMeasurementSerializer
     queryset = models.IndicatorMeasurement.objects.all()
     filterset_fields = ('epsa','year','month',)
+    cursor_ordering = ('epsa_id','year','month','id',)
+    aggregate_fields = tuple(f'ind{i+1}' for i in range(32))
+    series_model = models.IndicatorMeasurementRollup
+    series_param = 'inds'
+    series_fields = aggregate_fields
+
+    @action(detail=False, methods=['post'])
+    def compute(self, request):
+        '''
+        Calcula las medidas de indicadores `ind1`...`ind32` en base a los reportes de variables del sistema y las guarda.
+
+        Soporta los parámetros `epsa` y `year`, que pueden repetirse, para limitar el cálculo a ciertas EPSA y años. Por ejemplo,
+
+            POST /api/measurements/compute/?year=2017
+
+        calcula los indicadores de todas las EPSA para los reportes del año 2017. Si ningún parámetro es dado, calcula los indicadores de todos los reportes disponibles.
+
+        Con el parámetro `incremental=true` sólo se recalculan los indicadores que dependen de variables de reportes modificados después del último cálculo,
+        limitados a las EPSA y años dados si los hay. Por ejemplo,
+
+            POST /api/measurements/compute/?incremental=true&year=2017
+
+        Los valores reportados como NC (No Corresponde) o NR (No Reportó) se consideran faltantes y los indicadores que dependen de ellos quedan en blanco.
+        La respuesta contiene la cantidad de medidas creadas, actualizadas e ignoradas.
+        '''
+        try:
+            years = [int(y) for y in request.query_params.getlist('year')] or None
+        except ValueError:
+            return Response({'year': 'Debe ser un número entero.'}, status=status.HTTP_400_BAD_REQUEST)
+        epsas = request.query_params.getlist('epsa') or None
+        if request.query_params.get('incremental') in ['true', 'True', '1']:
+            return Response(indicators.compute_indicators_incremental(epsas=epsas, years=years), status=status.HTTP_200_OK)
+        return Response(indicators.compute_indicators(epsas=epsas, years=years), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def compliance(self, request):
+        '''
+        Retorna la matriz de cumplimiento regulatorio de las medidas de indicadores de un año.
+
+        Cada medida de indicadores es comparada con los parámetros `par_min_A`...`par_min_D` y `par_max_A`...`par_max_D` de cada indicador correspondientes a la categoría de su EPSA.
+        El parámetro `year` es obligatorio y el parámetro `epsa` permite limitar el resultado a una EPSA. Por ejemplo,
+
+            /api/measurements/compliance/?year=2017&epsa=AAPOS
+
+        retorna una lista con un objeto por medida con los campos `epsa`, `category`, `year`, `month` y `ind1`...`ind32`,
+        donde cada indicador es `true` si cumple con los parámetros, `false` si no cumple y `null` si no existe la medida, la categoría de la EPSA o los parámetros del indicador.
+        '''
+        try:
+            year = int(request.query_params['year'])
+        except (KeyError, ValueError):
+            return Response({'year': 'Este parámetro es obligatorio y debe ser un número entero.'}, status=status.HTTP_400_BAD_REQUEST)
+        matrix = compliance.compliance_matrix(year)
+        epsa = request.query_params.get('epsa')
+        if epsa is not None:
+            matrix = [item for item in matrix if item['epsa'] == epsa]
+        return Response(matrix)
 
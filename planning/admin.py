@@ -1,5 +1,6 @@
 from django.contrib import admin
 from planning import models
+from performance.admin import EPSAAnnotatedAdminMixin, EPSACategoryFilter, EPSAStateFilter
 
 
 class PlanGoalInline(admin.TabularInline):
@@ -14,14 +15,14 @@ class MuniExpenseInline(admin.StackedInline):
     model = models.MuniExpense
 
 @admin.register(models.POA)
-class POAModelAdmin(admin.ModelAdmin):
+class POAModelAdmin(EPSAAnnotatedAdminMixin, admin.ModelAdmin):
     view_on_site = False
 
     inlines = [CoopExpenseInline, MuniExpenseInline]
     
-    list_filter = ('epsa','year',)
-    search_fields = ['epsa', 'year',]
-    list_display = ('epsa', 'year', 'order', 'get_category', 'get_state',)
+    list_filter = ('epsa','year', EPSACategoryFilter, EPSAStateFilter,)
+    search_fields = ['epsa__code', 'year',]
+    list_display = ('get_epsa', 'year', 'order', 'get_category', 'get_state',)
 
     def changelist_view(self, request, extra_context=None):
         extra_context = {'title': 'AAPS - Planificación: POAs'}
@@ -36,15 +37,15 @@ class POAModelAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Plan)
-class PlanModelAdmin(admin.ModelAdmin):
+class PlanModelAdmin(EPSAAnnotatedAdminMixin, admin.ModelAdmin):
     view_on_site = False
     inlines = [
         PlanGoalInline,
     ]
     
-    list_display = ('epsa', 'year', 'plan_type', 'get_category', 'get_state',)
-    list_filter = ('epsa','year')
-    search_fields = ['epsa', 'year',]
+    list_display = ('get_epsa', 'year', 'plan_type', 'get_category', 'get_state',)
+    list_filter = ('epsa','year', EPSACategoryFilter, EPSAStateFilter,)
+    search_fields = ['epsa__code', 'year',]
 
     def changelist_view(self, request, extra_context=None):
         extra_context = {'title': 'AAPS - Planificación: PDQs/PTDS'}
@@ -0,0 +1,129 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Plan',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('epsa', models.CharField(help_text='EPSA que reporta el PTDS', max_length=64, verbose_name='EPSA')),
+                ('year', models.IntegerField(default=2026, help_text='Primer año de vigencia del PTDS', validators=[django.core.validators.MinValueValidator(1900)], verbose_name='Año Inicial')),
+                ('plan_type', models.CharField(choices=[('pdq', 'PDQ'), ('ptds', 'PTDS')], default='pdq', help_text='Tipo del plan (PDQ o PTDS).', max_length=8, verbose_name='tipo de plan')),
+            ],
+            options={
+                'verbose_name': 'PDQ/PTDS',
+                'verbose_name_plural': 'PDQs/PTDS',
+                'ordering': ['epsa', 'year'],
+                'unique_together': {('epsa', 'year')},
+            },
+        ),
+        migrations.CreateModel(
+            name='POA',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('epsa', models.CharField(help_text='EPSA que reporta el POA', max_length=64, verbose_name='EPSA')),
+                ('year', models.IntegerField(default=2026, help_text='Año del POA', validators=[django.core.validators.MinValueValidator(1900)], verbose_name='Año')),
+                ('order', models.IntegerField(default=1, help_text='Orden del POA (inicial:1, reprogramado:2-5)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)], verbose_name='Orden')),
+                ('in_op_ap', models.FloatField(blank='True', help_text='Ingresos por servicios de agua potable. (Bs.)', null='True', verbose_name='ingresos por servicios de agua potable')),
+                ('in_op_alc', models.FloatField(blank='True', help_text='Ingresos por servicios de alcantarillado sanitario. (Bs.)', null='True', verbose_name='ingresos por servicios de alcantarillado')),
+                ('in_op_alc_pozo', models.FloatField(blank='True', help_text='Ingresos por servicios de alcantarillado de pozo', null='True', verbose_name='ingresos por servicios de alcantarillado de pozo')),
+                ('in_op_otros', models.FloatField(blank='True', help_text='Ingresos por otro tipo de servicios operativos. (Bs.)', null='True', verbose_name='otros ingresos operativos')),
+                ('in_financieros', models.FloatField(blank='True', help_text='Ingresos no operativos financieros. (Bs.)', null='True', verbose_name='ingresos financieros')),
+                ('in_no_op_otros', models.FloatField(blank='True', help_text='Otros ingresos no operativos. (Bs.)', null='True', verbose_name='otros ingresos no operativos')),
+                ('inv_infraestructura_ap', models.FloatField(blank='True', help_text='Inversiones para la construcción de infraestructura de agua potable. (Bs.)', null='True', verbose_name='inversiones de infraestructura de agua potable')),
+                ('inv_infraestructura_alc', models.FloatField(blank='True', help_text='Inversiones para la construcción de infraestructura de alcantarillado sanitario. (Bs.)', null='True', verbose_name='inversiones de infraestructura de alcantarillado')),
+                ('inv_equipo', models.FloatField(blank='True', help_text='Inversiones para la adquisición de maquinaria y equipo. (Bs.)', null='True', verbose_name='inversiones de maquinaria y equipo')),
+                ('inv_diseno_estudio', models.FloatField(blank='True', help_text='Inversiones para el diseño y estudio de proyectos. (Bs.)', null='True', verbose_name='inversiones de diseño y estudio de proyectos')),
+                ('inv_otros', models.FloatField(blank='True', help_text='Inversiones por construcción de infraestructura de agua potable. (Bs.)', null='True', verbose_name='inversiones de infraestructura de agua potable')),
+                ('pob_total', models.FloatField(blank='True', help_text='Población Total (hab.)', null='True', verbose_name='población total')),
+                ('pob_ap', models.FloatField(blank='True', help_text='Población con Agua Potable (hab.)', null='True', verbose_name='población con agua potable')),
+                ('pob_alc', models.FloatField(blank='True', help_text='Población con Alcantarillado (hab.)', null='True', verbose_name='población con alcantarillado')),
+                ('con_ap', models.FloatField(blank='True', help_text='Conexiones Nuevas de Agua Potable (N°)', null='True', verbose_name='conexiones AP nuevas')),
+                ('con_ap_total', models.FloatField(blank='True', help_text='Total de Conexiones de Agua Potable (N°)', null='True', verbose_name='total conexiones AP')),
+                ('cob_ap', models.FloatField(blank='True', help_text='Cobertura de Agua Potable(%)', null='True', verbose_name='cobertura AP')),
+                ('con_alc', models.FloatField(blank='True', help_text='Nuevas Conexiones de Alcantarillado (N°)', null='True', verbose_name='conexiones de alcantarillado nuevas')),
+                ('con_alc_total', models.FloatField(blank='True', help_text='Total de Conexiones de Alcantarillado (N°)', null='True', verbose_name='total conexiones de alcantarillado')),
+                ('cob_alc', models.FloatField(blank='True', help_text='Cobertura de Alcantarillado (%)', null='True', verbose_name='cobertura de alcantarillado')),
+                ('cob_micro', models.FloatField(blank='True', help_text='Cobertura de Micromedición (%)', null='True', verbose_name='cobertura de micromedición')),
+                ('anc', models.FloatField(blank='True', help_text='Índice de Agua No Contabilizada (%)', null='True', verbose_name='agua no contabilizada')),
+            ],
+            options={
+                'verbose_name': 'POA',
+                'verbose_name_plural': 'POAs',
+                'ordering': ['epsa', 'year', 'order'],
+                'unique_together': {('epsa', 'year', 'order')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PlanGoal',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('year', models.IntegerField(default=2026, help_text='año del plan', validators=[django.core.validators.MinValueValidator(1900)], verbose_name='año')),
+                ('description', models.CharField(help_text='Descripción de la meta.', max_length=256, verbose_name='descripción')),
+                ('value', models.FloatField(help_text='Valor de la meta.', verbose_name='valor')),
+                ('val_description', models.CharField(blank=True, help_text='Descripción de lo que representa el valor de la meta (ejemplo: más de X conexiones nuevas de agua potable o simplemente ">").', max_length=64, null=True, verbose_name='descripción del valor')),
+                ('unit', models.CharField(help_text='Unidad de la meta.', max_length=64, verbose_name='unidad')),
+                ('plan', models.ForeignKey(help_text='PDQ/PTDS al cual pertenece la meta.', on_delete=django.db.models.deletion.CASCADE, related_name='goals', to='planning.Plan', verbose_name='PDQ/PTDS')),
+            ],
+            options={
+                'verbose_name': 'Meta de expansión PDQ/PTDS',
+                'verbose_name_plural': 'Metas de expansión PDQ/PTDS',
+                'ordering': ['plan', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MuniExpense',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('gastos_empleados_permanentes', models.FloatField(blank='True', help_text='Gastos relacionados a empleados permanentes. (Bs.)', null='True', verbose_name='empleados permanentes')),
+                ('gastos_empleados_no_permanentes', models.FloatField(blank='True', help_text='Gastos relacionados a empleados no permanentes. (Bs.)', null='True', verbose_name='empleados no permanentes')),
+                ('gastos_prevision_social', models.FloatField(blank='True', help_text='Gastos relacionados a previsión social. (Bs.)', null='True', verbose_name='previsión social')),
+                ('gastos_servicio_no_personales', models.FloatField(blank='True', help_text='Gastos relacionados a servicios no personales. (Bs.)', null='True', verbose_name='servicio no personales')),
+                ('gastos_materiales', models.FloatField(blank='True', help_text='Gastos relacionados a materiales y suministros. (Bs.)', null='True', verbose_name='materiales y suministros')),
+                ('gastos_activos', models.FloatField(blank='True', help_text='Gastos relacionados a activos reales. (Bs.)', null='True', verbose_name='activos reales')),
+                ('gastos_deuda_publica', models.FloatField(blank='True', help_text='Gastos relacionados al servicio de la deuda pública. (Bs.)', null='True', verbose_name='servicio de la deuda pública')),
+                ('gastos_transferencias', models.FloatField(blank='True', help_text='Gastos relacionados a tranferencias (Bs.)', null='True', verbose_name='transferencias')),
+                ('gastos_impuesto', models.FloatField(blank='True', help_text='Gastos relacionados a impuestos, regalías y tasas. (Bs.)', null='True', verbose_name='impuestos, regalías y tasas')),
+                ('gastos_otros', models.FloatField(blank='True', help_text='Otros gastos. (Bs.)', null='True', verbose_name='otros gastos')),
+                ('poa', models.OneToOneField(help_text='POA al cual corresponden los gastos.', on_delete=django.db.models.deletion.CASCADE, related_name='muni_expense', to='planning.POA', verbose_name='poa')),
+            ],
+            options={
+                'verbose_name': 'Planilla de gastos POA de EPSA municipal',
+                'verbose_name_plural': 'Planillas de gastos POA de EPSA municipal',
+                'ordering': ['poa', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CoopExpense',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('costos_operacion', models.FloatField(blank='True', help_text='Costos de operación. (Bs.)', null='True', verbose_name='costos de operación')),
+                ('costos_mantenimiento', models.FloatField(blank='True', help_text='Costos de mantenimiento. (Bs.)', null='True', verbose_name='costos de mantenimiento')),
+                ('gastos_administrativos', models.FloatField(blank='True', help_text='Gastos administrativos. (Bs.)', null='True', verbose_name='gastos administrativos')),
+                ('gastos_comerciales', models.FloatField(blank='True', help_text='Gastos comerciales. (Bs.)', null='True', verbose_name='gastos comerciales')),
+                ('gastos_financieros', models.FloatField(blank='True', help_text='Gastos financieros. (Bs.)', null='True', verbose_name='gastos financieros')),
+                ('poa', models.OneToOneField(help_text='POA al cual corresponden los gastos.', on_delete=django.db.models.deletion.CASCADE, related_name='coop_expense', to='planning.POA', verbose_name='poa')),
+            ],
+            options={
+                'verbose_name': 'Planilla de gastos POA de cooperativa',
+                'verbose_name_plural': 'Planillas de gastos POA de cooperativa',
+                'ordering': ['poa', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:13
+
+from django.db import migrations
+import django.db.models.deletion
+import performance.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+        ('planning', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='plan',
+            options={'ordering': ['epsa_id', 'year'], 'verbose_name': 'PDQ/PTDS', 'verbose_name_plural': 'PDQs/PTDS'},
+        ),
+        migrations.AlterModelOptions(
+            name='poa',
+            options={'ordering': ['epsa_id', 'year', 'order'], 'verbose_name': 'POA', 'verbose_name_plural': 'POAs'},
+        ),
+        migrations.AlterField(
+            model_name='plan',
+            name='epsa',
+            field=performance.models.EPSAForeignKey(db_column='epsa', db_constraint=False, help_text='EPSA que reporta el PTDS', on_delete=django.db.models.deletion.DO_NOTHING, related_name='plans', to='performance.EPSA', verbose_name='EPSA'),
+        ),
+        migrations.AlterField(
+            model_name='poa',
+            name='epsa',
+            field=performance.models.EPSAForeignKey(db_column='epsa', db_constraint=False, help_text='EPSA que reporta el POA', on_delete=django.db.models.deletion.DO_NOTHING, related_name='poas', to='performance.EPSA', verbose_name='EPSA'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning', '0002_epsa_foreign_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coopexpense',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='muniexpense',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='plan',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='plangoal',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='poa',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(fields=['year'], name='planning_pl_year_1a214b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(fields=['plan_type', 'year'], name='planning_pl_plan_ty_73b30d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plangoal',
+            index=models.Index(fields=['plan', 'year'], name='planning_pl_plan_id_76f5a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='poa',
+            index=models.Index(fields=['year'], name='planning_po_year_7ed0f1_idx'),
+        ),
+    ]
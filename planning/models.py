@@ -1,6 +1,6 @@
 import datetime
 from django.db import models
-from performance.models import EPSA, BaseModel
+from performance.models import BaseModel, EPSADimensionMixin, EPSAForeignKey
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.forms import ValidationError
 
@@ -16,12 +16,12 @@ state_code_to_name = {
     'PA': 'Pando',
 }
 
-class POA(BaseModel):
+class POA(EPSADimensionMixin, BaseModel):
     '''
     Modelo representando un Presupuesto Operativo Anual (POA) de una EPSA.
     '''
-    epsa = models.CharField(
-        max_length=64,
+    epsa = EPSAForeignKey(
+        related_name='poas',
         verbose_name='EPSA',
         help_text='EPSA que reporta el POA'
     )
@@ -189,7 +189,8 @@ class POA(BaseModel):
         unique_together = ('epsa','year','order',)
         verbose_name = 'POA'
         verbose_name_plural = 'POAs'
-        ordering = ['epsa','year','order',]
+        ordering = ['epsa_id','year','order',]
+        indexes = [models.Index(fields=['year'])]
 
     def clean(self, *args, **kwargs):
         if hasattr(self, 'coop_expense') and hasattr(self, 'muni_expense'):
@@ -201,29 +202,15 @@ class POA(BaseModel):
         super(POA, self).save(*args, **kwargs)
 
     def __str__(self):
-        return f'{self.epsa}-{self.year}-{self.order}'
-    def get_category(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            cat = str(rel_epsa[0].category)
-            if cat in ['A','B','C','D']:
-                return cat
-        return ''
-    get_category.short_description = 'categoría'
-    def get_state(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            state_code = str(rel_epsa[0].state)
-            if state_code in state_code_to_name.keys():
-                return state_code_to_name[state_code]
-        return ''
-    get_state.short_description = 'departamento'
+        return f'{self.epsa_id}-{self.year}-{self.order}'
 
 
 class CoopExpense(BaseModel):
     '''
     Modelo representando los gastos de una cooperativa correspondiente a un POA.
     '''
+    sync_parent = 'poa'
+
     poa = models.OneToOneField(
         to=POA,
         on_delete=models.CASCADE,
@@ -273,6 +260,8 @@ class MuniExpense(BaseModel):
     '''
     Modelo representando los gastos de una EPSA municipal correspondiente a un POA.
     '''
+    sync_parent = 'poa'
+
     poa = models.OneToOneField(
         to=POA,
         on_delete=models.CASCADE,
@@ -348,7 +337,7 @@ class MuniExpense(BaseModel):
     def __str__(self):
         return f'{self.poa} ({self.id})'
 
-class Plan(BaseModel):
+class Plan(EPSADimensionMixin, BaseModel):
     '''
     Modelo representando un plan de desarrollo quinquenal (PDQ) o un plan transitorio de desarrollo sostenible (PTDS).
     '''
@@ -357,8 +346,8 @@ class Plan(BaseModel):
         ('ptds', 'PTDS'),
     )
 
-    epsa = models.CharField(
-        max_length=64,
+    epsa = EPSAForeignKey(
+        related_name='plans',
         verbose_name='EPSA',
         help_text='EPSA que reporta el PTDS'
     )
@@ -379,32 +368,22 @@ class Plan(BaseModel):
         unique_together = ('epsa','year')
         verbose_name = 'PDQ/PTDS'
         verbose_name_plural = 'PDQs/PTDS'
-        ordering = ['epsa','year',]
+        ordering = ['epsa_id','year',]
+        indexes = [
+            models.Index(fields=['year']),
+            models.Index(fields=['plan_type', 'year']),
+        ]
 
     def __str__(self):
-        return f'{self.epsa}-{self.year}-{self.plan_type}'
-    def get_category(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            cat = str(rel_epsa[0].category)
-            if cat in ['A','B','C','D']:
-                return cat
-        return ''
-    get_category.short_description = 'categoría'
-    def get_state(self):
-        rel_epsa = EPSA.objects.filter(code=self.epsa)
-        if rel_epsa:
-            state_code = str(rel_epsa[0].state)
-            if state_code in state_code_to_name.keys():
-                return state_code_to_name[state_code]
-        return ''
-    get_state.short_description = 'departamento'
+        return f'{self.epsa_id}-{self.year}-{self.plan_type}'
 
 
 class PlanGoal(BaseModel):
     '''
     Modelo representando una meta de expansión de un PDQ o PTDS.
     '''
+    sync_parent = 'plan'
+
     plan = models.ForeignKey(
         to= Plan,
         verbose_name= 'PDQ/PTDS',
@@ -442,6 +421,7 @@ class PlanGoal(BaseModel):
         verbose_name = 'Meta de expansión PDQ/PTDS'
         verbose_name_plural = 'Metas de expansión PDQ/PTDS'
         ordering = ['plan', 'id',]
+        indexes = [models.Index(fields=['plan', 'year'])]
 
     def __str__(self):
         return f'{self.plan} ({self.id})'
\ No newline at end of file
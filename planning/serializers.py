@@ -1,8 +1,13 @@
 from rest_framework import serializers
 from planning import models
 from performance.models import EPSA
+from performance.serializers import EPSACodeField, instance_kwargs, unknown_epsa_mode, check_epsa_codes, create_epsas
+from performance.signals import post_bulk_write
 from drf_queryfields import QueryFieldsMixin
 from collections import OrderedDict
+from django.utils import timezone
+from django.db import transaction
+from rest_framework.fields import SkipField
 from rest_framework.relations import PKOnlyObject
 
 
@@ -23,9 +28,18 @@ class POAListSerializer(serializers.ListSerializer):
             self._errors = {}
         return True
 
+    @transaction.atomic
     def create(self, validated_data):
         ret = []
-        for data_dict in validated_data:
+        updated = []
+        mode = unknown_epsa_mode(self.context.get('request'))
+        unknown, flagged = check_epsa_codes(validated_data, mode)
+        if mode == 'create':
+            create_epsas(unknown)
+        for index, data_dict in enumerate(validated_data):
+            if mode == 'reject' and index in flagged:
+                ret.append({'ignorado': flagged[index]})
+                continue
             epsa = data_dict.get('epsa')
             year = data_dict.get('year')
             order = data_dict.get('order')
@@ -38,10 +52,11 @@ class POAListSerializer(serializers.ListSerializer):
             qs = models.POA.objects.filter(epsa=epsa,year=year,order=order)
             if qs.count() > 0:
                 poa = qs[0]
-                qs.update(**data_dict)
+                qs.update(**dict(data_dict, modified=timezone.now()))
                 ret_key = 'actualizado'
+                updated.append(data_dict)
             else:
-                poa = models.POA.objects.create(**data_dict)
+                poa = models.POA.objects.create(**instance_kwargs(models.POA, data_dict))
                 ret_key = 'creado'
             if coop_data:
                 models.CoopExpense.objects.filter(poa=poa).delete()
@@ -54,8 +69,13 @@ class POAListSerializer(serializers.ListSerializer):
                     del muni_data['poa']
                 models.MuniExpense.objects.create(poa=poa,**muni_data)
             ret.append({ret_key: data_dict})
+            if index in flagged:
+                ret[-1]['advertencias'] = flagged[index]
+        post_bulk_write.send(sender=models.POA, created=[], updated=updated)
         return ret
 class POASerializer(QueryFieldsMixin, serializers.ModelSerializer):
+    skip_empty_fields = True
+    epsa = EPSACodeField()
     coop_expense = CoopExpenseSerializer(required=False)
     muni_expense = MuniExpenseSerializer(required=False)
 
@@ -65,12 +85,12 @@ class POASerializer(QueryFieldsMixin, serializers.ModelSerializer):
         list_serializer_class = POAListSerializer
 
     def create(self, validated_data):
-        epsa_code = validated_data.pop('epsa',None)
+        epsa = validated_data.pop('epsa',None)
         coop_expense = validated_data.pop('coop_expense', None)
         muni_expense = validated_data.pop('muni_expense', None)
 
-        if epsa_code:
-            epsa_tuple = EPSA.objects.get_or_create(code=epsa_code)
+        if epsa and epsa.code:
+            epsa_tuple = EPSA.objects.get_or_create(code=epsa.code)
             poa = models.POA.objects.create(epsa=epsa_tuple[0], **validated_data)
         else:
             poa = models.SARH.objects.create(**validated_data)
@@ -124,6 +144,7 @@ class PlanGoalSerializer(serializers.ModelSerializer):
         exclude = ('id','plan',)
 
 class PlanSerializer(QueryFieldsMixin, serializers.ModelSerializer):
+    epsa = EPSACodeField()
     goals = PlanGoalSerializer(many=True, required=False)
     
     class Meta:
@@ -1,3 +1,102 @@
+from unittest import mock
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from aapsapi.mixins import ResponseCacheMixin
+from aapsapi.testing import QueryPlanMixin, UnknownEPSAMixin
+from planning import views
+from planning.models import POA, CoopExpense, Plan, PlanGoal
 
-# Create your tests here.
+EPSAS = [f'EPSA{i}' for i in range(40)]
+YEARS = range(2010, 2020)
+
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    '''
+    Verifica que las consultas de los puntos de acceso de POAs y planes, de sus filtros en el admin y de las cargas masivas usan índices.
+    '''
+    view_filters = [
+        (views.POAViewSet, {'epsa': 'EPSA1'}),
+        (views.POAViewSet, {'year': 2017}),
+        (views.POAViewSet, {'epsa': 'EPSA1', 'year': 2017, 'order': 1}),
+        (views.POAViewSet, {'modified_since': timezone.now().isoformat()}),
+        (views.PlanViewSet, {'epsa': 'EPSA1'}),
+        (views.PlanViewSet, {'year': 2017}),
+        (views.PlanViewSet, {'plan_type': 'ptds', 'year': 2017}),
+        (views.PlanViewSet, {'modified_since': timezone.now().isoformat()}),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        POA.objects.bulk_create([POA(epsa_id=epsa, year=year, order=order) for epsa in EPSAS for year in YEARS for order in [1, 2]])
+        types = [code for code, name in Plan.PLAN_TYPES]
+        Plan.objects.bulk_create([
+            Plan(epsa_id=epsa, year=year, plan_type=types[i % len(types)])
+            for i, epsa in enumerate(EPSAS) for year in YEARS
+        ])
+        PlanGoal.objects.bulk_create([PlanGoal(plan=plan, year=plan.year + i, value=i, description='meta', unit='conexiones') for plan in Plan.objects.all() for i in range(3)])
+        cls.analyze()
+
+    def test_plan_goals(self):
+        plans = list(Plan.objects.filter(epsa='EPSA1').values_list('pk', flat=True))
+        self.assertUsesIndex(PlanGoal.objects.filter(plan__in=plans))
+        self.assertUsesIndex(PlanGoal.objects.filter(plan=plans[0], year=2017))
+
+
+class UnknownEPSATests(UnknownEPSAMixin, TestCase):
+    '''
+    Verifica el tratamiento de las siglas de EPSAs no registradas (`unknown_epsa`) en la carga masiva de POAs.
+    '''
+    url = '/api/poas/'
+    model = POA
+    data = (
+        {'epsa': 'AAPOS', 'year': 2017, 'order': 1, 'coop_expense': {'costos_operacion': 10}},
+        {'epsa': 'NUEVA', 'year': 2017, 'order': 1},
+    )
+
+    def test_reject(self):
+        super().test_reject()
+        self.assertEqual(CoopExpense.objects.get().poa.epsa_id, 'AAPOS')
+
+
+@mock.patch.object(ResponseCacheMixin, 'cache_responses', False)
+class ConditionalGetTests(TestCase):
+    '''
+    Verifica los validadores `ETag` de POAs y planes, que cambian con las escrituras de sus objetos anidados.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        cls.poa = POA.objects.create(epsa_id='AAPOS', year=2017, order=1)
+        CoopExpense.objects.create(poa=cls.poa, costos_operacion=1)
+        cls.plan = Plan.objects.create(epsa_id='AAPOS', year=2017)
+        PlanGoal.objects.create(plan=cls.plan, year=2018, value=1, description='meta', unit='conexiones')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertChangesWith(self, url, edit):
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        edit()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_coop_expense_edit(self):
+        def edit():
+            expense = CoopExpense.objects.get()
+            expense.costos_operacion = 2
+            expense.save()
+        self.assertChangesWith('/api/poas/', edit)
+        self.assertChangesWith(f'/api/poas/{self.poa.pk}/', edit)
+
+    def test_plan_goal_edit(self):
+        def edit():
+            goal = PlanGoal.objects.get()
+            goal.value = 2
+            goal.save()
+        self.assertChangesWith('/api/plans/', edit)
+        self.assertChangesWith(f'/api/plans/{self.plan.pk}/', edit)
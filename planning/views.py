@@ -1,9 +1,10 @@
 from rest_framework import viewsets
+from aapsapi.mixins import ConditionalGetMixin, DeltaSyncMixin, FastListMixin, FieldsProjectionMixin, ResponseCacheMixin, StreamingListMixin
 from planning import models, serializers
 from rest_framework.response import Response
 from rest_framework import status
 
-class CustomViewSet(viewsets.ModelViewSet):
+class CustomViewSet(ResponseCacheMixin, DeltaSyncMixin, ConditionalGetMixin, StreamingListMixin, FastListMixin, FieldsProjectionMixin, viewsets.ModelViewSet):
     def get_serializer(self, *args, **kwargs):
         if isinstance(kwargs.get('data', {}), list):
             kwargs['many'] = True
@@ -170,10 +171,12 @@ class POAViewSet(CustomViewSet):
     eliminaría la instancia de `POA` con índice 8.
     '''
     serializer_class = serializers.POASerializer
-    queryset = models.POA.objects.all()
+    queryset = models.POA.objects.select_related('coop_expense', 'muni_expense')
     filterset_fields = ('epsa','year','order',)
+    cursor_ordering = ('epsa_id','year','order','id',)
+    cache_models = (models.CoopExpense, models.MuniExpense,)
 
-class PlanViewSet(viewsets.ModelViewSet):
+class PlanViewSet(ResponseCacheMixin, DeltaSyncMixin, ConditionalGetMixin, StreamingListMixin, FastListMixin, FieldsProjectionMixin, viewsets.ModelViewSet):
     '''
     list:
     Retorna un conjunto de instancias del modelo de planificación `Plan` (PDQ/PTDS).
@@ -309,8 +312,10 @@ class PlanViewSet(viewsets.ModelViewSet):
     eliminaría la instancia de `Plan` con índice 8.
     '''
     serializer_class = serializers.PlanSerializer
-    queryset = models.Plan.objects.all()
+    queryset = models.Plan.objects.prefetch_related('goals')
     filterset_fields = ('epsa','year','plan_type',)
+    cursor_ordering = ('epsa_id','year','id',)
+    cache_models = (models.PlanGoal,)
 
 
     def get_serializer(self, *args, **kwargs):
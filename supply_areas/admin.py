@@ -1,13 +1,14 @@
 from django.contrib import admin
 from leaflet.admin import LeafletGeoAdmin
 from supply_areas.models import SupplyArea
+from performance.admin import EPSACodeAdminMixin
 
 @admin.register(SupplyArea)
-class SupplyAreaModelAdmin(LeafletGeoAdmin):
+class SupplyAreaModelAdmin(EPSACodeAdminMixin, LeafletGeoAdmin):
     view_on_site = False
     list_filter= ('epsa',)
-    search_fields= ['id','epsa',]
-    list_display= ('id','epsa',)
+    search_fields= ['id','epsa__code',]
+    list_display= ('id','get_epsa',)
 
     def changelist_view(self, request, extra_context=None):
         extra_context = {'title': 'AAPS: Áreas de Prestación de Serivicios de las EPSA Reguladas'}
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:31
+
+from django.db import migrations, models
+import djgeojson.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplyArea',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epsa', models.CharField(help_text='Sigla de la EPSA. No debe contenter más de 32 caracteres.', max_length=32, verbose_name='sigla EPSA')),
+                ('geom', djgeojson.fields.MultiPolygonField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Área de Prestación de Servicio',
+                'verbose_name_plural': 'Áreas de Prestación de Servicio',
+                'ordering': ['epsa'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:13
+
+from django.db import migrations
+import django.db.models.deletion
+import performance.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+        ('supply_areas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='supplyarea',
+            options={'ordering': ['epsa_id'], 'verbose_name': 'Área de Prestación de Servicio', 'verbose_name_plural': 'Áreas de Prestación de Servicio'},
+        ),
+        migrations.AlterField(
+            model_name='supplyarea',
+            name='epsa',
+            field=performance.models.EPSAForeignKey(db_column='epsa', db_constraint=False, help_text='Sigla de la EPSA. No debe contenter más de 64 caracteres.', on_delete=django.db.models.deletion.DO_NOTHING, related_name='supply_areas', to='performance.EPSA', verbose_name='sigla EPSA'),
+        ),
+    ]
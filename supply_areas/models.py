@@ -1,19 +1,19 @@
 from django.db import models
 from djgeojson.fields import MultiPolygonField
-from performance.models import EPSA, BaseModel
+from performance.models import EPSA, BaseModel, EPSAForeignKey
 
 class SupplyArea(models.Model):
-    epsa = models.CharField(
-        max_length = 32,
+    epsa = EPSAForeignKey(
+        related_name = 'supply_areas',
         verbose_name = 'sigla EPSA',
-        help_text = 'Sigla de la EPSA. No debe contenter más de 32 caracteres.'
+        help_text = 'Sigla de la EPSA. No debe contenter más de 64 caracteres.'
     )
     geom = MultiPolygonField(blank=True, null=True)
 
     class Meta:
         verbose_name = 'Área de Prestación de Servicio'
         verbose_name_plural = 'Áreas de Prestación de Servicio'
-        ordering = ['epsa',]
+        ordering = ['epsa_id',]
 
     def __str__(self):
-        return f'({self.id}) {self.epsa}'
\ No newline at end of file
+        return f'({self.id}) {self.epsa_id}'
\ No newline at end of file
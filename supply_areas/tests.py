@@ -1,3 +1,66 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+from aapsapi.testing import QueryPlanMixin
+from performance.dimensions import epsa_dimension
+from performance.models import EPSA
+from supply_areas.models import SupplyArea
 
-# Create your tests here.
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    '''
+    Verifica que el filtro por EPSA de las áreas de prestación de servicio usa un índice.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        SupplyArea.objects.bulk_create([SupplyArea(epsa_id=f'EPSA{i % 100}') for i in range(500)])
+        cls.analyze()
+
+    def test_epsa_filter(self):
+        self.assertUsesIndex(SupplyArea.objects.filter(epsa='EPSA1'))
+
+
+class StateFilterTests(QueryPlanMixin, TestCase):
+    '''
+    Verifica que `?state=` retorna sólo las áreas de las EPSAs de cada departamento, con una consulta indexada.
+    '''
+    @classmethod
+    def setUpTestData(cls):
+        cls.states = [code for code, name in EPSA.STATE_CHOICES]
+        EPSA.objects.bulk_create([EPSA(code=f'{state}{i}', state=state) for state in cls.states for i in range(3)])
+        SupplyArea.objects.bulk_create([SupplyArea(epsa_id=f'{state}{i}') for state in cls.states for i in range(3)])
+        SupplyArea.objects.create(epsa_id='SIN_EPSA')
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        cls.analyze()
+
+    def setUp(self):
+        epsa_dimension.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_each_state(self):
+        for state in self.states:
+            with self.subTest(state=state):
+                response = self.client.get('/api/supply_areas/', {'state': state})
+                self.assertEqual(response.status_code, 200)
+                epsas = sorted(feat['properties']['epsa'] for feat in response.data['features'])
+                self.assertEqual(epsas, [f'{state}{i}' for i in range(3)])
+
+    def test_unknown_state(self):
+        response = self.client.get('/api/supply_areas/', {'state': 'XX'})
+        self.assertEqual(response.data['features'], [])
+
+    def test_single_indexed_query(self):
+        epsa_dimension.load()
+        with self.assertNumQueries(1):
+            self.client.get('/api/supply_areas/', {'state': 'SC'})
+        self.assertUsesIndex(SupplyArea.objects.filter(epsa__in=epsa_dimension.codes('SC')))
+
+    def test_writes_of_other_processes(self):
+        epsa_dimension.load()
+        # bulk_create no envía post_save, como una escritura hecha en otro proceso del servidor.
+        EPSA.objects.bulk_create([EPSA(code='SC9', state='SC')])
+        epsa_dimension.checked -= epsa_dimension.check_interval + 1
+        response = self.client.get('/api/supply_areas/', {'state': 'SC'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('SC9', epsa_dimension.codes('SC'))
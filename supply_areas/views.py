@@ -1,9 +1,12 @@
 import json
-from django.core import serializers
+from django.core import serializers as geojson_serializers
 from supply_areas.models import SupplyArea
+from performance.dimensions import epsa_dimension
+from performance.serializers import EPSACodeField
 from rest_framework import viewsets, response, serializers
 
 class SupplyAreaSerializer(serializers.ModelSerializer):
+    epsa = EPSACodeField()
     class Meta:
         model = SupplyArea
         fields = '__all__'
@@ -23,6 +26,7 @@ class SupplyAreaViewSet(viewsets.ModelViewSet):
         /api/supply_areas/?state=SC
     
     retorna todas las áreas de prestación de servicios de EPSAs de Santa Cruz. Si ningún parámetro es dado, retorna todas las instancias disponibles.
+    El departamento se resuelve con la dimensión EPSA en memoria (código -> departamento), por lo que el filtro es una sola consulta sobre el índice de `epsa`.
 
     Los campos disponibles para cada instancia son: `epsa` y `area` que representan la sigla de la EPSA y el área del polígono respectivamente. Estos datos son retornados bajo la llave "properties" de cada "feature". Además, el polígono de cada área es retornado bajo la llave "geometry". 
 
@@ -149,12 +153,12 @@ class SupplyAreaViewSet(viewsets.ModelViewSet):
         state = request.query_params.get('state', None)
         epsa_code = request.query_params.get('epsa', None)
         if state is not None:
-            queryset = queryset.filter(epsa__state=state)
+            queryset = queryset.filter(epsa__in=epsa_dimension.codes(state))
         if epsa_code is not None:
-            queryset = queryset.filter(epsa__code=epsa_code)
+            queryset = queryset.filter(epsa=epsa_code)
             
         options = dict(
-            properties=['epsa',],
+            properties={'epsa_id': 'epsa'},
             geometry_field='geom',
             precision=None,
             simplify=None,
@@ -165,7 +169,7 @@ class SupplyAreaViewSet(viewsets.ModelViewSet):
             with_modelname=False,
             ensure_ascii=False
         )
-        data = json.loads(serializers.serialize('geojson', queryset, **options))
+        data = json.loads(geojson_serializers.serialize('geojson', queryset, **options))
         for feat in data['features']:
             del feat['id']
             if 'model' in feat['properties']:
@@ -176,7 +180,7 @@ class SupplyAreaViewSet(viewsets.ModelViewSet):
     def create(self, request):
         try:
             json_str = request.body.decode('utf-8')
-            for serobj in serializers.deserialize('geojson', json_str, model_name='supply_areas.SupplyArea'):
+            for serobj in geojson_serializers.deserialize('geojson', json_str, model_name='supply_areas.SupplyArea'):
                 serobj.save()
             return response.Response(dict(created_obj=json_str))
         except Exception as e: